@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the CLI, with a regression budget.
+
+Runs `python -X importtime -c "import <module>"` in fresh interpreters and
+reports the best cumulative import time of <module> plus the slowest
+individual imports of that run. Exits non-zero if the best time is over
+the budget, or if any heavy optional backend (sympy, rich, graphviz, dd,
+numpy, networkx) was imported: those must only load when a feature that
+needs them runs.
+
+Examples:
+  python scripts/bench_import_time.py
+  python scripts/bench_import_time.py --budget-ms 250 --repeat 10
+  python scripts/bench_import_time.py --module logictree.pipeline --top 25
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Best-of-N cumulative import time of cli.main. Measured at ~170 ms on the
+# reference dev box; the headroom absorbs slower CI machines.
+IMPORT_BUDGET_MS = 350.0
+
+HEAVY_MODULES = ("sympy", "rich", "graphviz", "dd", "numpy", "networkx")
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+def measure(module: str) -> list[tuple[str, int, int]]:
+    """(name, self_us, cumulative_us) for every import, in -X importtime order."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (str(SRC), env.get("PYTHONPATH")) if p
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("--module", default="cli.main")
+    p.add_argument("--repeat", type=int, default=5, help="best of N runs")
+    p.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    p.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    args = p.parse_args(argv)
+
+    best_rows, best_us = None, None
+    for _ in range(args.repeat):
+        rows = measure(args.module)
+        total = next(cum for name, _, cum in reversed(rows) if name == args.module)
+        if best_us is None or total < best_us:
+            best_rows, best_us = rows, total
+
+    print(f"import {args.module}: {best_us / 1e3:.1f} ms (best of {args.repeat})")
+    print("slowest imports (self time):")
+    for name, self_us, cum_us in sorted(best_rows, key=lambda r: -r[1])[: args.top]:
+        print(f"  {self_us / 1e3:8.1f} ms  {cum_us / 1e3:8.1f} ms cum  {name}")
+
+    status = 0
+    roots = {name.split(".")[0] for name, _, _ in best_rows}
+    heavy = sorted(roots.intersection(HEAVY_MODULES))
+    if heavy:
+        print(f"FAIL: heavy backends imported eagerly: {', '.join(heavy)}")
+        status = 1
+    if best_us / 1e3 > args.budget_ms:
+        print(f"FAIL: over the {args.budget_ms:.0f} ms budget")
+        status = 1
+    elif not heavy:
+        print(f"OK: within the {args.budget_ms:.0f} ms budget")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Lowering benchmark: SVToLogicTreeLowerer in fast mode vs debug mode.
+
+Parses a synthetic module with many continuous assigns once, then times only
+the lowering (parse tree -> Module) with debug=False and debug=True. Logging
+stays at WARNING, so the difference is purely the diagnostics that debug mode
+computes (getText/pformat dumps, asdict, assert_no_fields) whether or not
+anything is printed.
+
+It also times source -> Module end to end, through the ANTLR parser and
+through logictree.fast_lowering (which skips the parse tree).
+
+Examples:
+  python scripts/bench_lowering.py
+  python scripts/bench_lowering.py --assigns 2000 --terms 12
+  python scripts/bench_lowering.py golden_circuits/rv_alu_decode_simple.sv
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import sys
+import time
+
+from logictree.pipeline import lower_sv_text_to_logic
+from logictree.SVToLogicTreeLowerer import SVToLogicTreeLowerer
+from sv_parser.parse import parse_sv_file, parse_sv_text
+from sv_parser.SystemVerilogSubsetParser import SystemVerilogSubsetParser
+
+_OPS = ("&", "|", "^")
+
+
+def synthetic_module(assigns: int, terms: int, seed: int = 0) -> str:
+    """A module with `assigns` outputs, each a `terms`-operand expression."""
+    rng = random.Random(seed)
+    ports = [
+        "    input  logic [15:0] a",
+        "    input  logic [15:0] b",
+        "    input  logic [3:0]  op",
+        "    input  logic        en",
+    ] + [f"    output logic        y{i}" for i in range(assigns)]
+    body = []
+    for i in range(assigns):
+        expr = f"a[{rng.randrange(16)}]"
+        for _ in range(terms - 1):
+            leaf = rng.choice(
+                [
+                    f"a[{rng.randrange(16)}]",
+                    f"~b[{rng.randrange(16)}]",
+                    f"(op == 4'b{rng.randrange(16):04b})",
+                    "en",
+                ]
+            )
+            expr = f"({expr} {rng.choice(_OPS)} {leaf})"
+        body.append(f"    assign y{i} = {expr};")
+    return (
+        "module big (\n"
+        + ",\n".join(ports)
+        + "\n);\n"
+        + "\n".join(body)
+        + "\nendmodule\n"
+    )
+
+
+def _modules(parse_tree):
+    return [
+        c
+        for c in parse_tree.getChildren()
+        if isinstance(c, SystemVerilogSubsetParser.Module_declarationContext)
+    ]
+
+
+def time_lowering(modules, debug: bool, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        lowerer = SVToLogicTreeLowerer(debug=debug)
+        t0 = time.perf_counter()
+        for ctx in modules:
+            lowerer.visitModule_declaration(ctx)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def time_end_to_end(src: str, fast: bool, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        lower_sv_text_to_logic(src, fast=fast)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("file", nargs="?", help="SV file (default: synthetic module)")
+    p.add_argument("--assigns", type=int, default=500)
+    p.add_argument("--terms", type=int, default=8)
+    p.add_argument("--repeat", type=int, default=3, help="best of N runs")
+    args = p.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    t0 = time.perf_counter()
+    if args.file:
+        with open(args.file, "r", encoding="ascii") as fh:
+            src = fh.read()
+        tree = parse_sv_file(args.file)
+        label = args.file
+    else:
+        src = synthetic_module(args.assigns, args.terms)
+        tree = parse_sv_text(src)
+        label = f"synthetic: {args.assigns} assigns x {args.terms} terms"
+    parse_s = time.perf_counter() - t0
+    modules = _modules(tree)
+
+    fast = time_lowering(modules, debug=False, repeat=args.repeat)
+    debug = time_lowering(modules, debug=True, repeat=args.repeat)
+    print(label)
+    print(f"  parse (once)   {parse_s * 1e3:9.1f} ms")
+    print(f"  lower, fast    {fast * 1e3:9.1f} ms")
+    print(f"  lower, debug   {debug * 1e3:9.1f} ms  ({debug / fast:.1f}x)")
+
+    antlr = time_end_to_end(src, fast=False, repeat=args.repeat)
+    direct = time_end_to_end(src, fast=True, repeat=args.repeat)
+    print(f"  source, ANTLR  {antlr * 1e3:9.1f} ms")
+    print(f"  source, direct {direct * 1e3:9.1f} ms  ({antlr / direct:.1f}x faster)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Bytes-per-node benchmark for operator (gate) nodes.
+
+Compares the slotted LogicOp layout (one `_kids` tuple, lazy metadata) with
+the previous dict-backed layout, which gave every gate a `__dict__` holding a
+`metadata` dict, an `_inputs` list and the named child attributes (`NotOp`
+additionally kept its child as `.child`).
+
+Two measurements are reported:
+  * per golden circuit: the gates reachable from every lowered assignment,
+    sized shallowly (object + its own containers), before vs after
+  * synthetic: tracemalloc peak while building N fresh AND/NOT gates
+
+Examples:
+  python scripts/bench_node_memory.py
+  python scripts/bench_node_memory.py --count 200000 golden_circuits/rv_alu_decode.sv
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tracemalloc
+from pathlib import Path
+
+from logictree.nodes.ops.gates import AndOp, NotOp
+from logictree.nodes.ops.ops import LogicOp, LogicVar
+from logictree.pipeline import lower_sv_file_to_logic
+from logictree.utils.traverse import iter_preorder
+
+GOLDEN = Path(__file__).resolve().parents[1] / "golden_circuits"
+
+
+class _LegacyGate:
+    """Attribute layout of a gate before LogicOp was slotted."""
+
+    def __init__(self, *inputs):
+        self.metadata = {}
+        self._inputs = list(inputs)
+        if len(inputs) == 1:
+            self.operand = inputs[0]
+            self.child = inputs[0]
+        else:
+            self.a, self.b = inputs[:2]
+
+
+def _node_bytes(node) -> int:
+    """Shallow size of one node plus the containers it owns."""
+    size = sys.getsizeof(node)
+    d = getattr(node, "__dict__", None)
+    if d is not None:
+        size += sys.getsizeof(d)
+        size += sum(
+            sys.getsizeof(v) for v in d.values() if isinstance(v, (list, tuple, dict))
+        )
+    if isinstance(node, LogicOp):
+        size += sys.getsizeof(node._kids)
+        if node._meta is not None:
+            size += sys.getsizeof(node._meta)
+    return size
+
+
+def _gates(mod):
+    seen = set()
+    for assign in mod.assignments.values():
+        for n in iter_preorder(assign.rhs):
+            if isinstance(n, LogicOp) and id(n) not in seen:
+                seen.add(id(n))
+                yield n
+
+
+def bench_file(path: Path) -> tuple[int, float, float]:
+    gates = [
+        g for mod in lower_sv_file_to_logic(str(path)).values() for g in _gates(mod)
+    ]
+    if not gates:
+        return 0, 0.0, 0.0
+    after = sum(_node_bytes(g) for g in gates)
+    before = sum(_node_bytes(_LegacyGate(*g._kids)) for g in gates)
+    return len(gates), before / len(gates), after / len(gates)
+
+
+def _traced_peak(build, count: int) -> float:
+    tracemalloc.start()
+    keep = build(count)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del keep
+    return peak / count
+
+
+def bench_synthetic(count: int) -> tuple[float, float]:
+    a, b = LogicVar("a"), LogicVar("b")
+
+    def legacy(n):
+        return [_LegacyGate(a, b) if i % 2 else _LegacyGate(a) for i in range(n)]
+
+    def slotted(n):
+        return [AndOp(a, b) if i % 2 else NotOp(a) for i in range(n)]
+
+    return _traced_peak(legacy, count), _traced_peak(slotted, count)
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("files", nargs="*", type=Path, help="SV files (default: golden)")
+    p.add_argument("--count", type=int, default=100_000, help="synthetic gates")
+    args = p.parse_args(argv)
+
+    files = args.files or sorted(GOLDEN.glob("*.sv"))
+    print(f"{'circuit':32} {'gates':>7} {'before B/node':>14} {'after B/node':>13}")
+    for path in files:
+        try:
+            n, before, after = bench_file(path)
+        except Exception as e:  # some golden files are not lowerable yet
+            print(f"{path.name:32} skipped ({type(e).__name__})")
+            continue
+        print(f"{path.name:32} {n:7d} {before:14.1f} {after:13.1f}")
+
+    before, after = bench_synthetic(args.count)
+    print(
+        f"\nsynthetic {args.count} gates (tracemalloc): "
+        f"before {before:.1f} B/node, after {after:.1f} B/node "
+        f"({100 * (1 - after / before):.0f}% smaller)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,24 @@
 import argparse
 import logging
+import sys
 
 from logictree.nodes import LogicOp
 from logictree.nodes.control.assign import LogicAssign
 from logictree.nodes.control.case import CaseStatement
 from logictree.nodes.control.ifstatement import IfStatement
-from logictree.pipeline import lower_sv_file_to_logic
+from logictree.pipeline import (
+    iter_sv_file_modules,
+    lower_sv_files_to_logic,
+    read_filelist,
+)
 from logictree.SVToLogicTreeLowerer import SVToLogicTreeLowerer
+from logictree.transforms.balance import balance_tree
 from logictree.transforms.case_to_if import case_to_if_tree
 from logictree.transforms.if_to_mux import if_to_mux_tree
-from logictree.transforms.signal_resolution import resolve_signal_vars
-from logictree.utils.analysis import explain_logic_hash, get_logic_hash
+from logictree.transforms.signal_resolution import (
+    CombinationalLoopError,
+    SignalResolver,
+)
 from logictree.utils.ascii_tree import logic_tree_to_ascii, to_ascii
 from logictree.utils.display import (
     explain_expr_tree,
@@ -19,15 +27,27 @@ from logictree.utils.display import (
     to_sympy_expr,
 )
 from logictree.utils.graphviz_utils import to_svg, to_png
+from logictree.utils.module_cache import get_default_cache
 from logictree.utils.reduce import balanced_tree_reduce
-from logictree.utils.utils_cli import check_against_golden, write_golden_file
+from logictree.utils.utils_cli import check_against_golden, golden_path, save_golden
 
 log = logging.getLogger(__name__)
 
 MODULE_NAME = ""
 
 
-def handle_output(signal_map, args):
+def handle_output(signal_map, args, module_name=""):
+    bdd_ctx = None
+    if args.hash_tree or args.explain_hash or args.dump_all:
+        # dd (and networkx under it) is the slowest import we have; only load
+        # it when hashing. One BDD manager per module: shared cones are built
+        # once across signals.
+        from logictree.utils.analysis import explain_logic_hash, hash_signals
+        from logictree.utils.bdd_context import get_bdd_context
+
+        bdd_ctx = get_bdd_context(module_name)
+    if args.hash_tree or args.dump_all:
+        hashes = hash_signals(signal_map, jobs=args.jobs, ctx=bdd_ctx)
 
     for name, tree in signal_map.items():
         log.debug(f"isisntance(tree, LogicAssign): {isinstance(tree, LogicAssign)}")
@@ -36,11 +56,11 @@ def handle_output(signal_map, args):
 
         if args.hash_tree or args.dump_all:
             print(f"DEBUG: name: {name}")
-            print(f"Hash for {name}: {get_logic_hash(expr)}")
+            print(f"Hash for {name}: {hashes[name]}")
 
         if args.explain_hash or args.dump_all:
             print(f"Explained hash for {name}:")
-            explain_logic_hash(expr)
+            explain_logic_hash(expr, ctx=bdd_ctx)
             print("Explain_expr_tree:")
             print(explain_expr_tree(expr))
 
@@ -87,15 +107,94 @@ def handle_output(signal_map, args):
             to_png(balanced_tree, name=name)
 
         if args.save_golden:
-            write_golden_file(name, expr)
+            print(f"Saved golden file {save_golden(name, expr)}")
 
         if args.check_golden:
-            check_against_golden(name, expr)
+            try:
+                ok = check_against_golden(name, expr)
+            except FileNotFoundError:
+                print(f"Golden check for {name}: no golden file {golden_path(name)}")
+            else:
+                print(f"Golden check for {name}: {'PASS' if ok else 'FAIL'}")
+
+
+def print_parse_timings(timings, file=None):
+    file = file or sys.stderr
+    for t in timings:
+        print(
+            f"{t.seconds * 1e3:10.1f} ms  {t.mode:<6} {t.tokens:8d} tok  {t.source}",
+            file=file,
+        )
+    total = sum(t.seconds for t in timings)
+    print(f"{total * 1e3:10.1f} ms  total ({len(timings)} sources)", file=file)
+
+
+def find_top_module(paths, top, cache=None, timings=None, fast=False):
+    """First module named `top` in `paths`, parsing nothing else."""
+    for path in paths:
+        modules = iter_sv_file_modules(
+            path, top=top, cache=cache, timings=timings, fast=fast
+        )
+        for _, mod in modules:
+            return mod
+    return None
 
 
 def build_parser():
-    parser = argparse.ArgumentParser(description="LogicTree CLI Tool")
-    parser.add_argument("filename", help="SystemVerilog source file")
+    parser = argparse.ArgumentParser(
+        description="LogicTree CLI Tool",
+        epilog="Run 'logictree serve --help' for the JSON request server.",
+    )
+    parser.add_argument("filenames", nargs="*", help="SystemVerilog source file(s)")
+    parser.add_argument(
+        "-f",
+        dest="filelists",
+        action="append",
+        default=[],
+        metavar="FILELIST",
+        help="Read source files from a filelist (may be repeated)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Worker processes for parsing and hashing (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--top",
+        metavar="MODULE",
+        help="Module to process (default: the first one). Files are scanned "
+        "module by module and only MODULE is parsed",
+    )
+    parser.add_argument(
+        "--no_cache",
+        action="store_true",
+        help="Do not read or write the lowered-module cache (~/.cache/logictree)",
+    )
+    parser.add_argument(
+        "--fast_lowering",
+        action="store_true",
+        help="Lower assign-only modules without building an ANTLR parse tree",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Stay resident and re-run the outputs for signals whose source "
+        "changed whenever the files are saved",
+    )
+    parser.add_argument(
+        "--watch_interval",
+        type=float,
+        default=0.5,
+        metavar="SECONDS",
+        help="Polling interval for --watch (default: 0.5)",
+    )
+    parser.add_argument(
+        "--parse_timings",
+        action="store_true",
+        help="Report per-file parse time and prediction mode on stderr",
+    )
 
     # Output Options
     out = parser.add_argument_group("Output Options")
@@ -143,6 +242,37 @@ def build_parser():
         action="store_true",
         help="Lower to primitive gates {AND, OR, NOT}",
     )
+    lower.add_argument(
+        "--balance",
+        action="store_true",
+        help="Rebalance AND/OR/XOR chains for minimum delay "
+        "(prints critical-path depth before/after to stderr)",
+    )
+    lower.add_argument(
+        "--cse",
+        action="store_true",
+        help="Share equal subexpressions across all outputs "
+        "(prints shared signals and gates before/after to stderr)",
+    )
+    lower.add_argument(
+        "--cse_wires",
+        action="store_true",
+        help="Like --cse, but output each shared subexpression as a named wire "
+        "(cse0, cse1, ...) that the outputs refer to",
+    )
+    lower.add_argument(
+        "--aig_optimize",
+        action="store_true",
+        help="Rewrite, refactor and balance the outputs as one AIG "
+        "(prints gates and depth before/after to stderr)",
+    )
+    lower.add_argument(
+        "--optimize_budget",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Time budget for --aig_optimize (default: until no pass improves)",
+    )
 
     # Logging
     parser.add_argument(
@@ -155,8 +285,20 @@ def build_parser():
     return parser
 
 
+def print_depth_report(rows, file=None):
+    """rows: (name, depth before, depth after) per output."""
+    file = file or sys.stderr
+    for name, before, after in rows:
+        print(f"{before:6d} -> {after:<6d} {name}", file=file)
+    if rows:
+        before = max(r[1] for r in rows)
+        after = max(r[2] for r in rows)
+        print(f"{before:6d} -> {after:<6d} critical path", file=file)
+
+
 def apply_lowering(assignments, args):
     lowered = {}
+    depths = []
     for name, assign in assignments.items():
         # always work on RHS
         tree = assign.rhs
@@ -168,29 +310,112 @@ def apply_lowering(assignments, args):
             tree = if_to_mux_tree(tree)
         if args.to_primitives and hasattr(tree, "to_primitives"):
             tree = tree.to_primitives()
+        if args.balance:
+            before = tree.delay
+            tree = balance_tree(tree)
+            depths.append((name, before, tree.delay))
 
         # Rewrap into a LogicAssign so structure is preserved
         lowered[name] = LogicAssign(lhs=name, rhs=tree)
 
+    if depths:
+        print_depth_report(depths)
     return lowered
 
 
-def main():
+def resolve_outputs(mod, lowered_map, args, file=None):
+    """
+    Everything after apply_lowering(): inline the module's intermediate
+    signals, then run --cse/--cse_wires and --aig_optimize. Statistics go to
+    `file` (default stderr). Raises CombinationalLoopError.
+    """
+    file = file or sys.stderr
+    resolver = SignalResolver(mod.signal_map)
+    resolved_map = {name: resolver.resolve(tree) for name, tree in lowered_map.items()}
+
+    if args.cse or args.cse_wires:
+        from logictree.transforms.cse import eliminate_common_subexpressions
+
+        cse = eliminate_common_subexpressions(
+            {name: asg.rhs for name, asg in resolved_map.items()},
+            as_wires=args.cse_wires,
+            reserved=mod.signal_map.keys(),
+        )
+        print(
+            f"cse: {len(cse.signals)} shared subexpressions, "
+            f"gates {cse.gates_before} -> {cse.gates_after}",
+            file=file,
+        )
+        # with wires, the wire definitions are output first
+        trees = {**cse.signals, **cse.outputs} if cse.as_wires else cse.outputs
+        resolved_map = {
+            name: LogicAssign(lhs=name, rhs=tree) for name, tree in trees.items()
+        }
+
+    if args.aig_optimize:
+        from logictree.aig_opt import optimize_trees
+
+        trees, report = optimize_trees(
+            {name: asg.rhs for name, asg in resolved_map.items()},
+            time_budget=args.optimize_budget,
+        )
+        print(report.summary(), file=file)
+        resolved_map = {
+            name: LogicAssign(lhs=name, rhs=tree) for name, tree in trees.items()
+        }
+    return resolved_map
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv[:1] == ["serve"]:
+        from cli.serve import serve_main
+
+        return serve_main(argv[1:])
+
     parser = build_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     logging.basicConfig(level=getattr(logging, args.loglevel.upper()))
 
-    lowerer = SVToLogicTreeLowerer()
-    module_map = lower_sv_file_to_logic(args.filename)
+    paths = list(args.filenames)
+    for filelist in args.filelists:
+        paths.extend(read_filelist(filelist))
+    if not paths:
+        parser.error("no SystemVerilog files given (pass files or -f FILELIST)")
+
+    if args.watch:
+        from cli.watch import Watcher
 
-    # pick top module (for now until multiple module support is added)
-    mod = list(module_map.values())[0]
+        Watcher(paths, args).run(args.watch_interval)
+        return
+
+    lowerer = SVToLogicTreeLowerer()
+    cache = None if args.no_cache else get_default_cache()
+    timings = [] if args.parse_timings else None
+    if args.top:
+        mod = find_top_module(
+            paths, args.top, cache=cache, timings=timings, fast=args.fast_lowering
+        )
+        if mod is None:
+            parser.error(f"top module '{args.top}' not found")
+    else:
+        module_map = lower_sv_files_to_logic(
+            paths,
+            jobs=args.jobs,
+            cache=cache,
+            timings=timings,
+            fast=args.fast_lowering,
+        )
+        # pick top module (for now until multiple module support is added)
+        mod = list(module_map.values())[0]
+    if timings:
+        print_parse_timings(timings)
 
     lowered_map = apply_lowering(mod.assignments, args)
-    resolved_map = {
-        name: resolve_signal_vars(tree, mod.signal_map)
-        for name, tree in lowered_map.items()
-    }
+    try:
+        resolved_map = resolve_outputs(mod, lowered_map, args)
+    except CombinationalLoopError as e:
+        parser.error(f"module '{mod.name}': {e}")
 
     global MODULE_NAME
     MODULE_NAME = lowerer.module_name
@@ -206,7 +431,7 @@ def main():
         return
 
     log.debug(f"resolved_map: {resolved_map}")
-    handle_output(resolved_map, args)
+    handle_output(resolved_map, args, module_name=mod.name)
 
 
 if __name__ == "__main__":
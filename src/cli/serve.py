@@ -0,0 +1,308 @@
+"""
+`logictree serve`: a resident process answering newline-delimited JSON
+requests on stdin (responses on stdout) or on a Unix socket.
+
+Each request is one line:
+
+    {"id": 7, "method": "hash", "params": {"path": "alu.sv", "signals": ["y"]}}
+
+and gets one response line, {"id": 7, "result": ...} or
+{"id": 7, "error": {"type": "...", "message": "..."}}. Requests are handled
+one at a time, in order.
+
+Methods (params in brackets are optional):
+
+    lower      path | text [source, module]   -> modules, relowered
+    hash       path | text [module, signals]  -> module, hashes
+    compare    a, b: {path | text, [module], signal} [method]  -> equal
+    simplify   path | text, signal [module]   -> expr, gates_before/after
+    eval       path | text, signal, env | envs [module] -> value | values
+    serialize  path | text, signal [module]   -> tree
+    shutdown                                   -> stops the server
+
+Sources are kept in one LoweringSession: a file whose mtime and size did
+not change is not even re-read, an edited file only relowers the modules
+that changed, and per-signal results (resolved trees, hashes) are cached
+until their module changes. The grammar, the interpreter and the module
+BDD managers stay warm across requests.
+"""
+
+import argparse
+import json
+import logging
+import os
+import socketserver
+import sys
+import threading
+
+from logictree.session import LoweringSession
+from logictree.transforms.signal_resolution import SignalResolver
+
+log = logging.getLogger(__name__)
+
+
+class RequestError(Exception):
+    """A request the server cannot answer; reported as an error response."""
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+class Server:
+    """Dispatches decoded requests; transport-independent."""
+
+    METHODS = ("lower", "hash", "compare", "simplify", "eval", "serialize")
+
+    def __init__(self, fast: bool = False):
+        self.session = LoweringSession(fast=fast)
+        self._stamps = {}
+        self.running = True
+
+    # -- transport ----------------------------------------------------------
+
+    def handle_line(self, line: str) -> str:
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+        except ValueError as e:
+            return json.dumps({"id": None, "error": _error(e)})
+        return json.dumps(self.handle(request))
+
+    def handle(self, request: dict) -> dict:
+        rid = request.get("id")
+        method = request.get("method")
+        params = request.get("params") or {}
+        try:
+            if method == "shutdown":
+                self.running = False
+                result = None
+            elif method in self.METHODS:
+                result = getattr(self, f"do_{method}")(params)
+            else:
+                raise RequestError(f"unknown method {method!r}")
+        except Exception as e:
+            if not isinstance(e, (RequestError, OSError, ValueError, KeyError)):
+                log.exception("serve: %s failed", method)
+            return {"id": rid, "error": _error(e)}
+        return {"id": rid, "result": result}
+
+    # -- sources and signals ------------------------------------------------
+
+    def _load(self, params) -> tuple:
+        """(source, relowered module names) for a {path | text} reference."""
+        if "path" in params:
+            path = str(params["path"])
+            stamp = _stamp(path)
+            if self._stamps.get(path) == stamp:
+                return path, []
+            update = self.session.update_file(path)
+            self._stamps[path] = stamp
+        elif "text" in params:
+            path = params.get("source", "<request>")
+            update = self.session.update_text(params["text"], source=path)
+        else:
+            raise RequestError("expected 'path' or 'text'")
+        bdd_context = sys.modules.get("logictree.utils.bdd_context")
+        for name in update.dirty:
+            if bdd_context is not None:
+                bdd_context.get_bdd_context(name).clear()
+        return path, update.dirty
+
+    def _module(self, params):
+        source, _ = self._load(params)
+        name = params.get("module")
+        if name is None:
+            names = self.session.module_names(source)
+            if not names:
+                raise RequestError(f"no modules in {source}")
+            name = names[0]
+        if name not in self.session.modules:
+            raise RequestError(f"unknown module {name!r}")
+        return name
+
+    def _resolved(self, module: str, signal: str):
+        mod = self.session.module(module)
+        if signal not in mod.assignments:
+            raise RequestError(f"module {module!r} has no signal {signal!r}")
+        # one resolver per module: outputs share their resolved signals
+        resolver = self.session.analysis(
+            module, "", "resolver", lambda m, s: SignalResolver(m.signal_map)
+        )
+        return self.session.analysis(
+            module,
+            signal,
+            "resolved",
+            lambda m, s: resolver.resolve(m.assignments[s]),
+        )
+
+    def _signal_tree(self, params):
+        if "signal" not in params:
+            raise RequestError("expected 'signal'")
+        module = self._module(params)
+        tree = self._resolved(module, params["signal"])
+        return getattr(tree, "rhs", tree)
+
+    # -- methods ------------------------------------------------------------
+
+    def do_lower(self, params):
+        source, dirty = self._load(params)
+        names = self.session.module_names(source)
+        if "module" in params:
+            names = [n for n in names if n == params["module"]]
+        modules = {}
+        for name in names:
+            mod = self.session.module(name)
+            modules[name] = {
+                "ports": list(mod.ports),
+                "nets": sorted(mod.signal_map),
+                "signals": list(mod.assignments),
+            }
+        return {"modules": modules, "relowered": dirty}
+
+    def do_hash(self, params):
+        from logictree.utils.analysis import get_logic_hash
+        from logictree.utils.bdd_context import get_bdd_context
+
+        module = self._module(params)
+        signals = params.get("signals") or list(self.session.module(module).assignments)
+        ctx = get_bdd_context(module)
+        hashes = {}
+        for signal in signals:
+            tree = self._resolved(module, signal)
+            tree = getattr(tree, "rhs", tree)
+            hashes[signal] = self.session.analysis(
+                module,
+                signal,
+                "hash",
+                lambda m, s, tree=tree: get_logic_hash(tree, ctx=ctx),
+            )
+        return {"module": module, "hashes": hashes}
+
+    def do_compare(self, params):
+        from logictree.utils.compare import compare_logic_trees
+
+        if "a" not in params or "b" not in params:
+            raise RequestError("expected 'a' and 'b' signal references")
+        a = self._signal_tree(params["a"])
+        b = self._signal_tree(params["b"])
+        method = params.get("method", "auto")
+        return {"equal": bool(compare_logic_trees(a, b, method=method))}
+
+    def do_simplify(self, params):
+        from logictree.transforms.simplify import simplify
+        from logictree.utils.analysis import gate_count
+        from logictree.utils.display import pretty_inline
+
+        tree = self._signal_tree(params)
+        simplified = simplify(tree)
+        return {
+            "expr": pretty_inline(simplified),
+            "gates_before": gate_count(tree),
+            "gates_after": gate_count(simplified),
+        }
+
+    def do_eval(self, params):
+        from logictree.eval import evaluate, evaluate_many
+
+        tree = self._signal_tree(params)
+        if "envs" in params:
+            return {"values": [int(v) for v in evaluate_many(tree, params["envs"])]}
+        if "env" not in params:
+            raise RequestError("expected 'env' or 'envs'")
+        return {"value": int(evaluate(tree, params["env"]))}
+
+    def do_serialize(self, params):
+        from logictree.utils.serialize import logic_tree_to_json
+
+        return {"tree": logic_tree_to_json(self._signal_tree(params))}
+
+
+def _error(e: Exception) -> dict:
+    message = str(e.args[0]) if isinstance(e, KeyError) and e.args else str(e)
+    return {"type": type(e).__name__, "message": message}
+
+
+def serve_stream(server: Server, infile, outfile) -> None:
+    """Answer one request per input line until EOF or a shutdown request."""
+    for line in infile:
+        if not line.strip():
+            continue
+        outfile.write(server.handle_line(line) + "\n")
+        outfile.flush()
+        if not server.running:
+            break
+
+
+def serve_unix(server: Server, path: str) -> None:
+    """Listen on a Unix socket; each connection is served like stdin."""
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            infile = (raw.decode("utf-8") for raw in self.rfile)
+            out = _LineWriter(self.wfile)
+            serve_stream(server, infile, out)
+            if not server.running:
+                # shutdown() waits for serve_forever(), i.e. for this handler
+                threading.Thread(target=self.server.shutdown).start()
+
+    if os.path.exists(path):
+        os.unlink(path)  # stale socket from a previous run
+    with socketserver.UnixStreamServer(path, Handler) as sock:
+        log.info("logictree serve: listening on %s", path)
+        try:
+            sock.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if os.path.exists(path):
+                os.unlink(path)
+
+
+class _LineWriter:
+    def __init__(self, wfile):
+        self.wfile = wfile
+
+    def write(self, text: str) -> None:
+        self.wfile.write(text.encode("utf-8"))
+
+    def flush(self) -> None:
+        self.wfile.flush()
+
+
+def build_serve_parser():
+    parser = argparse.ArgumentParser(
+        prog="logictree serve",
+        description="Answer newline-delimited JSON requests (see cli/serve.py)",
+    )
+    parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        help="Listen on a Unix socket instead of reading stdin",
+    )
+    parser.add_argument(
+        "--fast_lowering",
+        action="store_true",
+        help="Lower assign-only modules without building an ANTLR parse tree",
+    )
+    parser.add_argument(
+        "--loglevel",
+        default="warning",
+        choices=["debug", "info", "warning", "error"],
+        help="Set log level (default: warning)",
+    )
+    return parser
+
+
+def serve_main(argv=None) -> int:
+    args = build_serve_parser().parse_args(argv)
+    # stdout carries the responses; logging goes to stderr
+    logging.basicConfig(level=getattr(logging, args.loglevel.upper()))
+    server = Server(fast=args.fast_lowering)
+    if args.socket:
+        serve_unix(server, args.socket)
+    else:
+        serve_stream(server, sys.stdin, sys.stdout)
+    return 0
@@ -0,0 +1,178 @@
+"""
+`logictree --watch`: keep the process resident and re-run the requested
+outputs whenever the sources change.
+
+Files are polled by mtime and size. Changed files go through a
+LoweringSession, so only edited modules are parsed and lowered again, and
+the top module's BDD manager (get_bdd_context) stays alive between runs.
+Within the top module, each resolved signal is fingerprinted and only
+signals whose tree actually changed are handed to handle_output().
+"""
+
+import hashlib
+import logging
+import os
+import sys
+import time
+
+from logictree.nodes.control.assign import LogicAssign
+from logictree.nodes.control.case import CaseItem, CaseStatement
+from logictree.nodes.ops.ops import LogicConst, LogicVar
+from logictree.nodes.selects import BitSelect, PartSelect
+from logictree.session import LoweringSession
+from logictree.utils.traverse import children_of, fold
+
+log = logging.getLogger(__name__)
+
+
+_LEAF_ATTRS = ("name", "value", "width", "index", "msb", "lsb")
+
+
+def _fingerprint_children(node) -> tuple:
+    if isinstance(node, (list, tuple)):
+        return tuple(node)
+    if isinstance(node, LogicAssign):
+        return (node.lhs, node.rhs)
+    if isinstance(node, CaseStatement):
+        return (node.selector, *node.items, node.default or ())
+    if isinstance(node, CaseItem):
+        return (node.body,)
+    return children_of(node)
+
+
+def _fingerprint_label(node) -> str:
+    if isinstance(node, (LogicVar, LogicConst, BitSelect, PartSelect)):
+        attrs = (getattr(node, a, None) for a in _LEAF_ATTRS)
+        return f"{type(node).__name__}{tuple(attrs)!r}"
+    if isinstance(node, CaseItem):
+        labels = [getattr(lbl, "value", lbl) for lbl in node.labels]
+        return f"CaseItem({labels!r},{node.default})"
+    return type(node).__name__
+
+
+def _fingerprint(tree, memo=None) -> str:
+    """
+    Structural digest of a lowered tree: node types, names, values and
+    children only, so cached metrics and object sharing do not change it
+    (str()/repr() are lossy). Pass one `memo` to share work across trees.
+    """
+
+    def visit(node, digests):
+        h = hashlib.sha256(_fingerprint_label(node).encode())
+        for d in digests:
+            h.update(d)
+        return h.digest()
+
+    return fold(tree, visit, _fingerprint_children, memo).hex()
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class Watcher:
+    """Re-runs handle_output() for the top module's changed signals."""
+
+    def __init__(self, paths, args, file=None):
+        self.paths = list(paths)
+        self.args = args
+        self.file = file or sys.stderr  # status lines; outputs go to stdout
+        self.session = LoweringSession(fast=args.fast_lowering)
+        self._stamps = {}
+        self._top = None
+        self._fingerprints = {}  # signal -> fingerprint of the last output run
+
+    def _top_name(self):
+        if self.args.top:
+            return self.args.top
+        for path in self.paths:
+            names = self.session.module_names(path)
+            if names:
+                return names[0]
+        return None
+
+    def poll(self):
+        """
+        Check the sources once. Returns the {signal: tree} map that was
+        output, or None when no file changed.
+        """
+        changed = []
+        for path in self.paths:
+            stamp = _stamp(path)
+            if stamp != self._stamps.get(path):
+                self._stamps[path] = stamp
+                changed.append(path)
+        if not changed:
+            return None
+
+        dirty = set()
+        for path in changed:
+            try:
+                if self._stamps[path] is None:
+                    dirty.update(self.session.remove_source(path).dirty)
+                else:
+                    dirty.update(self.session.update_file(path).dirty)
+            except Exception as e:
+                print(f"{path}: {e}", file=self.file)
+        return self._run(dirty)
+
+    def _run(self, dirty):
+        from cli.main import apply_lowering, handle_output, resolve_outputs
+
+        top = self._top_name()
+        if top is None or top not in self.session.modules:
+            print(f"top module '{top or '?'}' not found", file=self.file)
+            return {}
+        if top != self._top:
+            self._top, self._fingerprints = top, {}
+        elif top not in dirty:
+            return {}
+
+        mod = self.session.module(top)
+        try:
+            lowered_map = apply_lowering(mod.assignments, self.args)
+            resolved_map = resolve_outputs(mod, lowered_map, self.args, self.file)
+        except Exception as e:
+            print(f"{top}: {e}", file=self.file)
+            return {}
+
+        memo = {}
+        fingerprints = {
+            name: _fingerprint(tree, memo) for name, tree in resolved_map.items()
+        }
+        todo = {
+            name: tree
+            for name, tree in resolved_map.items()
+            if self._fingerprints.get(name) != fingerprints[name]
+        }
+        self._fingerprints = fingerprints
+        print(
+            f"[{time.strftime('%H:%M:%S')}] {top}: {len(todo)} of "
+            f"{len(resolved_map)} signals changed",
+            file=self.file,
+        )
+        if todo:
+            # The old trees are gone; keep the manager and its variables.
+            # (bdd_context is only loaded once a run has hashed something.)
+            bdd_context = sys.modules.get("logictree.utils.bdd_context")
+            if bdd_context is not None:
+                bdd_context.get_bdd_context(top).clear()
+            handle_output(todo, self.args, module_name=top)
+        return todo
+
+    def run(self, interval: float = 0.5, max_polls=None):
+        """Poll every `interval` seconds until interrupted (or max_polls)."""
+        polls = 0
+        try:
+            while max_polls is None or polls < max_polls:
+                t0 = time.perf_counter()
+                if self.poll() is not None:
+                    log.info("Watch run took %.3f s", time.perf_counter() - t0)
+                polls += 1
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
@@ -1,10 +1,11 @@
 import dataclasses
 import logging
+import os
 import re
 import sys
 from dataclasses import Field
 from pprint import pformat
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from logictree.nodes import LogicMux, control, ops
 from logictree.nodes.control.assign import LogicAssign
@@ -58,12 +59,12 @@ def where_defined(obj):
     return path or f"(module {obj.__module__} has no __file__)"
 
 
-log.warning(
+log.debug(
     "Parser module: %s @ %s",
     SystemVerilogSubsetParser.__module__,
     where_defined(SystemVerilogSubsetParser),
 )
-log.warning(
+log.debug(
     "Visitor module: %s @ %s",
     SystemVerilogSubsetVisitor.__module__,
     where_defined(SystemVerilogSubsetVisitor),
@@ -71,8 +72,22 @@ log.warning(
 
 
 class SVToLogicTreeLowerer(SystemVerilogSubsetVisitor):
-    def __init__(self):
+    """
+    Lowers an ANTLR parse tree to LogicTree IR.
+
+    By default the lowerer runs in fast mode: per-node dispatch tracing,
+    whole-module getText()/pformat dumps and the dataclass integrity checks
+    (assert_no_fields and friends) are skipped. Pass debug=True, or set
+    LOGICTREE_DEBUG_LOWERING=1, to turn them back on when chasing a lowering
+    bug; their output goes to this module's logger at DEBUG level.
+    """
+
+    def __init__(self, debug: Optional[bool] = None):
         super().__init__()
+        if debug is None:
+            debug = os.environ.get("LOGICTREE_DEBUG_LOWERING", "") not in ("", "0")
+        self.debug = debug
+        self._dispatch = {}  # parse-tree context class -> visit method name
         self.module_name = None
         self.module_map = {}
         self.output_signals = set()
@@ -145,16 +160,20 @@ class SVToLogicTreeLowerer(SystemVerilogSubsetVisitor):
 
     def visit(self, tree):
         # E.g., AndExprContext -> visitAndExpr
-        name = type(tree).__name__.replace("Context", "")
-        meth = getattr(self, f"visit{name}", None)
-        try:
-            txt = tree.getText()
-        except Exception:
-            txt = "<no text>"
-        log.debug(
-            f"[DISPATCH] {name} -> {'visit'+name if meth else 'visitChildren'} :: {txt}"
-        )
-        return meth(tree) if meth else self.visitChildren(tree)
+        cls = type(tree)
+        meth_name = self._dispatch.get(cls)
+        if meth_name is None:
+            meth_name = "visit" + cls.__name__.replace("Context", "")
+            if not hasattr(self, meth_name):
+                meth_name = "visitChildren"
+            self._dispatch[cls] = meth_name
+        if self.debug:
+            try:
+                txt = tree.getText()
+            except Exception:
+                txt = "<no text>"
+            log.debug("[DISPATCH] %s -> %s :: %s", cls.__name__, meth_name, txt)
+        return getattr(self, meth_name)(tree)
 
     def lower(self, ast):
         assert isinstance(ast, dict) and ast.get(
@@ -211,55 +230,63 @@ class SVToLogicTreeLowerer(SystemVerilogSubsetVisitor):
     def visitModule_declaration(self, ctx):
         log.debug("visiting module_declaration")
 
+        # identifier_ctx = ctx.module_identifier()
+        self.begin_module(ctx.module_identifier().getText())
+
+        port_list_ctx = ctx.port_list()
+        if port_list_ctx:
+            self.visitPort_list(port_list_ctx)
+
+        if self.debug:
+            log.debug(">>>pre visit: %s", ctx.getText())
+        for item in ctx.module_item():
+            self.visitModule_item(item)
+        if self.debug:
+            log.debug(">>>post visit: %s", ctx.getText())
+
+        return self.end_module()
+
+    # The begin_module/declare_port/add_assign/end_module and build_* methods
+    # below hold the lowering semantics; the visit* methods only pull their
+    # arguments out of the parse tree, so other front ends (fast_lowering)
+    # produce the same IR.
+
+    def begin_module(self, module_name: str) -> Module:
         # Clear maps at start of module
         self.signal_map = {}
         self.output_signals = set()
 
-        # identifier_ctx = ctx.module_identifier()
-        module_name = ctx.module_identifier().getText()
         self.module_name = module_name
-        log.debug(f"Parsing module: {module_name}")
+        log.debug("Parsing module: %s", module_name)
 
         mod_obj = Module(name=module_name)
         self.current_module = mod_obj
-        log.debug(f"type(mod_obj.signal_map): {type(mod_obj.signal_map)}")
-        log.debug(f"Module: {Module}")
-        log.debug(f"Module.__dataclass_fields__: {Module.__dataclass_fields__}")
+        if self.debug:
+            log.debug("type(mod_obj.signal_map): %s", type(mod_obj.signal_map))
+            log.debug("Module.__dataclass_fields__: %s", Module.__dataclass_fields__)
 
         # when you create the module
         self.current_module.vector_widths = {}  # name -> (msb:int, lsb:int)
+        return mod_obj
 
-        port_list_ctx = ctx.port_list()
-        if port_list_ctx:
-            self.visitPort_list(port_list_ctx)
-
+    def end_module(self) -> Module:
+        mod_obj = self.current_module
+        module_name = mod_obj.name
         ports = list(self.output_signals)
-        log.debug(f"port_list_ctx: {port_list_ctx}")
-        log.debug(f"ports: {ports}")
-
-        log.debug(f">>>pre visit: {ctx.getText()}")
-        for item in ctx.module_item():
-            log.debug(f"Visiting module item: {type(item).__name__}")
-            self.visitModule_item(item)
-
-        log.debug(f">>>post visit: {ctx.getText()}")
+        log.debug("ports: %s", ports)
 
         mod_obj.ports = ports.copy()
         # mod_obj.signal_map = self.current_module.signal_map.copy()
         mod_obj.signal_map.update(self.current_module.signal_map)
 
-        # Output debug summaries
-        log.debug("Signal map contents after visiting module:")
-        for name, tree in self.current_module.signal_map.items():
-            log.debug(f" {name}: {tree}")
-
-        log.debug("Output signals detected:")
-        for out in self.output_signals:
-            log.debug(f"  {out}")
+        if self.debug:
+            log.debug("Signal map contents after visiting module:")
+            for name, tree in self.current_module.signal_map.items():
+                log.debug(" %s: %s", name, tree)
+            log.debug("Output signals detected: %s", sorted(self.output_signals))
+            log.debug("Module Dump:\n%s", pformat(mod_obj.__dict__, indent=2))
 
         self.module_map[module_name] = mod_obj
-        log.debug(f"setting module_map[{module_name}] = {mod_obj}")
-        log.debug("Module Dump:\n%s", pformat(mod_obj.__dict__, indent=2))
         self.current_module = None  # Clear after processing
         return mod_obj
 
@@ -267,9 +294,12 @@ class SVToLogicTreeLowerer(SystemVerilogSubsetVisitor):
         log.debug("visitModule_item")
         # log.debug(f"ctx.getChildren(): {ctx.getChildren()}")
         for child in ctx.getChildren():
-            log.debug(
-                f"Child of module_item: {type(child).__name__}, text: {child.getText()}"
-            )
+            if self.debug:
+                log.debug(
+                    "Child of module_item: %s, text: %s",
+                    type(child).__name__,
+                    child.getText(),
+                )
             if isinstance(child, SystemVerilogSubsetParser.Continuous_assignContext):
                 log.debug("Detected Continuous_assignContext")
                 return self.visitContinuous_assign(child)
@@ -306,6 +336,9 @@ class SVToLogicTreeLowerer(SystemVerilogSubsetVisitor):
             tail = re.sub(r"^(logic|wire|reg|signed|unsigned)+", "", tail)
             ids = [tok for tok in re.split(r"[,\s]+", tail) if tok]
 
+        self.declare_port(direction_tok, msb, lsb, ids)
+
+    def declare_port(self, direction_tok: str, msb, lsb, ids: List[str]):
         for name in ids:
             # create/record the var
             if name not in self.current_module.signal_map:
@@ -334,7 +367,9 @@ class SVToLogicTreeLowerer(SystemVerilogSubsetVisitor):
                 self.current_module.ports.append(name)
 
             # debug like before
-            self.logger.debug(f"Port {direction_tok:<6} {name:<10} width={width_str}")
+            self.logger.debug(
+                "Port %-6s %-10s width=%s", direction_tok, name, width_str
+            )
 
     def visitData_type(self, ctx):
         return self.visitChildren(ctx)
@@ -346,7 +381,8 @@ class SVToLogicTreeLowerer(SystemVerilogSubsetVisitor):
         log.debug("vistAlways_comb_block")
         block = ctx.statement()
         if block is not None:
-            log.debug("block: %s", block.getText())
+            if self.debug:
+                log.debug("block: %s", block.getText())
             return self.visit(block)
 
     def visitStatement_item(self, ctx):
@@ -370,7 +406,8 @@ class SVToLogicTreeLowerer(SystemVerilogSubsetVisitor):
         return None
 
     def visitStatement(self, ctx):
-        log.debug(f"visitStatement() - ctx: {ctx.getText()}")
+        if self.debug:
+            log.debug("visitStatement() - ctx: %s", ctx.getText())
         if ctx.begin_end_block():
             log.debug("visitStatement begin_end_block")
             block = ctx.begin_end_block()
@@ -394,10 +431,10 @@ class SVToLogicTreeLowerer(SystemVerilogSubsetVisitor):
                 if case_node.items and case_node.items[0].body:
                     lhs = case_node.items[0].body[0].lhs
                 self.current_module.signal_map[lhs] = case_node
-                log.debug(
-                    f"Registered logic for {lhs}:\n{pretty_print(self.current_module.signal_map[lhs])}"
-                )
-                log.debug("case_node: %s", pretty_print(case_node))
+                if self.debug:
+                    log.debug(
+                        "Registered logic for %s:\n%s", lhs, pretty_print(case_node)
+                    )
             return case_node
 
         elif ctx.blocking_assignment():
@@ -409,11 +446,12 @@ class SVToLogicTreeLowerer(SystemVerilogSubsetVisitor):
             rhs_tree = self.visit(rhs_expr)
             assign_node = control.LogicAssign(lhs=lhs, rhs=rhs_tree)
             self.current_module.signal_map[lhs] = rhs_tree
-            log.info(f"[statement assign] {assign_node}")
+            log.info("[statement assign] %s", assign_node)
             return assign_node
 
         elif ctx.expression():
-            log.debug("visitStatement expression: %s", ctx.expression().getText())
+            if self.debug:
+                log.debug("visitStatement expression: %s", ctx.expression().getText())
             return self.visit(ctx.expression())
         else:
             log.warning(f"Error unknown statement context: {type(ctx)}")
@@ -425,11 +463,8 @@ class SVToLogicTreeLowerer(SystemVerilogSubsetVisitor):
         rhs_tree = self.visit(ctx.expression())
         lhs_var = self.current_module.signal_map.get(lhs, LogicVar(lhs))
         node = LogicAssign(lhs=lhs_var, rhs=rhs_tree)
-        log.debug(
-            f"Assigning signal_map.get() to current_module.assignments[{lhs}] = {node}"
-        )
         self.current_module.assignments[lhs] = node
-        log.debug(f"[statement assign] {node}")
+        log.debug("[statement assign] %s", node)
         return node
 
     # def visitBlocking_assignment(self, ctx):
@@ -489,82 +524,20 @@ class SVToLogicTreeLowerer(SystemVerilogSubsetVisitor):
 
     def visitContinuous_assign(self, ctx):
         log.debug("!!visitContinuous_assign")
-        children = list(ctx.getChildren())
-        log.debug(f"num_children: {len(children)}")
-        log.debug(f"children: {children}")
 
         try:
             # LHS
             lhs_ctx = ctx.variable_lvalue()
             lhs = lhs_ctx.getText()
 
-            for name, val in vars(self.current_module).items():
-                if isinstance(val, dataclasses.Field):
-                    log.warn(f"{name} is still a Field object: {val}")
-
-            log.debug(f"current_module: {self.current_module}")
-
-            log.debug("Module class: %s", type(self.current_module))
-            log.debug("Module.__module__: %s", type(self.current_module).__module__)
-            log.debug("Module.__dict__: %s", self.current_module.__dict__)
-            lhs_var = self.current_module.signal_map.get(lhs, LogicVar(lhs))
-
-            log.debug(
-                f"type(self.current_module.assignments) = {type(self.current_module.assignments)}"
-            )
-            log.debug(
-                f"type(self.current_module.signal_map) = {type(self.current_module.signal_map)}"
-            )
             # RHS is always child[3] in "assign <lhs> = <rhs> ;"
             rhs_ctx = ctx.getChild(3)
-            rhs_text = rhs_ctx.getText()
-            log.debug(f"lhs: {lhs}, rhs_text: {rhs_text}")
+            if self.debug:
+                self._check_module_fields()
+                log.debug("lhs: %s, rhs_text: %s", lhs, rhs_ctx.getText())
 
             rhs_tree = self.visit(rhs_ctx)  # must dispatch visitor!
-            log.debug(f"assign LHS = {lhs}, RHS tree = {rhs_tree}")
-
-            from logictree.utils.debug import assert_no_fields
-
-            log.debug(f"Creating assign: {lhs_var} = {rhs_tree}")
-            assign_node = LogicAssign(lhs=lhs_var, rhs=rhs_tree)
-
-            field_name, field_val = contains_field_object(assign_node)
-            if field_name:
-                log.error(
-                    f"assign_node.{field_name} is a dataclasses.Field: {field_val}"
-                )
-                raise TypeError(
-                    f"assign_node contains uninitialized dataclass field '{field_name}'"
-                )
-
-            log.debug("assign_node: %s", dataclasses.asdict(assign_node))
-
-            for attr_name, attr_val in vars(assign_node).items():
-                if isinstance(attr_val, dataclasses.Field):
-                    log.error(
-                        f" assign_node.{attr_name} is a dataclasses.Field: {attr_val}"
-                    )
-                else:
-                    log.debug(f" assign_node.{attr_name} = {attr_val}")
-
-            # optional viz label
-            try:
-                from logictree.utils.display import pretty_inline
-                from logictree.utils.overlay import set_label
-
-                set_label(rhs_tree, f"{lhs} = {pretty_inline(rhs_tree)}")
-                # rhs_tree.set_viz_label(f"{lhs} = {pretty_inline(rhs_tree)}")
-            except Exception as e:
-                log.debug("Could not set viz label: %s", e)
-
-            self.current_module.assignments[lhs_var.name] = assign_node
-
-            log.debug("Assignments collected:")
-            for k, assign in self.current_module.assignments.items():
-                log.debug(f"  {k} = {assign}")
-
-            assert_no_fields(assign_node, name="assign_tree")
-            return assign_node
+            return self.add_assign(lhs, rhs_tree)
 
         except AttributeError as e:
             if "'Field' object has no attribute 'get'" in str(e):
@@ -579,6 +552,47 @@ class SVToLogicTreeLowerer(SystemVerilogSubsetVisitor):
             log.warning(f"Failed to parse assign: {ctx.getText()} — {e}")
             return None
 
+    def add_assign(self, lhs: str, rhs_tree) -> LogicAssign:
+        lhs_var = self.current_module.signal_map.get(lhs, LogicVar(lhs))
+        assign_node = LogicAssign(lhs=lhs_var, rhs=rhs_tree)
+        if self.debug:
+            self._check_assign(assign_node)
+
+        # optional viz label
+        try:
+            from logictree.utils.display import pretty_inline
+            from logictree.utils.overlay import set_label
+
+            set_label(rhs_tree, f"{lhs} = {pretty_inline(rhs_tree)}")
+            # rhs_tree.set_viz_label(f"{lhs} = {pretty_inline(rhs_tree)}")
+        except Exception as e:
+            log.debug("Could not set viz label: %s", e)
+
+        self.current_module.assignments[lhs_var.name] = assign_node
+        log.debug("assign %s = %s", lhs, rhs_tree)
+        return assign_node
+
+    def _check_module_fields(self):
+        """Debug-only: report Module attributes left as dataclasses.Field."""
+        for name, val in vars(self.current_module).items():
+            if isinstance(val, dataclasses.Field):
+                log.warning("%s is still a Field object: %s", name, val)
+
+    def _check_assign(self, assign_node):
+        """Debug-only integrity checks on a freshly built assignment."""
+        from logictree.utils.debug import assert_no_fields
+
+        field_name, field_val = contains_field_object(assign_node)
+        if field_name:
+            log.error(
+                "assign_node.%s is a dataclasses.Field: %s", field_name, field_val
+            )
+            raise TypeError(
+                f"assign_node contains uninitialized dataclass field '{field_name}'"
+            )
+        log.debug("assign_node: %s", dataclasses.asdict(assign_node))
+        assert_no_fields(assign_node, name="assign_tree")
+
     def visitCase_statement(self, ctx):
         selector_node = self.visit(ctx.expression())  # adjust if your rule name differs
         items = []
@@ -587,7 +601,7 @@ class SVToLogicTreeLowerer(SystemVerilogSubsetVisitor):
             body = self.visit(ci.statement())
             labels, is_default = self._labels_from_case_item(ci)
             log.debug(
-                f"visitCase_statement: labels, is_default: {labels}, {is_default}"
+                "visitCase_statement: labels=%s, is_default=%s", labels, is_default
             )
             case_item = control.CaseItem(labels=labels, default=is_default, body=body)
             items.append(case_item)
@@ -603,6 +617,9 @@ class SVToLogicTreeLowerer(SystemVerilogSubsetVisitor):
     def visitBitSelectExpr(self, ctx):
         base = self.visit(ctx.expression(0))
         idx = self.visit(ctx.expression(1))
+        return self.build_bit_select(base, idx)
+
+    def build_bit_select(self, base, idx):
         # accept int or small const wrappers with .value
         if not isinstance(idx, int):
             v = getattr(idx, "value", None)
@@ -619,7 +636,9 @@ class SVToLogicTreeLowerer(SystemVerilogSubsetVisitor):
         base = self.visit(ctx.expression(0))
         msb = self.visit(ctx.expression(1))
         lsb = self.visit(ctx.expression(2))
+        return self.build_part_select(base, msb, lsb)
 
+    def build_part_select(self, base, msb, lsb):
         def _as_int(n):
             if isinstance(n, int):
                 return n
@@ -680,7 +699,9 @@ class SVToLogicTreeLowerer(SystemVerilogSubsetVisitor):
     def visitEqExpr(self, ctx):
         lhs = self.visit(ctx.expression(0))
         rhs = self.visit(ctx.expression(1))
+        return self.build_eq(lhs, rhs)
 
+    def build_eq(self, lhs, rhs):
         # Case: vector equality with constant literal
         if isinstance(lhs, LogicVar) and isinstance(rhs, LogicConst):
             width = getattr(lhs, "width", None)
@@ -706,7 +727,9 @@ class SVToLogicTreeLowerer(SystemVerilogSubsetVisitor):
     def visitNeqExpr(self, ctx):
         lhs = self.visit(ctx.expression(0))
         rhs = self.visit(ctx.expression(1))
+        return self.build_neq(lhs, rhs)
 
+    def build_neq(self, lhs, rhs):
         if isinstance(rhs, LogicConst):
             if isinstance(lhs, LogicVar):
                 width = getattr(lhs, "width", None)
@@ -756,7 +779,8 @@ class SVToLogicTreeLowerer(SystemVerilogSubsetVisitor):
             raise ValueError(f"Unsupported comparison op: {op}")
 
     def visitParenExpr(self, ctx):
-        log.info("visitParenExpr with: %s", ctx.getText())
+        if self.debug:
+            log.debug("visitParenExpr with: %s", ctx.getText())
         return self.visit(ctx.expression())
 
     def visitRange(self, ctx):
@@ -791,17 +815,18 @@ class SVToLogicTreeLowerer(SystemVerilogSubsetVisitor):
 
     def visitConstExpr(self, ctx):
         log.debug("visitConstExpr")
-        text = ctx.getText()
-        log.debug(f"text: {text}")
+        return self.build_const(ctx.getText())
+
+    def build_const(self, text: str):
+        log.debug("text: %s", text)
 
         # Binary, hex, decimal literals
         if "'" in text:  # e.g. 2'b10, 4'hF, 8'd255
             width_str, base_and_val = text.split("'")
-            log.debug(f"width_str: {width_str}, base_and_val: {base_and_val}")
             width = int(width_str) if width_str else None
             base = base_and_val[0].lower()
             val_str = base_and_val[1:]
-            log.debug(f"width: {width}, base: {base}, val_str: {val_str}")
+            log.debug("width: %s, base: %s, val_str: %s", width, base, val_str)
 
             if base == "b":
                 value = int(val_str, 2)
@@ -812,7 +837,6 @@ class SVToLogicTreeLowerer(SystemVerilogSubsetVisitor):
             else:
                 raise ValueError(f"Unsupported literal base: {base}")
 
-            log.debug(f"value: {value}")
             const = LogicConst(value=value, width=width, base=base)
             log.debug("Const constructed: %r (type=%s)", const, type(const.value))
             return const
@@ -848,10 +872,11 @@ class SVToLogicTreeLowerer(SystemVerilogSubsetVisitor):
 
     def visitIdExpr(self, ctx):
         log.debug("visitIdExpr")
-        name = ctx.getText()
+        return self.build_identifier(ctx.getText())
+
+    def build_identifier(self, name: str):
         if name in self.current_module.signal_map:
-            log.debug(f"found {name} in current_module.signal_map!")
-            log.debug(f"returning: {self.current_module.signal_map[name]}")
+            log.debug("found %s in current_module.signal_map", name)
             return self.current_module.signal_map[name]
         if self.strict_identifiers:
             raise ValueError(f"Signal '{name}' not found in signal_map")
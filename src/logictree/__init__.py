@@ -1,6 +1,12 @@
 # logictree package
 from .nodes import LogicAssign, LogicConst, LogicMux, LogicVar
-from .pipeline import lower_sv_file_to_logic, lower_sv_text_to_logic
+from .pipeline import (
+    iter_sv_file_modules,
+    lower_sv_file_to_logic,
+    lower_sv_files_to_logic,
+    lower_sv_text_to_logic,
+)
+from .session import LoweringSession
 
 __all__ = [
     "LogicVar",
@@ -9,4 +15,7 @@ __all__ = [
     "LogicAssign",
     "lower_sv_text_to_logic",
     "lower_sv_file_to_logic",
+    "lower_sv_files_to_logic",
+    "iter_sv_file_modules",
+    "LoweringSession",
 ]
@@ -0,0 +1,434 @@
+"""
+Array-backed and-inverter graph (AIG) form of LogicTree expressions.
+
+The object tree is convenient to build and inspect, but every pass over it
+pays Python object overhead per gate. Once an expression is lowered to
+primitives it can instead be stored column-wise: one row per node in three
+typed arrays, indexed by node id.
+
+  * kind[n]:              CONST (node 0 only), INPUT or AND
+  * fanin0[n], fanin1[n]: the two input literals of an AND node
+                          (for an INPUT, fanin0 is its index in `inputs`)
+
+A *literal* is 2 * node + complement, so `lit ^ 1` is its inverse and the
+literals FALSE (0) and TRUE (1) are the constant node. Nodes are appended
+after their fanins, which makes index order a topological order: evaluation,
+gate counting, levels and hashing are single forward/backward loops over the
+arrays. AND nodes are structurally hashed on creation and the trivial cases
+(x&0, x&1, x&x, x&~x) fold away, so building an AIG already shares common
+subexpressions and propagates constants.
+
+Conversion from trees goes through the gates' `to_primitives()` (and
+`LogicMux.to_primitives()`); AND/OR/NOT map directly, with OR stored as
+~(~a & ~b). Operand and signal naming follows the BDD builder: a LogicVar is a
+single input named after the signal, and `s[i]` selects become inputs named
+"s[i]", which is also the key logictree.eval.evaluate() reads for them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from array import array
+from typing import Mapping, Optional
+
+from logictree.nodes.base.base import LogicTreeNode
+from logictree.nodes.control.assign import LogicAssign
+from logictree.nodes.control.ifstatement import IfStatement
+from logictree.nodes.hole.hole import LogicHole
+from logictree.nodes.ops.gates import AndOp, NotOp
+from logictree.nodes.ops.mux import LogicMux
+from logictree.nodes.ops.ops import LogicConst, LogicOp, LogicVar
+from logictree.nodes.selects import BitSelect, Concat, PartSelect
+from logictree.utils.traverse import fold
+
+__all__ = ["AIG", "CONST", "INPUT", "AND", "FALSE", "TRUE", "from_logic_tree"]
+
+CONST, INPUT, AND = 0, 1, 2
+FALSE, TRUE = 0, 1
+
+# Gates that are stored via their to_primitives() form
+_COMPOUND_OPS = frozenset({"XOR", "XNOR", "NAND", "NOR"})
+
+
+class AIG:
+    """And-inverter graph with named inputs and outputs; see module docstring."""
+
+    def __init__(self):
+        self.kind = array("B", [CONST])
+        self.fanin0 = array("I", [0])
+        self.fanin1 = array("I", [0])
+        self.inputs: list[str] = []
+        self.outputs: dict[str, int] = {}
+        self._input_lits: dict[str, int] = {}
+        self._strash: dict[tuple[int, int], int] = {}
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def __repr__(self):
+        return (
+            f"AIG(inputs={len(self.inputs)}, ands={self.num_ands}, "
+            f"outputs={len(self.outputs)})"
+        )
+
+    @property
+    def num_ands(self) -> int:
+        """AND nodes stored, including ones no output uses."""
+        return len(self.kind) - 1 - len(self.inputs)
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+    def _append(self, kind: int, f0: int, f1: int) -> int:
+        node = len(self.kind)
+        self.kind.append(kind)
+        self.fanin0.append(f0)
+        self.fanin1.append(f1)
+        return 2 * node
+
+    def input(self, name: str) -> int:
+        """Literal of input `name`, declaring it on first use."""
+        lit = self._input_lits.get(name)
+        if lit is None:
+            lit = self._append(INPUT, len(self.inputs), 0)
+            self.inputs.append(name)
+            self._input_lits[name] = lit
+        return lit
+
+    def and_(self, a: int, b: int) -> int:
+        if a > b:
+            a, b = b, a
+        if a == FALSE or a == b ^ 1:
+            return FALSE
+        if a == TRUE or a == b:
+            return b
+        lit = self._strash.get((a, b))
+        if lit is None:
+            lit = self._strash[(a, b)] = self._append(AND, a, b)
+        return lit
+
+    def or_(self, a: int, b: int) -> int:
+        return self.and_(a ^ 1, b ^ 1) ^ 1
+
+    def xor_(self, a: int, b: int) -> int:
+        # Same shape as XorOp.to_primitives(): (a & ~b) | (~a & b)
+        return self.or_(self.and_(a, b ^ 1), self.and_(a ^ 1, b))
+
+    def mux_(self, sel: int, if_true: int, if_false: int) -> int:
+        return self.or_(self.and_(sel, if_true), self.and_(sel ^ 1, if_false))
+
+    def add_output(self, name: str, lit: int) -> int:
+        self.outputs[name] = lit
+        return lit
+
+    def add_tree(self, name: str, tree: LogicTreeNode, memo=None) -> int:
+        """Convert `tree` into this AIG and register it as output `name`."""
+        return self.add_output(name, self.literal_of(tree, memo))
+
+    def literal_of(self, tree: LogicTreeNode, memo: Optional[dict] = None) -> int:
+        """
+        Literal computing `tree` (converted iteratively).
+
+        `memo` is a fold() memo and may be shared between calls so subtrees
+        common to several outputs are converted once.
+        """
+        lowered: dict[int, tuple] = {}
+
+        def prim(node):
+            if isinstance(node, LogicMux) or (
+                isinstance(node, LogicOp) and node.op in _COMPOUND_OPS
+            ):
+                hit = lowered.get(id(node))
+                if hit is None:
+                    hit = lowered[id(node)] = (node, node.to_primitives())
+                return hit[1]
+            return node
+
+        def children(node):
+            p = prim(node)
+            if p is not node:
+                return (p,)
+            return _aig_children(node)
+
+        def visit(node, results):
+            if prim(node) is not node:
+                return results[0]
+            return self._lower_node(node, results)
+
+        result = fold(tree, visit, children, memo)
+        return _scalar(tree, result)
+
+    def _lower_node(self, node, results):
+        if isinstance(node, LogicConst):
+            v = int(node.value)
+            return [TRUE if (v >> i) & 1 else FALSE for i in range(node.width)]
+        if isinstance(node, (LogicVar, LogicHole)):
+            return self.input(node.name)
+        if isinstance(node, BitSelect):
+            return self.input(f"{node.base.name}[{node.index}]")
+        if isinstance(node, PartSelect):
+            step = 1 if node.lsb <= node.msb else -1
+            return [
+                self.input(f"{node.base.name}[{i}]")
+                for i in range(node.lsb, node.msb + step, step)
+            ]
+        if isinstance(node, Concat):
+            bits = []
+            # parts are MSB-first
+            for part, result in zip(reversed(node.parts), reversed(results)):
+                w = getattr(part, "width", 1)
+                bits.extend((_bits(result) + [FALSE] * w)[:w])
+            return bits
+        if isinstance(node, LogicOp) and node.op in ("==", "!="):
+            eq = self._equal(results)
+            return eq if node.op == "==" else eq ^ 1
+
+        kids = [_scalar(k, r) for k, r in zip(_aig_children(node), results)]
+        if isinstance(node, LogicAssign):
+            return kids[0]
+        if isinstance(node, IfStatement):
+            return self.mux_(kids[0], kids[1], kids[2] if len(kids) > 2 else FALSE)
+        if isinstance(node, LogicOp):
+            if node.op == "NOT":
+                return kids[0] ^ 1
+            if node.op == "AND":
+                return self.and_(*kids)
+            if node.op == "OR":
+                return self.or_(*kids)
+            raise ValueError(f"Unknown logic operator: {node.op}")
+        raise TypeError(f"Unsupported node type for AIG: {type(node).__name__}")
+
+    def _equal(self, results) -> int:
+        a, b = _bits(results[0]), _bits(results[1])
+        n = max(len(a), len(b))
+        a = a + [FALSE] * (n - len(a))
+        b = b + [FALSE] * (n - len(b))
+        eq = TRUE
+        for x, y in zip(a, b):
+            eq = self.and_(eq, self.xor_(x, y) ^ 1)
+        return eq
+
+    @classmethod
+    def from_trees(cls, trees: Mapping[str, LogicTreeNode]) -> AIG:
+        """One AIG with an output per (name, tree); shared subtrees share nodes."""
+        aig = cls()
+        memo: dict = {}
+        for name, tree in trees.items():
+            aig.add_tree(name, tree, memo)
+        return aig
+
+    # ------------------------------------------------------------------
+    # Array passes
+    # ------------------------------------------------------------------
+    def _roots(self, lits) -> list:
+        return list(self.outputs.values()) if lits is None else list(lits)
+
+    def cone_mask(self, lits=None) -> bytearray:
+        """mask[n] == 1 for every node in the fanin cone of `lits` (default: outputs)."""
+        mask = bytearray(len(self.kind))
+        for lit in self._roots(lits):
+            mask[lit >> 1] = 1
+        kind, f0, f1 = self.kind, self.fanin0, self.fanin1
+        for n in range(len(kind) - 1, 0, -1):
+            if mask[n] and kind[n] == AND:
+                mask[f0[n] >> 1] = 1
+                mask[f1[n] >> 1] = 1
+        return mask
+
+    def count_ands(self, lits=None) -> int:
+        """AND gates in the cone of `lits` (default: all outputs)."""
+        kind = self.kind
+        return sum(
+            1 for n, m in enumerate(self.cone_mask(lits)) if m and kind[n] == AND
+        )
+
+    def levels(self) -> array:
+        """Logic level of every node (inputs and constants are level 0)."""
+        kind, f0, f1 = self.kind, self.fanin0, self.fanin1
+        level = array("I", bytes(4 * len(kind)))
+        for n in range(1, len(kind)):
+            if kind[n] == AND:
+                a, b = level[f0[n] >> 1], level[f1[n] >> 1]
+                level[n] = 1 + (a if a > b else b)
+        return level
+
+    def depth(self, lits=None) -> int:
+        """Longest AND path to any of `lits` (default: all outputs)."""
+        level = self.levels()
+        return max((level[lit >> 1] for lit in self._roots(lits)), default=0)
+
+    def simulate(self, env: Mapping[str, int], mask: int = 1) -> list:
+        """
+        Value of every node. Input values are bit-parallel words: bit k of
+        env[name] is the input in pattern k, and `mask` selects the patterns.
+        """
+        kind, f0, f1 = self.kind, self.fanin0, self.fanin1
+        inputs = self.inputs
+        vals = [0] * len(kind)
+        for n in range(1, len(kind)):
+            if kind[n] == AND:
+                a, b = f0[n], f1[n]
+                va = vals[a >> 1] ^ mask if a & 1 else vals[a >> 1]
+                vb = vals[b >> 1] ^ mask if b & 1 else vals[b >> 1]
+                vals[n] = va & vb
+            else:
+                vals[n] = int(env[inputs[f0[n]]]) & mask
+        return vals
+
+    def evaluate(self, env: Mapping[str, int], mask: int = 1) -> dict:
+        """Output name -> value under `env` (see simulate() for `mask`)."""
+        vals = self.simulate(env, mask)
+        return {
+            name: vals[lit >> 1] ^ mask if lit & 1 else vals[lit >> 1]
+            for name, lit in self.outputs.items()
+        }
+
+    def structural_hash(self, lit: int) -> str:
+        """
+        SHA-256 of the cone of `lit`. Inputs are referred to by name and AND
+        nodes are numbered in DFS postorder from `lit`, visiting each fanin
+        pair in an order given by the structure below it, so the digest
+        ignores unrelated nodes, node indices and the order in which inputs
+        and ANDs were created. Equal digests mean structurally equal cones,
+        not merely equivalent functions (use BDD hashes for that).
+        """
+        kind, f0, f1 = self.kind, self.fanin0, self.fanin1
+        mask = self.cone_mask([lit])
+
+        # Index-free key of every cone node, used only to order fanin pairs
+        key = {0: "0"}
+
+        def kref(lit):
+            return ("!" if lit & 1 else "") + key[lit >> 1]
+
+        fanins = {}
+        for n in range(1, (lit >> 1) + 1):
+            if not mask[n]:
+                continue
+            if kind[n] == INPUT:
+                key[n] = f"I:{self.inputs[f0[n]]}"
+                continue
+            pair = sorted((f0[n], f1[n]), key=kref)
+            fanins[n] = pair
+            digest = hashlib.sha256(f"{kref(pair[0])},{kref(pair[1])}".encode())
+            key[n] = digest.hexdigest()[:32]
+
+        token = {0: "0"}
+        ands = 0
+
+        def ref(lit):
+            return ("!" if lit & 1 else "") + token[lit >> 1]
+
+        h = hashlib.sha256()
+        stack = [(lit >> 1, False)]
+        while stack:
+            n, expanded = stack.pop()
+            if n in token:
+                continue
+            if kind[n] == INPUT:
+                token[n] = f"I:{self.inputs[f0[n]]}"
+            elif not expanded:
+                stack.append((n, True))
+                stack.extend((c >> 1, False) for c in reversed(fanins[n]))
+            else:
+                token[n] = f"A{ands}"
+                ands += 1
+                a, b = fanins[n]
+                h.update(f"{token[n]}={ref(a)},{ref(b)};".encode())
+        h.update(f"O={ref(lit)}".encode())
+        return h.hexdigest()
+
+    def cleanup(self) -> AIG:
+        """A compacted copy holding only the output cones (rehashed)."""
+        new = AIG()
+        mask = self.cone_mask()
+        kind, f0, f1 = self.kind, self.fanin0, self.fanin1
+        lits = array("I", bytes(4 * len(kind)))
+        for n in range(1, len(kind)):
+            if not mask[n]:
+                continue
+            if kind[n] == INPUT:
+                lits[n] = new.input(self.inputs[f0[n]])
+            else:
+                a, b = f0[n], f1[n]
+                lits[n] = new.and_(lits[a >> 1] ^ (a & 1), lits[b >> 1] ^ (b & 1))
+        for name, lit in self.outputs.items():
+            new.add_output(name, lits[lit >> 1] ^ (lit & 1))
+        return new
+
+    # ------------------------------------------------------------------
+    # Back to LogicTree
+    # ------------------------------------------------------------------
+    def to_logic_tree(self, lit: int, memo: Optional[dict] = None) -> LogicTreeNode:
+        """
+        AndOp/NotOp tree for `lit`. Shared AIG nodes become shared tree nodes;
+        pass the same `memo` for several literals to share across them.
+        """
+        memo = {} if memo is None else memo
+        kind, f0, f1 = self.kind, self.fanin0, self.fanin1
+
+        def tree_of(lit):
+            if lit in memo:
+                return memo[lit]
+            if lit >> 1 == 0:
+                node = LogicConst(lit & 1)
+            else:
+                node = NotOp(memo[lit ^ 1])
+            memo[lit] = node
+            return node
+
+        mask = self.cone_mask([lit])
+        for n in range(1, (lit >> 1) + 1):
+            if not mask[n] or 2 * n in memo:
+                continue
+            if kind[n] == INPUT:
+                memo[2 * n] = LogicVar(self.inputs[f0[n]])
+            else:
+                memo[2 * n] = AndOp(tree_of(f0[n]), tree_of(f1[n]))
+        return tree_of(lit)
+
+    def to_logic_trees(self) -> dict:
+        """Output name -> tree, sharing nodes between outputs."""
+        memo: dict = {}
+        return {
+            name: self.to_logic_tree(lit, memo) for name, lit in self.outputs.items()
+        }
+
+
+def _aig_children(node) -> tuple:
+    if isinstance(node, LogicOp):
+        return tuple(node.children)
+    if isinstance(node, IfStatement):
+        kids = (node.cond, node.then_branch, node.else_branch)
+        return tuple(k for k in kids if k is not None)
+    if isinstance(node, LogicAssign):
+        return (node.rhs,)
+    if isinstance(node, Concat):
+        return tuple(node.parts)
+    return ()
+
+
+def _bits(result) -> list:
+    """Bits of a converted child, LSB first (scalar results are one bit wide)."""
+    return result if isinstance(result, list) else [result]
+
+
+def _scalar(node, result) -> int:
+    """A converted child used as a single-bit operand."""
+    if isinstance(node, LogicConst):
+        return TRUE if node.value else FALSE
+    if isinstance(result, list):
+        if len(result) != 1:
+            raise TypeError(
+                f"{type(node).__name__} is {len(result)} bits wide, "
+                "expected a single-bit operand"
+            )
+        return result[0]
+    return result
+
+
+def from_logic_tree(tree: LogicTreeNode, name: str = "out") -> AIG:
+    """AIG with a single output `name` computing `tree`."""
+    aig = AIG()
+    aig.add_tree(name, tree)
+    return aig
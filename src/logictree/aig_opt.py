@@ -0,0 +1,773 @@
+"""
+DAG-aware optimization of an AIG: cut-based rewriting, refactoring and
+balancing, in the spirit of ABC's rewrite / refactor / balance.
+
+All three passes read an AIG and build a fresh, structurally hashed one, so
+logic shared between outputs stays shared and every pass result can simply be
+compared with its input and kept or dropped.
+
+rewrite / refactor
+    Every AND node gets its k-feasible cuts (sets of at most k nodes that
+    separate it from the inputs; k=4 for rewrite, k=6 for refactor). The
+    function of the node over each cut is a truth table, and each truth table
+    is resynthesized into a small AND/inverter structure. A node then picks
+    the cut with the least *area flow* (structure size plus the flow of the
+    cut's leaves, split among their fanouts), and the new AIG is built from
+    the outputs down through the chosen cuts only. Cones whose logic was
+    redundant or badly factored collapse into their cheaper structure.
+
+    Functions of up to four inputs go through an NPN-keyed library: the
+    truth table is brought into its NPN-canonical form (input permutation,
+    input and output negation), and the structure of each of the 222
+    classes is synthesized once, on first use, by an exhaustive search over
+    decompositions (AND/OR/XOR with a literal, disjoint-support AND/OR/XOR,
+    Shannon expansion) and factored irredundant SOPs. Larger cut functions
+    (refactor) use the same decompositions, non-exhaustively.
+
+balance
+    AND trees (chains of single-fanout, uncomplemented ANDs) are collected
+    into multi-input supergates and rebuilt by pairing the two shallowest
+    operands first, which minimizes the depth of each supergate.
+
+optimize() runs a script of passes for a number of rounds, or until a time
+budget runs out, keeping a pass result only if it improves on the current
+AIG (fewer ANDs for rewrite/refactor, less depth for balance, never worse
+in the other metric for balance). The returned OptimizeReport has the AND
+count and depth before and after; optimize_trees() does the round trip from
+and back to LogicTree expressions and also reports total_gates().
+
+    aig, report = optimize(AIG.from_trees(trees), time_budget=2.0)
+    trees, report = optimize_trees(trees)
+    print(report.summary())
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache, reduce
+from typing import Mapping, Optional, Sequence
+
+from logictree.aig import AIG, AND, FALSE, INPUT, TRUE
+
+log = logging.getLogger(__name__)
+
+__all__ = [
+    "OptimizeReport",
+    "PassResult",
+    "DEFAULT_SCRIPT",
+    "balance",
+    "rewrite",
+    "refactor",
+    "optimize",
+    "optimize_trees",
+    "npn_canonical",
+]
+
+DEFAULT_SCRIPT = ("balance", "rewrite", "refactor", "balance", "rewrite")
+
+
+class _OutOfTime(Exception):
+    pass
+
+
+def _check(deadline: Optional[float]):
+    if deadline is not None and time.perf_counter() >= deadline:
+        raise _OutOfTime
+
+
+# === Truth tables ===
+# A truth table over n variables is an int of 2**n bits; bit m is the value
+# for the minterm whose bit i is variable i.
+
+
+@lru_cache(maxsize=None)
+def _full(n: int) -> int:
+    return (1 << (1 << n)) - 1
+
+
+@lru_cache(maxsize=None)
+def _var_tts(n: int) -> tuple:
+    size = 1 << n
+    return tuple(sum(1 << m for m in range(size) if (m >> i) & 1) for i in range(n))
+
+
+def _cofactors(tt: int, i: int, n: int) -> tuple:
+    """(tt with x_i = 0, tt with x_i = 1), both as functions of all n vars."""
+    v, s = _var_tts(n)[i], 1 << i
+    c0 = tt & ~v & _full(n)
+    c1 = tt & v
+    return c0 | (c0 << s), c1 | (c1 >> s)
+
+
+def _support(tt: int, n: int) -> list:
+    return [i for i in range(n) if len(set(_cofactors(tt, i, n))) == 2]
+
+
+def _compress(tt: int, n: int, support: Sequence[int]) -> int:
+    """tt as a 4-variable table over its support (support[j] -> var j)."""
+    out = 0
+    for y in range(16):
+        x = 0
+        for j, i in enumerate(support):
+            if (y >> j) & 1:
+                x |= 1 << i
+        out |= ((tt >> x) & 1) << y
+    return out
+
+
+# === Expressions ===
+# ("c", v) constant, ("v", i, neg) literal, ("a", x, y, neg) AND of x and y.
+# Operands are ordered, so equal subexpressions compare and hash equal.
+
+_ZERO, _ONE = ("c", 0), ("c", 1)
+
+
+def _not(e):
+    if e[0] == "c":
+        return ("c", 1 - e[1])
+    return e[:-1] + (e[-1] ^ 1,)
+
+
+def _and(x, y):
+    if x[0] == "c":
+        return y if x[1] else _ZERO
+    if y[0] == "c":
+        return x if y[1] else _ZERO
+    if x == y:
+        return x
+    if x == _not(y):
+        return _ZERO
+    if y < x:
+        x, y = y, x
+    return ("a", x, y, 0)
+
+
+def _or(x, y):
+    return _not(_and(_not(x), _not(y)))
+
+
+def _xor(x, y):
+    return _or(_and(x, _not(y)), _and(_not(x), y))
+
+
+def _mux(s, t, f):
+    return _or(_and(s, t), _and(_not(s), f))
+
+
+def _cost(e) -> tuple:
+    """(distinct AND nodes, depth) of an expression."""
+    depth: dict = {}
+
+    def walk(e):
+        if e[0] != "a":
+            return 0
+        k = e[:3]
+        d = depth.get(k)
+        if d is None:
+            d = depth[k] = 1 + max(walk(e[1]), walk(e[2]))
+        return d
+
+    d = walk(e)
+    return len(depth), d
+
+
+def _best(candidates):
+    return min(candidates, key=_cost)
+
+
+def _subst(e, mapping: Mapping[int, tuple]):
+    """Replace literal ("v", j, n) by ("v", i, n ^ neg) for mapping[j] = (i, neg)."""
+    tag = e[0]
+    if tag == "c":
+        return e
+    if tag == "v":
+        i, neg = mapping[e[1]]
+        return ("v", i, e[2] ^ neg)
+    x = _and(_subst(e[1], mapping), _subst(e[2], mapping))
+    return _not(x) if e[3] else x
+
+
+def _build(aig: AIG, e, leaves: Sequence[int]) -> int:
+    tag = e[0]
+    if tag == "c":
+        return TRUE if e[1] else FALSE
+    if tag == "v":
+        return leaves[e[1]] ^ e[2]
+    return aig.and_(_build(aig, e[1], leaves), _build(aig, e[2], leaves)) ^ e[3]
+
+
+# === Synthesis ===
+
+
+def _isop(lo: int, hi: int, n: int, top: int) -> tuple:
+    """
+    Minato-Morreale irredundant SOP of a function between `lo` and `hi`,
+    over the variables below `top`: (cubes, function covered). A cube is a
+    tuple of literal codes 2 * var + complemented.
+    """
+    full = _full(n)
+    if lo == 0:
+        return [], 0
+    if hi == full:
+        return [()], full
+    i = top - 1
+    while True:
+        l0, l1 = _cofactors(lo, i, n)
+        h0, h1 = _cofactors(hi, i, n)
+        if l0 != l1 or h0 != h1:
+            break
+        i -= 1
+    cubes0, f0 = _isop(l0 & ~h1 & full, h0, n, i)
+    cubes1, f1 = _isop(l1 & ~h0 & full, h1, n, i)
+    cubes2, f2 = _isop((l0 & ~f0 | l1 & ~f1) & full, h0 & h1, n, i)
+    v = _var_tts(n)[i]
+    cover = (f0 & ~v | f1 & v | f2) & full
+    cubes = [c + (2 * i + 1,) for c in cubes0] + [c + (2 * i,) for c in cubes1]
+    return cubes + cubes2, cover
+
+
+def _literal(code: int):
+    return ("v", code >> 1, code & 1)
+
+
+def _factor(cubes: list):
+    """Factored form of a SOP, pulling out the most frequent literal first."""
+    if not cubes:
+        return _ZERO
+    if any(not c for c in cubes):
+        return _ONE
+    if len(cubes) == 1:
+        return reduce(_and, map(_literal, cubes[0]))
+    counts = Counter(code for c in cubes for code in c)
+    code, hits = max(counts.items(), key=lambda kv: (kv[1], -kv[0]))
+    if hits == 1:
+        return reduce(_or, (_factor([c]) for c in cubes))
+    inner = [tuple(x for x in c if x != code) for c in cubes if code in c]
+    rest = [c for c in cubes if code not in c]
+    e = _and(_literal(code), _factor(inner))
+    return _or(e, _factor(rest)) if rest else e
+
+
+def _sop_candidates(tt: int, n: int) -> list:
+    off = tt ^ _full(n)
+    return [
+        _factor(_isop(tt, tt, n, n)[0]),
+        _not(_factor(_isop(off, off, n, n)[0])),
+    ]
+
+
+def _smooth(tt: int, n: int, variables, exists: bool) -> int:
+    for i in variables:
+        c0, c1 = _cofactors(tt, i, n)
+        tt = (c0 | c1) if exists else c0
+    return tt
+
+
+def _candidates(tt: int, n: int, support: list, rec, exhaustive: bool) -> list:
+    """Decompositions of tt; `rec(t)` synthesizes a smaller-support t."""
+    full = _full(n)
+    out = []
+    shannon = []
+    for i in support:
+        c0, c1 = _cofactors(tt, i, n)
+        x = ("v", i, 0)
+        if c0 == 0:
+            out.append(_and(x, rec(c1)))
+        elif c1 == 0:
+            out.append(_and(_not(x), rec(c0)))
+        elif c0 == full:
+            out.append(_or(_not(x), rec(c1)))
+        elif c1 == full:
+            out.append(_or(x, rec(c0)))
+        elif c1 == c0 ^ full:
+            out.append(_xor(x, rec(c0)))
+        else:
+            shannon.append((i, c0, c1))
+    if out and not exhaustive:
+        return out
+
+    # disjoint-support decompositions g(A) op h(B)
+    first, others = support[0], support[1:]
+    for mask in range(1 << len(others)):
+        group_a = [first] + [v for k, v in enumerate(others) if (mask >> k) & 1]
+        group_b = [v for v in others if v not in group_a]
+        if not group_b:
+            continue
+        for t, invert in ((tt, False), (tt ^ full, True)):
+            ga = _smooth(t, n, group_b, True)
+            gb = _smooth(t, n, group_a, True)
+            if ga & gb == t:
+                e = _and(rec(ga), rec(gb))
+                out.append(_not(e) if invert else e)
+        ga = _smooth(tt, n, group_b, False)
+        gb = _smooth(tt, n, group_a, False)
+        if tt & 1:
+            gb ^= full
+        if ga ^ gb == tt:
+            out.append(_xor(rec(ga), rec(gb)))
+    if out and not exhaustive:
+        return out
+
+    if shannon and not exhaustive:
+        # one expansion, on the variable leaving the smallest cofactors
+        shannon = [
+            min(
+                shannon,
+                key=lambda s: len(_support(s[1], n)) + len(_support(s[2], n)),
+            )
+        ]
+    for i, c0, c1 in shannon:
+        out.append(_mux(("v", i, 0), rec(c1), rec(c0)))
+    return out
+
+
+_SMALL: dict = {}
+
+
+def _synth4(tt: int):
+    """Smallest structure found for a 4-variable truth table (memoized)."""
+    e = _SMALL.get(tt)
+    if e is None:
+        support = _support(tt, 4)
+        if tt in (0, 0xFFFF):
+            e = ("c", tt & 1)
+        elif len(support) == 1:
+            i = support[0]
+            e = ("v", i, 0 if tt == _var_tts(4)[i] else 1)
+        else:
+            cands = _candidates(tt, 4, support, _synth4, exhaustive=True)
+            e = _best(cands + _sop_candidates(tt, 4))
+        _SMALL[tt] = e
+    return e
+
+
+def _flip(tt: int, i: int) -> int:
+    v, s = _var_tts(4)[i], 1 << i
+    return ((tt & v) >> s) | ((tt & ~v & 0xFFFF) << s)
+
+
+@lru_cache(maxsize=None)
+def _swap_masks() -> tuple:
+    # minterms with x_i = 1, x_{i+1} = 0, for i = 0..2
+    v = _var_tts(4)
+    return tuple(v[i] & ~v[i + 1] & 0xFFFF for i in range(3))
+
+
+def _swap(tt: int, i: int) -> int:
+    """tt with variables i and i+1 exchanged."""
+    m, s = _swap_masks()[i], 1 << i
+    return (tt & ~(m | m << s)) | ((tt & m) << s) | ((tt >> s) & m)
+
+
+@lru_cache(maxsize=None)
+def _adjacent_swaps(n: int = 4) -> tuple:
+    """Steinhaus-Johnson-Trotter: n! - 1 adjacent swaps visiting every perm."""
+    perm, dirs, swaps = list(range(n)), [-1] * n, []
+    while True:
+        mobile = idx = -1
+        for k, v in enumerate(perm):
+            t = k + dirs[v]
+            if 0 <= t < n and perm[t] < v and v > mobile:
+                mobile, idx = v, k
+        if mobile < 0:
+            return tuple(swaps)
+        t = idx + dirs[mobile]
+        perm[idx], perm[t] = perm[t], perm[idx]
+        swaps.append(min(idx, t))
+        for v in range(mobile + 1, n):
+            dirs[v] = -dirs[v]
+
+
+@lru_cache(maxsize=1 << 16)
+def npn_canonical(tt: int) -> tuple:
+    """
+    NPN-canonical form of a 4-input truth table: (canon, perm, neg, out)
+    with tt(x) == canon(y) ^ out, where y[j] = x[perm[j]] ^ bit j of neg.
+    The canonical form is the smallest table in the class.
+    """
+    best = None
+    for flips in range(16):
+        t = tt
+        for i in range(4):
+            if (flips >> i) & 1:
+                t = _flip(t, i)
+        perm = [0, 1, 2, 3]
+        for i in (None,) + _adjacent_swaps():
+            if i is not None:
+                t = _swap(t, i)
+                perm[i], perm[i + 1] = perm[i + 1], perm[i]
+            for canon, out in ((t, 0), (t ^ 0xFFFF, 1)):
+                if best is None or canon < best[0]:
+                    best = (canon, tuple(perm), flips, out)
+    canon, perm, flips, out = best
+    neg = sum(((flips >> perm[j]) & 1) << j for j in range(4))
+    return canon, perm, neg, out
+
+
+_NPN_LIBRARY: dict = {}
+
+
+def _library(tt: int):
+    """Structure for a 4-input function, via its NPN class's library entry."""
+    canon, perm, neg, out = npn_canonical(tt)
+    e = _NPN_LIBRARY.get(canon)
+    if e is None:
+        e = _NPN_LIBRARY[canon] = _synth4(canon)
+    e = _subst(e, {j: (perm[j], (neg >> j) & 1) for j in range(4)})
+    return _not(e) if out else e
+
+
+_SYNTH: dict = {}
+
+
+def _synth(tt: int, n: int):
+    """Structure computing an n-variable truth table (memoized)."""
+    key = (n, tt)
+    e = _SYNTH.get(key)
+    if e is not None:
+        return e
+    if tt in (0, _full(n)):
+        e = ("c", tt & 1)
+    else:
+        support = _support(tt, n)
+        if len(support) <= 4:
+            small = _compress(tt, n, support)
+            e = _subst(_library(small), {j: (i, 0) for j, i in enumerate(support)})
+        else:
+            cands = _candidates(
+                tt, n, support, lambda t: _synth(t, n), exhaustive=False
+            )
+            e = _best(cands + _sop_candidates(tt, n))
+    _SYNTH[key] = e
+    return e
+
+
+_STRUCTURES: dict = {}
+
+
+def _structure(tt: int, n: int) -> tuple:
+    """(expression, AND count, depth) for an n-variable truth table."""
+    key = (n, tt)
+    hit = _STRUCTURES.get(key)
+    if hit is None:
+        e = _synth(tt, n)
+        hit = _STRUCTURES[key] = (e,) + _cost(e)
+    return hit
+
+
+# === Cuts ===
+
+
+def _enumerate_cuts(aig: AIG, mask, k: int, limit: int, deadline) -> list:
+    """Per node: its trivial cut followed by up to `limit` k-feasible cuts."""
+    kind, f0, f1 = aig.kind, aig.fanin0, aig.fanin1
+    cuts: list = [None] * len(kind)
+    for n in range(1, len(kind)):
+        if not mask[n]:
+            continue
+        if kind[n] != AND:
+            cuts[n] = [(n,)]
+            continue
+        if not n & 255:
+            _check(deadline)
+        merged = set()
+        for x in cuts[f0[n] >> 1]:
+            for y in cuts[f1[n] >> 1]:
+                u = set(x).union(y)
+                if len(u) <= k:
+                    merged.add(tuple(sorted(u)))
+        kept: list = []
+        for c in sorted(merged, key=lambda c: (len(c), c)):
+            s = set(c)
+            if any(s.issuperset(d) for d in kept):
+                continue  # dominated by a smaller cut
+            kept.append(c)
+            if len(kept) == limit:
+                break
+        cuts[n] = [(n,)] + kept
+    return cuts
+
+
+def _cut_tt(aig: AIG, root: int, leaves: Sequence[int]) -> int:
+    """Truth table of `root` over `leaves` (leaf j is variable j)."""
+    f0, f1 = aig.fanin0, aig.fanin1
+    n = len(leaves)
+    full = _full(n)
+    vals = dict(zip(leaves, _var_tts(n)))
+    stack = [root]
+    while stack:
+        node = stack[-1]
+        if node in vals:
+            stack.pop()
+            continue
+        a, b = f0[node], f1[node]
+        pending = [x for x in (a >> 1, b >> 1) if x not in vals]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        va = vals[a >> 1] ^ full if a & 1 else vals[a >> 1]
+        vb = vals[b >> 1] ^ full if b & 1 else vals[b >> 1]
+        vals[node] = va & vb
+    return vals[root]
+
+
+def _fanouts(aig: AIG, mask) -> list:
+    kind, f0, f1 = aig.kind, aig.fanin0, aig.fanin1
+    refs = [0] * len(kind)
+    for n in range(1, len(kind)):
+        if mask[n] and kind[n] == AND:
+            refs[f0[n] >> 1] += 1
+            refs[f1[n] >> 1] += 1
+    for lit in aig.outputs.values():
+        refs[lit >> 1] += 1
+    return refs
+
+
+def _new_like(aig: AIG) -> AIG:
+    new = AIG()
+    for name in aig.inputs:
+        new.input(name)
+    return new
+
+
+def _resynthesize(aig: AIG, k: int, limit: int, deadline=None) -> AIG:
+    """Area-flow cover of the AIG by resynthesized k-cuts (see module docstring)."""
+    kind, f0 = aig.kind, aig.fanin0
+    mask = aig.cone_mask()
+    cuts = _enumerate_cuts(aig, mask, k, limit, deadline)
+    refs = _fanouts(aig, mask)
+    size = len(kind)
+    flow = [0.0] * size
+    arrival = [0] * size
+    choice: list = [None] * size
+    for n in range(1, size):
+        if not mask[n] or kind[n] != AND:
+            continue
+        if not n & 63:
+            _check(deadline)
+        best = None
+        for cut in cuts[n][1:]:
+            e, ands, depth = _structure(_cut_tt(aig, n, cut), len(cut))
+            af = ands + sum(flow[leaf] / max(1, refs[leaf]) for leaf in cut)
+            key = (af, max(arrival[leaf] for leaf in cut) + depth)
+            if best is None or key < best[0]:
+                best = (key, cut, e)
+        (flow[n], arrival[n]), cut, e = best
+        choice[n] = (cut, e)
+
+    needed = bytearray(size)
+    for lit in aig.outputs.values():
+        needed[lit >> 1] = 1
+    for n in range(size - 1, 0, -1):
+        if needed[n] and kind[n] == AND:
+            for leaf in choice[n][0]:
+                needed[leaf] = 1
+
+    new = _new_like(aig)
+    lits = [FALSE] * size
+    for n in range(1, size):
+        if not needed[n]:
+            continue
+        if kind[n] == INPUT:
+            lits[n] = new.input(aig.inputs[f0[n]])
+        else:
+            cut, e = choice[n]
+            lits[n] = _build(new, e, [lits[leaf] for leaf in cut])
+    for name, lit in aig.outputs.items():
+        new.add_output(name, lits[lit >> 1] ^ (lit & 1))
+    return new.cleanup()
+
+
+def rewrite(aig: AIG, k: int = 4, cut_limit: int = 8, deadline=None) -> AIG:
+    """Re-cover the AIG with 4-input cuts resynthesized from the NPN library."""
+    return _resynthesize(aig, k, cut_limit, deadline)
+
+
+def refactor(aig: AIG, k: int = 6, cut_limit: int = 6, deadline=None) -> AIG:
+    """Re-cover the AIG with larger cuts resynthesized from factored SOPs."""
+    return _resynthesize(aig, k, cut_limit, deadline)
+
+
+# === Balancing ===
+
+
+def _leveled_and(new: AIG, a: int, b: int, level: list) -> int:
+    lit = new.and_(a, b)
+    if lit >> 1 == len(level):  # a node was added
+        level.append(1 + max(level[a >> 1], level[b >> 1]))
+    return lit
+
+
+def _balanced(new: AIG, operands: list, level: list) -> int:
+    operands = set(operands)
+    if any(lit ^ 1 in operands for lit in operands) or FALSE in operands:
+        return FALSE
+    operands.discard(TRUE)
+    if not operands:
+        return TRUE
+    heap = [(level[lit >> 1], lit) for lit in operands]
+    heapq.heapify(heap)
+    while len(heap) > 1:
+        _, a = heapq.heappop(heap)
+        _, b = heapq.heappop(heap)
+        lit = _leveled_and(new, a, b, level)
+        heapq.heappush(heap, (level[lit >> 1], lit))
+    return heap[0][1]
+
+
+def balance(aig: AIG, deadline=None) -> AIG:
+    """Rebuild every AND supergate as a tree of minimum depth."""
+    kind, f0, f1 = aig.kind, aig.fanin0, aig.fanin1
+    mask = aig.cone_mask()
+    refs = _fanouts(aig, mask)
+    size = len(kind)
+    # a root is an AND that is not folded into its only parent's supergate
+    root = bytearray(size)
+    for lit in aig.outputs.values():
+        root[lit >> 1] = 1
+    for n in range(1, size):
+        if mask[n] and kind[n] == AND:
+            for lit in (f0[n], f1[n]):
+                if lit & 1 or refs[lit >> 1] != 1:
+                    root[lit >> 1] = 1
+
+    new = _new_like(aig)
+    level = [0] * len(new.kind)
+    lits = [FALSE] * size
+    for n in range(1, size):
+        if not mask[n]:
+            continue
+        if kind[n] == INPUT:
+            lits[n] = new.input(aig.inputs[f0[n]])
+            continue
+        if not root[n]:
+            continue
+        if not n & 255:
+            _check(deadline)
+        operands = []
+        stack = [f0[n], f1[n]]
+        while stack:
+            lit = stack.pop()
+            m = lit >> 1
+            if kind[m] == AND and not root[m]:
+                stack += (f0[m], f1[m])
+            else:
+                operands.append(lits[m] ^ (lit & 1))
+        lits[n] = _balanced(new, operands, level)
+    for name, lit in aig.outputs.items():
+        new.add_output(name, lits[lit >> 1] ^ (lit & 1))
+    return new.cleanup()
+
+
+# === Driver ===
+
+_PASSES = {"balance": balance, "rewrite": rewrite, "refactor": refactor}
+
+
+@dataclass
+class PassResult:
+    name: str
+    ands: int
+    depth: int
+    accepted: bool
+
+
+@dataclass
+class OptimizeReport:
+    ands_before: int
+    depth_before: int
+    ands_after: int = 0
+    depth_after: int = 0
+    total_gates_before: Optional[int] = None
+    total_gates_after: Optional[int] = None
+    passes: list = field(default_factory=list)
+    iterations: int = 0
+    seconds: float = 0.0
+    out_of_time: bool = False
+
+    def summary(self) -> str:
+        lines = [
+            f"ands:  {self.ands_before} -> {self.ands_after}",
+            f"depth: {self.depth_before} -> {self.depth_after}",
+        ]
+        if self.total_gates_before is not None:
+            lines.append(
+                f"total_gates: {self.total_gates_before} -> {self.total_gates_after}"
+            )
+        budget = ", out of time" if self.out_of_time else ""
+        lines.append(
+            f"{len(self.passes)} passes in {self.iterations} rounds, "
+            f"{self.seconds:.2f} s{budget}"
+        )
+        return "\n".join(lines)
+
+
+def _improves(name: str, new: tuple, old: tuple) -> bool:
+    # (ands, depth) pairs
+    if name == "balance":
+        return new[0] <= old[0] and (new[1], new[0]) < (old[1], old[0])
+    return new < old
+
+
+def optimize(
+    aig: AIG,
+    script: Sequence[str] = DEFAULT_SCRIPT,
+    max_iterations: int = 4,
+    time_budget: Optional[float] = None,
+) -> tuple:
+    """
+    Run `script` (pass names: balance, rewrite, refactor) up to
+    `max_iterations` times, stopping early after a round without improvement
+    or once `time_budget` seconds have passed. Returns (AIG, OptimizeReport).
+    """
+    unknown = [name for name in script if name not in _PASSES]
+    if unknown:
+        raise ValueError(f"unknown AIG passes: {unknown}")
+    start = time.perf_counter()
+    deadline = None if time_budget is None else start + time_budget
+    best = aig.cleanup()
+    metrics = (best.num_ands, best.depth())
+    report = OptimizeReport(ands_before=metrics[0], depth_before=metrics[1])
+    try:
+        for _ in range(max_iterations):
+            report.iterations += 1
+            improved = False
+            for name in script:
+                _check(deadline)
+                cand = _PASSES[name](best, deadline=deadline)
+                cand_metrics = (cand.num_ands, cand.depth())
+                accepted = _improves(name, cand_metrics, metrics)
+                report.passes.append(PassResult(name, *cand_metrics, accepted))
+                if accepted:
+                    best, metrics, improved = cand, cand_metrics, True
+            if not improved:
+                break
+    except _OutOfTime:
+        report.out_of_time = True
+    report.ands_after, report.depth_after = metrics
+    report.seconds = time.perf_counter() - start
+    log.debug("optimize: %s", report)
+    return best, report
+
+
+def optimize_trees(trees: Mapping[str, object], **kwargs) -> tuple:
+    """
+    Optimize the AIG of several named trees (see optimize() for `kwargs`).
+    Returns (name -> AndOp/NotOp tree, OptimizeReport). The report's
+    total_gates are summed over the outputs of the AND/NOT trees of the AIG
+    before and after, so both sides count the same primitive gates.
+    """
+    from logictree.analysis.gate_count import total_gates
+
+    aig = AIG.from_trees(trees)
+    opt, report = optimize(aig, **kwargs)
+    result = opt.to_logic_trees()
+    before = aig.to_logic_trees()
+    report.total_gates_before = sum(total_gates(t) for t in before.values())
+    report.total_gates_after = sum(total_gates(t) for t in result.values())
+    return result, report
@@ -1,5 +1,7 @@
 from collections import Counter
 
+from logictree.utils.traverse import iter_postorder
+
 PRIMS = {"AND", "OR", "NOT"}
 COMPOUND = {"XOR", "XNOR", "NAND", "NOR"}
 
@@ -10,20 +12,12 @@ def gate_count(root, *, primitives_only: bool = True) -> Counter:
         if primitives_only and hasattr(root, "to_primitives")
         else root
     )
-    seen, counts = set(), Counter()
-
-    def visit(n):
-        nid = id(n)
-        if nid in seen:
-            return
-        seen.add(nid)
+    counts = Counter()
+    # iterative: deep chains (wide compares) must not hit the recursion limit
+    for n in iter_postorder(node, lambda n: getattr(n, "children", ())):
         op = getattr(n, "op", None)
         if op in PRIMS or (not primitives_only and op in PRIMS | COMPOUND):
             counts[op] += 1
-        for ch in getattr(n, "children", ()):
-            visit(ch)
-
-    visit(node)
     return counts
 
 
@@ -1,9 +1,22 @@
 # logictree/api.py
-from .pipeline import lower_sv_file_to_logic, lower_sv_text_to_logic
+from .pipeline import (
+    iter_sv_file_modules,
+    lower_sv_file_to_logic,
+    lower_sv_files_to_logic,
+    lower_sv_text_to_logic,
+)
+from .session import LoweringSession
 
 
 def lower_sv_to_logic(src: str):
     return lower_sv_text_to_logic(src)
 
 
-__all__ = ["lower_sv_to_logic", "lower_sv_text_to_logic", "lower_sv_file_to_logic"]
+__all__ = [
+    "lower_sv_to_logic",
+    "lower_sv_text_to_logic",
+    "lower_sv_file_to_logic",
+    "lower_sv_files_to_logic",
+    "iter_sv_file_modules",
+    "LoweringSession",
+]
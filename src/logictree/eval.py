@@ -1,3 +1,5 @@
+import re
+
 from logictree.nodes import (
     AndOp,
     BitSelect,
@@ -7,43 +9,80 @@ from logictree.nodes import (
     IfStatement,
     LogicAssign,
     LogicConst,
+    LogicMux,
     LogicVar,
     Module,
+    NandOp,
     NeqOp,
+    NorOp,
     NotOp,
     OrOp,
     PartSelect,
+    XnorOp,
     XorOp,
 )
+from logictree.utils.traverse import fold
 
 
 def evaluate(n, env):
-    # High-level / structural nodes
-    if isinstance(n, Module):
-        # raise TypeError("evaluate() should not be called on Module; pass one of its output expressions instead.")
-        return
-    if isinstance(n, LogicAssign):
-        return evaluate(n.rhs, env)
-    if isinstance(n, IfStatement):
-        cond_val = evaluate(n.cond, env)
-        branch = n.then_branch if cond_val else n.else_branch
-        return evaluate(branch, env)
-    if isinstance(n, CaseStatement):
-        for it in n.items:
-            labels = getattr(it, "labels", None)
-            if labels in (None, [], "default"):
-                continue
-            # tolerate accidental ints to avoid type errors during bring-up
-            if isinstance(labels, int):
-                labels = [labels]
-            if evaluate(n.selector, env) in labels:
-                return evaluate(it.body, env)
-
-        # default arm
-        for it in n.items:
-            if getattr(it, "labels", None) == "default":
-                return evaluate(it.body, env)
-        return 0  # no matching arm
+    # High-level / structural nodes. Statements are followed in a loop (the
+    # taken branch is the tail), expressions are folded iteratively below.
+    while True:
+        if isinstance(n, Module):
+            # raise TypeError("evaluate() should not be called on Module; pass one of its output expressions instead.")
+            return
+        if isinstance(n, LogicAssign):
+            n = n.rhs
+            continue
+        if isinstance(n, IfStatement):
+            cond_val = _evaluate_expr(n.cond, env)
+            n = n.then_branch if cond_val else n.else_branch
+            continue
+        if isinstance(n, CaseStatement):
+            n = _select_case_arm(n, env)
+            if n is None:
+                return 0  # no matching arm
+            continue
+        return _evaluate_expr(n, env)
+
+
+def _select_case_arm(n, env):
+    sel = None
+    for it in n.items:
+        labels = getattr(it, "labels", None)
+        if labels in (None, [], "default"):
+            continue
+        # tolerate accidental ints to avoid type errors during bring-up
+        if isinstance(labels, int):
+            labels = [labels]
+        if sel is None:
+            sel = _evaluate_expr(n.selector, env)
+        if sel in labels:
+            return it.body
+
+    # default arm
+    for it in n.items:
+        if getattr(it, "labels", None) == "default":
+            return it.body
+    return None
+
+
+def _eval_children(n):
+    if isinstance(n, (EqOp, NeqOp)):
+        return (n.lhs, n.rhs)
+    if isinstance(n, NotOp):
+        return (n.operand,)
+    if isinstance(n, (AndOp, OrOp, XorOp)):
+        return (n.a, n.b)
+    if isinstance(n, Concat):
+        return tuple(n.parts)
+    return ()
+
+
+def _eval_node(n, vals, env):
+    # Statements nested inside an expression
+    if isinstance(n, (Module, LogicAssign, IfStatement, CaseStatement)):
+        return evaluate(n, env)
 
     # Leaves
     if isinstance(n, LogicConst):
@@ -67,33 +106,292 @@ def evaluate(n, env):
 
     if isinstance(n, Concat):
         val = 0
-        for p in n.parts:  # MSB-first
-            part_val = evaluate(p, env)
+        for p, part_val in zip(n.parts, vals):  # MSB-first
             part_width = getattr(p, "width", 1)
             val = (val << part_width) | (part_val & ((1 << part_width) - 1))
         return val
 
     # Eq Op
     if isinstance(n, EqOp):
-        lhs_val = evaluate(n.lhs, env)
-        rhs_val = evaluate(n.rhs, env)
-        return int(lhs_val == rhs_val)
+        return int(vals[0] == vals[1])
 
     # Neq
     if isinstance(n, NeqOp):
-        lhs_val = evaluate(n.lhs, env)
-        rhs_val = evaluate(n.rhs, env)
-        return int(lhs_val != rhs_val)
+        return int(vals[0] != vals[1])
 
     # Gates
     if isinstance(n, NotOp):
-        return 1 ^ evaluate(n.operand, env)
+        return 1 ^ vals[0]
     if isinstance(n, AndOp):
-        return evaluate(n.a, env) & evaluate(n.b, env)
+        return vals[0] & vals[1]
     if isinstance(n, OrOp):
-        return evaluate(n.a, env) | evaluate(n.b, env)
+        return vals[0] | vals[1]
     if isinstance(n, XorOp):
-        return evaluate(n.a, env) ^ evaluate(n.b, env)
+        return vals[0] ^ vals[1]
 
     # If we get here, we truly don't support this node
     raise TypeError(f"Unsupported node for evaluate(): {type(n).__name__}")
+
+
+def _evaluate_expr(n, env):
+    return fold(n, lambda node, vals: _eval_node(node, vals, env), _eval_children)
+
+
+# --- Compiled bit-parallel evaluation ---------------------------------------
+#
+# compile_tree() turns an expression tree into straight-line Python source
+# once. Every value is held as a list of "bit planes" (LSB first); plane i is
+# an int (or NumPy uint64 array) whose bit k is bit i of the value under input
+# vector k, so one call evaluates as many vectors as the words are wide.
+# Semantics follow evaluate() above: LogicVar reads bit 0 of env[name],
+# selects read env["base[i]"], NotOp flips bit 0, Eq/Neq compare whole values.
+
+_ZERO, _ONES = "0", "M"
+_TMP_RE = re.compile(r"\bt\d+\b")
+
+
+class CompiledTree:
+    """Bit-parallel evaluator produced by compile_tree()."""
+
+    def __init__(self, inputs, width, fn, source):
+        self.inputs = inputs  # env names read by the tree, sorted
+        self.width = width  # number of output bit planes
+        self.source = source
+        self._fn = fn
+
+    def __repr__(self):
+        return f"CompiledTree(inputs={len(self.inputs)}, width={self.width})"
+
+    def run(self, words, mask):
+        """
+        Evaluate packed inputs. `words` maps each name in `self.inputs` to a
+        word holding one bit per vector; `mask` has a 1 for every live vector
+        (for NumPy words, an all-ones array of the same shape).
+        Returns the output bit planes, LSB first.
+        """
+        return self._fn(words, mask)
+
+    def evaluate_batch(self, envs):
+        """Evaluate a list of evaluate()-style env dicts; one int per env."""
+        n = len(envs)
+        if n == 0:
+            return []
+        mask = (1 << n) - 1
+        words = {}
+        for name in self.inputs:
+            bits = "".join("1" if int(env[name]) & 1 else "0" for env in reversed(envs))
+            words[name] = int(bits, 2)
+        planes = self._fn(words, mask)
+        results = [0] * n
+        for i, plane in enumerate(planes):
+            if not plane:
+                continue
+            bits = format(plane, "b")[::-1]
+            for k, ch in enumerate(bits):
+                if ch == "1":
+                    results[k] |= 1 << i
+        return results
+
+
+class _Emitter:
+    def __init__(self):
+        self.lines = []
+        self.inputs = {}
+        self._n = 0
+
+    def tmp(self, expr):
+        if expr in (_ZERO, _ONES):
+            return expr
+        name = f"t{self._n}"
+        self._n += 1
+        self.lines.append(f"    {name} = {expr}")
+        return name
+
+    def body(self, outputs):
+        """Emitted lines, with each temp deleted right after its last use."""
+        last_use = {}
+        for i, line in enumerate(self.lines):
+            rhs = line.split(" = ", 1)[1]
+            if rhs.startswith("w["):
+                continue  # input load; the key is a signal name, not a temp
+            for name in _TMP_RE.findall(rhs):
+                last_use[name] = i
+        live_out = set(outputs)
+        dead_after = {}
+        for name, i in last_use.items():
+            if name not in live_out:
+                dead_after.setdefault(i, []).append(name)
+        out = []
+        for i, line in enumerate(self.lines):
+            out.append(line)
+            if i in dead_after:
+                out.append(f"    del {', '.join(dead_after[i])}")
+        return "\n".join(out)
+
+    def load(self, key):
+        if key not in self.inputs:
+            self.inputs[key] = self.tmp(f"w[{key!r}]")
+        return self.inputs[key]
+
+    def not_(self, a):
+        if a == _ZERO:
+            return _ONES
+        if a == _ONES:
+            return _ZERO
+        return self.tmp(f"{a} ^ M")
+
+    def and_(self, a, b):
+        if _ZERO in (a, b):
+            return _ZERO
+        if a == _ONES:
+            return b
+        if b == _ONES:
+            return a
+        return self.tmp(f"{a} & {b}")
+
+    def or_(self, a, b):
+        if _ONES in (a, b):
+            return _ONES
+        if a == _ZERO:
+            return b
+        if b == _ZERO:
+            return a
+        return self.tmp(f"{a} | {b}")
+
+    def xor(self, a, b):
+        if a == _ZERO:
+            return b
+        if b == _ZERO:
+            return a
+        if a == _ONES:
+            return self.not_(b)
+        if b == _ONES:
+            return self.not_(a)
+        return self.tmp(f"{a} ^ {b}")
+
+    def planewise(self, fn, a, b):
+        n = max(len(a), len(b))
+        a = a + [_ZERO] * (n - len(a))
+        b = b + [_ZERO] * (n - len(b))
+        return [fn(x, y) for x, y in zip(a, b)]
+
+    def equal(self, a, b):
+        acc = _ONES
+        for bit in self.planewise(self.xor, a, b):
+            acc = self.and_(acc, self.not_(bit))
+        return acc
+
+    def any_(self, planes):
+        """1 where any plane is set: the truthiness of a multi-bit value."""
+        acc = _ZERO
+        for bit in planes:
+            acc = self.or_(acc, bit)
+        return acc
+
+    def mux(self, sel, a, b):
+        nsel = self.not_(sel)
+        return self.planewise(
+            lambda x, y: self.or_(self.and_(sel, x), self.and_(nsel, y)), a, b
+        )
+
+
+def _compile_children(n):
+    if isinstance(n, LogicAssign):
+        return (n.rhs,)
+    if isinstance(n, IfStatement):
+        if n.else_branch is None:
+            return (n.cond, n.then_branch)
+        return (n.cond, n.then_branch, n.else_branch)
+    if isinstance(n, (EqOp, NeqOp)):
+        return (n.lhs, n.rhs)
+    if isinstance(n, NotOp):
+        return (n.operand,)
+    if isinstance(n, (AndOp, OrOp, XorOp, XnorOp, NandOp, NorOp)):
+        return (n.a, n.b)
+    if isinstance(n, LogicMux):
+        return (n.selector, n.if_true, n.if_false)
+    if isinstance(n, Concat):
+        return tuple(n.parts)
+    return ()
+
+
+def _compile_node(em, n, kids):
+    if isinstance(n, LogicAssign):
+        return kids[0]
+    if isinstance(n, IfStatement):
+        else_planes = kids[2] if len(kids) == 3 else [_ZERO]
+        return em.mux(em.any_(kids[0]), kids[1], else_planes)
+    if isinstance(n, LogicConst):
+        v = int(n.value) & ((1 << n.width) - 1)
+        return [_ONES if (v >> i) & 1 else _ZERO for i in range(n.width)]
+    if isinstance(n, LogicVar):
+        return [em.load(n.name)]
+    if isinstance(n, BitSelect):
+        return [em.load(f"{n.base.name}[{n.index}]")]
+    if isinstance(n, PartSelect):
+        rng = range(n.lsb, n.msb + 1) if n.lsb <= n.msb else range(n.lsb, n.msb - 1, -1)
+        return [em.load(f"{n.base.name}[{i}]") for i in rng]
+    if isinstance(n, Concat):
+        planes = []
+        for p, part in zip(reversed(n.parts), reversed(kids)):  # parts are MSB-first
+            w = getattr(p, "width", 1)
+            planes.extend((part + [_ZERO] * w)[:w])
+        return planes
+    if isinstance(n, EqOp):
+        return [em.equal(kids[0], kids[1])]
+    if isinstance(n, NeqOp):
+        return [em.not_(em.equal(kids[0], kids[1]))]
+    if isinstance(n, NotOp):
+        return [em.not_(kids[0][0])] + kids[0][1:]
+    if isinstance(n, LogicMux):
+        return em.mux(em.any_(kids[0]), kids[1], kids[2])
+    binary = {
+        AndOp: (em.and_, False),
+        OrOp: (em.or_, False),
+        XorOp: (em.xor, False),
+        NandOp: (em.and_, True),
+        NorOp: (em.or_, True),
+        XnorOp: (em.xor, True),
+    }
+    if type(n) in binary:
+        fn, invert = binary[type(n)]
+        planes = em.planewise(fn, kids[0], kids[1])
+        if invert:
+            planes[0] = em.not_(planes[0])
+        return planes
+
+    raise TypeError(f"Unsupported node for compile_tree(): {type(n).__name__}")
+
+
+def compile_tree(tree) -> CompiledTree:
+    """
+    Compile an output expression into a CompiledTree.
+
+    Shared subtrees (e.g. from NodeFactory) are compiled once. Statements other
+    than LogicAssign/IfStatement are not supported; lower them first.
+    """
+    em = _Emitter()
+    results = {}
+    stack = [(tree, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in results:
+            continue
+        kids = _compile_children(node)
+        if not expanded:
+            stack.append((node, True))
+            stack.extend((k, False) for k in reversed(kids) if id(k) not in results)
+            continue
+        results[id(node)] = _compile_node(em, node, [results[id(k)] for k in kids])
+
+    out = results[id(tree)]
+    body = em.body(out) or "    pass"
+    source = f"def _compiled(w, M):\n{body}\n    return ({', '.join(out)},)\n"
+    namespace = {}
+    exec(compile(source, "<logictree.compile_tree>", "exec"), namespace)
+    return CompiledTree(sorted(em.inputs), len(out), namespace["_compiled"], source)
+
+
+def evaluate_many(tree, envs):
+    """Evaluate `tree` under every env in `envs` using one compiled pass."""
+    return compile_tree(tree).evaluate_batch(envs)
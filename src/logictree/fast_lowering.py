@@ -0,0 +1,284 @@
+"""
+Parse-tree-free lowering for modules made of ports, scalar net declarations
+and continuous assigns.
+
+The ANTLR parse tree of such a module is only walked once by
+SVToLogicTreeLowerer, and building it dominates lowering time. This module
+tokenizes the source with one regular expression and parses it with a
+hand-written recursive-descent/precedence-climbing parser that calls the
+lowerer's begin_module/declare_port/add_assign/build_* methods directly, so
+the resulting Module is the same one the visitor would build.
+
+The expression precedences below are the ones ANTLR assigns to the
+left-recursive `expression` rule of SystemVerilogSubset.g4 (later
+alternatives bind more loosely), including its quirks: prefix operators bind
+tighter than selects, so `~a[0]` is `(~a)[0]`, and selects bind loosest, so
+`a & b[0]` is `(a & b)[0]`.
+
+Anything outside that subset (always_comb blocks, ranged net declarations,
+non-literal port ranges, syntax errors, lowering errors) raises
+FastPathUnsupported, and callers fall back to the ANTLR path for that
+module, which reports errors exactly as before.
+"""
+
+import re
+from typing import Optional
+
+from logictree.nodes import ops
+from logictree.nodes.selects import Concat
+from logictree.nodes.struct.module import Module
+from logictree.SVToLogicTreeLowerer import SVToLogicTreeLowerer
+
+
+class FastPathUnsupported(Exception):
+    """The source is outside the subset the fast path handles."""
+
+
+_KEYWORDS = frozenset(
+    (
+        "module",
+        "endmodule",
+        "input",
+        "output",
+        "logic",
+        "wire",
+        "assign",
+        "always_comb",
+        "default",
+        "case",
+        "endcase",
+        "begin",
+        "end",
+        "if",
+        "else",
+    )
+)
+
+# Mirrors the lexer rules; literal alternatives come first so that, as with
+# ANTLR's longest match, 4'b1010 is one token and not DecimalNumber + junk.
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<skip>\s+|//[^\r\n]*|/\*.*?\*/)
+  | (?P<lit>\d+'[bB][01xXzZ]+|\d+'[hH][0-9a-fA-FxXzZ]+|\d+'[dD][0-9]+|\d+)
+  | (?P<id>[a-zA-Z_][a-zA-Z_0-9]*)
+  | (?P<op>~\^|==|!=|[!~\-&|^\[\]:{}(),;=])
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+_ID = "id"
+_LIT = "lit"
+
+# Binary operator -> ANTLR precedence; the right operand is parsed at
+# precedence + 1 (left associative).
+_BINARY_PREC = {"&": 12, "|": 11, "^": 10, "~^": 9, "==": 8, "!=": 7}
+# Prefix operator -> precedence its operand is parsed at.
+_PREFIX_PREC = {"!": 15, "~": 14, "-": 13}
+# Bit-select is 6 and part-select 5; both only apply at precedence 0.
+_SELECT_PREC = 5
+
+
+def tokenize(text: str):
+    """(kind, text) pairs, kind being "id", "lit", a keyword or an operator."""
+    tokens = []
+    pos = 0
+    end = len(text)
+    match = _TOKEN_RE.match
+    while pos < end:
+        m = match(text, pos)
+        if m is None:
+            raise FastPathUnsupported(f"unexpected character {text[pos]!r}")
+        kind = m.lastgroup
+        tok = m.group(kind)
+        pos = m.end()
+        if kind == "skip":
+            continue
+        if kind == "id":
+            tokens.append((tok if tok in _KEYWORDS else _ID, tok))
+        elif kind == "lit":
+            tokens.append((_LIT, tok))
+        else:
+            tokens.append((tok, tok))
+    tokens.append(("<EOF>", ""))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, tokens, lowerer: SVToLogicTreeLowerer):
+        self.toks = tokens
+        self.pos = 0
+        self.lowerer = lowerer
+
+    def peek(self, offset: int = 0) -> str:
+        return self.toks[self.pos + offset][0]
+
+    def take(self, kind: Optional[str] = None) -> str:
+        tok_kind, text = self.toks[self.pos]
+        if kind is not None and tok_kind != kind:
+            raise FastPathUnsupported(f"expected {kind!r}, found {text!r}")
+        self.pos += 1
+        return text
+
+    # -- module structure ---------------------------------------------------
+
+    def module(self) -> Module:
+        lw = self.lowerer
+        self.take("module")
+        lw.begin_module(self.take(_ID))
+        self.take("(")
+        if self.peek() != ")":
+            self.port()
+            while self.peek() == ",":
+                self.take(",")
+                self.port()
+        self.take(")")
+        self.take(";")
+        while self.peek() != "endmodule":
+            kind = self.peek()
+            if kind == "assign":
+                self.continuous_assign()
+            elif kind in ("logic", "wire"):
+                self.net_declaration()
+            else:
+                raise FastPathUnsupported(f"module item starting with {kind!r}")
+        self.take("endmodule")
+        return lw.end_module()
+
+    def port(self):
+        direction = self.take()
+        if direction not in ("input", "output"):
+            raise FastPathUnsupported(f"port direction {direction!r}")
+        self.take("logic")
+        msb = lsb = None
+        if self.peek() == "[":
+            # visitPort only understands literal [msb:lsb] ranges
+            self.take("[")
+            msb = self._decimal()
+            self.take(":")
+            lsb = self._decimal()
+            self.take("]")
+        ids = [self.take(_ID)]
+        # `, name` continues this port; `, input ...` starts the next one
+        while self.peek() == "," and self.peek(1) == _ID:
+            self.take(",")
+            ids.append(self.take(_ID))
+        self.lowerer.declare_port(direction, msb, lsb, ids)
+
+    def _decimal(self) -> int:
+        text = self.take(_LIT)
+        if not text.isdigit():
+            raise FastPathUnsupported(f"port range bound {text!r}")
+        return int(text)
+
+    def net_declaration(self):
+        self.take()
+        if self.peek() == "[":
+            raise FastPathUnsupported("ranged net declaration")
+        self.take(_ID)
+        while self.peek() == ",":
+            self.take(",")
+            self.take(_ID)
+        self.take(";")
+
+    def continuous_assign(self):
+        self.take("assign")
+        start = self.pos
+        self.take(_ID)
+        while self.peek() == "[":
+            self.take("[")
+            self.expression(0)
+            if self.peek() == ":":
+                self.take(":")
+                self.expression(0)
+            self.take("]")
+        # variable_lvalue.getText(): the token texts without whitespace
+        lhs = "".join(text for _, text in self.toks[start : self.pos])
+        self.take("=")
+        rhs = self.expression(0)
+        self.take(";")
+        self.lowerer.add_assign(lhs, rhs)
+
+    # -- expressions ----------------------------------------------------------
+
+    def expression(self, prec: int):
+        lw = self.lowerer
+        node = self.primary()
+        while True:
+            kind = self.peek()
+            op_prec = _BINARY_PREC.get(kind)
+            if op_prec is not None:
+                if op_prec < prec:
+                    return node
+                self.pos += 1
+                rhs = self.expression(op_prec + 1)
+                if kind == "&":
+                    node = ops.AndOp(node, rhs)
+                elif kind == "|":
+                    node = ops.OrOp(node, rhs)
+                elif kind == "^":
+                    node = ops.XorOp(node, rhs)
+                elif kind == "~^":
+                    node = ops.XnorOp(node, rhs)
+                elif kind == "==":
+                    node = lw.build_eq(node, rhs)
+                else:
+                    node = lw.build_neq(node, rhs)
+            elif kind == "[" and prec <= _SELECT_PREC:
+                self.pos += 1
+                first = self.expression(0)
+                if self.peek() == ":":
+                    self.take(":")
+                    second = self.expression(0)
+                    self.take("]")
+                    node = lw.build_part_select(node, first, second)
+                else:
+                    self.take("]")
+                    node = lw.build_bit_select(node, first)
+            else:
+                return node
+
+    def primary(self):
+        kind, text = self.toks[self.pos]
+        self.pos += 1
+        if kind in _PREFIX_PREC:
+            return ops.NotOp(self.expression(_PREFIX_PREC[kind]))
+        if kind == _ID:
+            return self.lowerer.build_identifier(text)
+        if kind == _LIT:
+            return self.lowerer.build_const(text)
+        if kind == "(":
+            node = self.expression(0)
+            self.take(")")
+            return node
+        if kind == "{":
+            parts = [self.expression(0)]
+            while self.peek() == ",":
+                self.take(",")
+                parts.append(self.expression(0))
+            self.take("}")
+            return Concat(parts)
+        raise FastPathUnsupported(f"unexpected {text or kind!r} in expression")
+
+
+def lower_module_text(
+    text: str, lowerer: Optional[SVToLogicTreeLowerer] = None
+) -> Module:
+    """
+    Lower the source of exactly one module (e.g. a ModuleSource.text from
+    sv_parser.split) without building an ANTLR parse tree.
+
+    Raises FastPathUnsupported if the module is outside the fast subset;
+    `lowerer` is then left mid-module and should not be reused.
+    """
+    lowerer = lowerer if lowerer is not None else SVToLogicTreeLowerer()
+    parser = _Parser(tokenize(text), lowerer)
+    try:
+        mod = parser.module()
+    except FastPathUnsupported:
+        raise
+    except Exception as e:
+        # Lowering errors (unknown bits in a literal, non-constant select
+        # index, ...) are the ANTLR path's to report.
+        raise FastPathUnsupported(f"{type(e).__name__}: {e}") from e
+    parser.take("<EOF>")
+    return mod
@@ -7,6 +7,8 @@ log = logging.getLogger(__name__)
 
 @dataclass(frozen=True)
 class LogicTreeNode:
+    # Empty so that slotted subclasses (LogicOp) really have no __dict__
+    __slots__ = ()
 
     @property
     def depth(self) -> int:
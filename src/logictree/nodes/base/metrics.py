@@ -0,0 +1,35 @@
+"""
+Lazily cached structural metrics (depth, delay, free variables).
+
+A node that caches a metric keeps it in an attribute (e.g. `_depth_cache`)
+that starts as None, and provides:
+
+  * `_metric_children()`: the nodes the metric is computed from
+  * a compute method (e.g. `_compute_depth`) that reads its children's metric
+
+cached_metric() fills the cache for every uncached node below the requested
+one in post-order with an explicit stack, so each compute method only ever
+sees cached children: the first access is O(subtree), later ones are O(1),
+and deep trees never recurse.
+"""
+
+
+def cached_metric(node, slot: str, compute: str):
+    """Return `node.<slot>`, filling it (and uncached descendants) first."""
+    value = getattr(node, slot)
+    if value is not None:
+        return value
+
+    stack = [(node, False)]
+    while stack:
+        n, expanded = stack.pop()
+        if getattr(n, slot) is not None:
+            continue
+        if expanded:
+            object.__setattr__(n, slot, getattr(n, compute)())
+            continue
+        stack.append((n, True))
+        for k in n._metric_children():
+            if getattr(k, slot, 0) is None and hasattr(k, compute):
+                stack.append((k, False))
+    return getattr(node, slot)
@@ -4,6 +4,7 @@ from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, FrozenSet, Iterator, List, Optional
 
 from logictree.nodes.base.base import LogicTreeNode
+from logictree.nodes.base.metrics import cached_metric
 from logictree.nodes.ops.ops import LogicConst, LogicVar
 from logictree.nodes.struct.statement import Statement
 from logictree.utils.formating import indent
@@ -337,16 +338,25 @@ class CaseStatement(Statement):
             ],
         }
 
-    @property
-    def depth(self) -> int:
+    def _metric_children(self):
+        return [self.selector] + [item.body for item in self.items if item.body]
+
+    def _compute_depth(self) -> int:
         item_depths = [item.body.depth or 0 for item in self.items if item.body]
         return 1 + max([self.selector.depth or 0] + item_depths)
 
-    @property
-    def delay(self) -> int:
+    def _compute_delay(self) -> int:
         item_delays = [item.body.delay or 0 for item in self.items if item.body]
         return 1 + max([self.selector.delay or 0] + item_delays)
 
+    @property
+    def depth(self) -> int:
+        return cached_metric(self, "_depth_cache", "_compute_depth")
+
+    @property
+    def delay(self) -> int:
+        return cached_metric(self, "_delay_cache", "_compute_delay")
+
     def clone(self):
         return CaseStatement(
             selector=(
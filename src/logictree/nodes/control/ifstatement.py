@@ -2,6 +2,7 @@ import logging
 from dataclasses import field
 from typing import FrozenSet, List, Optional
 
+from logictree.nodes.base.metrics import cached_metric
 from logictree.nodes.ops.ops import LogicVar
 from logictree.nodes.struct.statement import Statement
 
@@ -36,14 +37,18 @@ class IfStatement(Statement):
         # self._viz_label = None
         self._is_else_if = False  # for UI hinting, optional
 
+    def _metric_children(self):
+        return [n for n in (self.cond, self.then_branch, self.else_branch) if n]
+
+    def _compute_free_vars(self) -> FrozenSet[LogicVar]:
+        acc = set(self.cond.free_vars())
+        acc |= set(self.then_branch.free_vars())
+        if self.else_branch:
+            acc |= set(self.else_branch.free_vars())
+        return frozenset(acc)
+
     def free_vars(self) -> FrozenSet[LogicVar]:
-        if self._free_cache is None:
-            acc = set(self.cond.free_vars())
-            acc |= set(self.then_branch.free_vars())
-            if self.else_branch:
-                acc |= set(self.else_branch.free_vars())
-            self._free_cache = frozenset(acc)
-        return self._free_cache
+        return cached_metric(self, "_free_cache", "_compute_free_vars")
 
     def writes(self) -> FrozenSet[LogicVar]:
         if self._w_cache is None:
@@ -91,14 +96,12 @@ class IfStatement(Statement):
     #        branches.append(self.else_branch)
     #    return 1 + max([self.cond.depth] + [b.depth for b in branches])
 
-    @property
-    def depth(self) -> int:
+    def _compute_depth(self) -> int:
         then_d = self.then_branch.depth if self.then_branch else 0
         else_d = self.else_branch.depth if self.else_branch else 0
         return 1 + max(then_d, else_d)
 
-    @property
-    def delay(self) -> int:
+    def _compute_delay(self) -> int:
         def safe_delay(node):
             return getattr(node, "delay", 0) or 0
 
@@ -107,6 +110,14 @@ class IfStatement(Statement):
             branches.append(self.else_branch)
         return 1 + max([safe_delay(self.cond)] + [safe_delay(b) for b in branches])
 
+    @property
+    def depth(self) -> int:
+        return cached_metric(self, "_depth_cache", "_compute_depth")
+
+    @property
+    def delay(self) -> int:
+        return cached_metric(self, "_delay_cache", "_compute_delay")
+
     def to_json_dict(self):
         children = self.get_children()
         if not children:
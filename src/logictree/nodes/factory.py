@@ -0,0 +1,260 @@
+"""
+Hash-consing node factory.
+
+NodeFactory interns expression nodes so that structurally identical
+subexpressions are represented by one shared object. Every node handed out
+by a factory is canonical for that factory, which turns expanded trees into
+a DAG:
+
+  * gates are keyed on (class, child identities); children of commutative
+    ops (see COMMUTATIVE_OPS) are put in a canonical order for the key, so
+    AND(a, b) and AND(b, a) intern to the same node
+  * leaves are keyed on their value (LogicVar name/width, LogicConst value/width)
+  * nodes the factory does not understand (statements, holes) are treated as
+    opaque leaves keyed by identity
+
+Within one factory two interned nodes are equal iff they are the same
+object, so `a is b` (or `factory.same(a, b)`) is an O(1) equality check.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Iterable, Optional
+
+from logictree.nodes.base.base import LogicTreeNode
+from logictree.nodes.ops.comparison import EqOp, NeqOp
+from logictree.nodes.ops.gates import AndOp, NandOp, NorOp, NotOp, OrOp, XnorOp, XorOp
+from logictree.nodes.ops.mux import LogicMux
+from logictree.nodes.ops.ops import LogicConst, LogicOp, LogicVar
+from logictree.nodes.selects import BitSelect, Concat, PartSelect
+from logictree.nodes.types import COMMUTATIVE_OPS
+
+log = logging.getLogger(__name__)
+
+
+def _op_name(cls) -> str:
+    # Mirrors LogicOp.name: AndOp -> "AND"
+    return cls.__name__.replace("Op", "").upper()
+
+
+_COMMUTATIVE_CLASSES = frozenset(
+    cls
+    for cls in (AndOp, OrOp, XorOp, XnorOp, NandOp, NorOp)
+    if _op_name(cls) in COMMUTATIVE_OPS
+)
+
+
+class NodeFactory:
+    """Interning constructor for LogicTree expression nodes."""
+
+    def __init__(self):
+        self._table: dict[tuple, LogicTreeNode] = {}
+        # id(node) -> stable uid; the table keeps every interned node alive,
+        # so ids cannot be recycled while the factory exists.
+        self._uid: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def __contains__(self, node) -> bool:
+        return id(node) in self._uid
+
+    def same(self, a: LogicTreeNode, b: LogicTreeNode) -> bool:
+        """Equality for interned nodes: identity."""
+        return a is b
+
+    def clear(self) -> None:
+        self._table.clear()
+        self._uid.clear()
+
+    # --- internals -----------------------------------------------------------
+
+    def _register(self, key: tuple, node: LogicTreeNode) -> LogicTreeNode:
+        self._table[key] = node
+        self._uid[id(node)] = len(self._uid)
+        return node
+
+    def _lookup(self, key: tuple, build) -> LogicTreeNode:
+        node = self._table.get(key)
+        if node is None:
+            node = self._register(key, build())
+        return node
+
+    def _ref(self, node: LogicTreeNode) -> int:
+        uid = self._uid.get(id(node))
+        if uid is None:
+            uid = self._uid[id(self.intern(node))]
+        return uid
+
+    def _canon(self, node: LogicTreeNode) -> LogicTreeNode:
+        return node if id(node) in self._uid else self.intern(node)
+
+    def _gate_key(self, cls, children) -> tuple:
+        uids = [self._ref(c) for c in children]
+        if cls in _COMMUTATIVE_CLASSES:
+            uids.sort()
+        return (cls, *uids)
+
+    # --- leaves --------------------------------------------------------------
+
+    def var(self, name: str, width: Optional[int] = None, is_signed=False) -> LogicVar:
+        width = 1 if width is None else width
+        return self._lookup(
+            ("VAR", name, width, bool(is_signed)),
+            lambda: LogicVar(name, width=width, is_signed=is_signed),
+        )
+
+    def const(self, value, width: Optional[int] = None) -> LogicConst:
+        node = LogicConst(value, width=width)
+        return self._lookup(("CONST", node.value, node.width), lambda: node)
+
+    # --- gates ---------------------------------------------------------------
+
+    def op(self, cls, *children: LogicTreeNode) -> LogicTreeNode:
+        """Interned `cls(*children)` for any LogicOp subclass."""
+        children = tuple(self._canon(c) for c in children)
+        return self._lookup(self._gate_key(cls, children), lambda: cls(*children))
+
+    def not_(self, operand):
+        return self.op(NotOp, operand)
+
+    def and_(self, a, b):
+        return self.op(AndOp, a, b)
+
+    def or_(self, a, b):
+        return self.op(OrOp, a, b)
+
+    def xor(self, a, b):
+        return self.op(XorOp, a, b)
+
+    def xnor(self, a, b):
+        return self.op(XnorOp, a, b)
+
+    def nand(self, a, b):
+        return self.op(NandOp, a, b)
+
+    def nor(self, a, b):
+        return self.op(NorOp, a, b)
+
+    def eq(self, lhs, rhs):
+        return self.op(EqOp, lhs, rhs)
+
+    def neq(self, lhs, rhs):
+        return self.op(NeqOp, lhs, rhs)
+
+    # --- structural nodes ----------------------------------------------------
+
+    def mux(self, selector, if_true, if_false) -> LogicMux:
+        sel, t, f = (self._canon(c) for c in (selector, if_true, if_false))
+        key = (LogicMux, self._ref(sel), self._ref(t), self._ref(f))
+        return self._lookup(key, lambda: LogicMux(sel, t, f))
+
+    def bit_select(self, base, index: int) -> BitSelect:
+        base = self._canon(base)
+        return self._lookup(
+            (BitSelect, self._ref(base), index), lambda: BitSelect(base, index)
+        )
+
+    def part_select(self, base, msb: int, lsb: int) -> PartSelect:
+        base = self._canon(base)
+        return self._lookup(
+            (PartSelect, self._ref(base), msb, lsb),
+            lambda: PartSelect(base, msb, lsb),
+        )
+
+    def concat(self, parts: Iterable[LogicTreeNode]) -> Concat:
+        parts = [self._canon(p) for p in parts]
+        key = (Concat, *(self._ref(p) for p in parts))
+        return self._lookup(key, lambda: Concat(parts))
+
+    # --- interning existing trees -------------------------------------------
+
+    def _key_for(self, node: LogicTreeNode, kids) -> tuple:
+        """Interning key for `node` once its children are canonical (`kids`)."""
+        if isinstance(node, LogicVar):
+            return ("VAR", node.name, node.width, bool(node.is_signed))
+        if isinstance(node, LogicConst):
+            return ("CONST", node.value, node.width)
+        if isinstance(node, LogicOp):
+            return self._gate_key(type(node), kids)
+        if isinstance(node, LogicMux):
+            return (LogicMux, *(self._ref(k) for k in kids))
+        if isinstance(node, BitSelect):
+            return (BitSelect, self._ref(kids[0]), node.index)
+        if isinstance(node, PartSelect):
+            return (PartSelect, self._ref(kids[0]), node.msb, node.lsb)
+        if isinstance(node, Concat):
+            return (Concat, *(self._ref(k) for k in kids))
+        return ("OPAQUE", id(node))
+
+    @staticmethod
+    def _children_of(node: LogicTreeNode) -> tuple:
+        if isinstance(node, LogicOp):
+            return tuple(node.children)
+        if isinstance(node, LogicMux):
+            return (node.selector, node.if_true, node.if_false)
+        if isinstance(node, (BitSelect, PartSelect)):
+            return (node.base,)
+        if isinstance(node, Concat):
+            return tuple(node.parts)
+        return ()
+
+    @staticmethod
+    def _rebuild(node: LogicTreeNode, kids: tuple) -> LogicTreeNode:
+        if isinstance(node, LogicOp):
+            return type(node)(*kids)
+        if isinstance(node, LogicMux):
+            return LogicMux(*kids)
+        if isinstance(node, BitSelect):
+            return BitSelect(kids[0], node.index)
+        if isinstance(node, PartSelect):
+            return PartSelect(kids[0], node.msb, node.lsb)
+        if isinstance(node, Concat):
+            return Concat(list(kids))
+        return node
+
+    def intern(self, tree: LogicTreeNode) -> LogicTreeNode:
+        """
+        Return the canonical node for `tree`, interning every subexpression.
+
+        Nodes whose children are already canonical are adopted as-is rather
+        than copied. Shared input subtrees are visited once.
+        """
+        if id(tree) in self._uid:
+            return tree
+
+        done: dict[int, LogicTreeNode] = {}
+        stack = [(tree, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in done:
+                continue
+            if id(node) in self._uid:
+                done[id(node)] = node
+                continue
+            kids = self._children_of(node)
+            if not expanded:
+                stack.append((node, True))
+                stack.extend((k, False) for k in reversed(kids) if id(k) not in done)
+                continue
+
+            canon_kids = tuple(done[id(k)] for k in kids)
+            key = self._key_for(node, canon_kids)
+            found = self._table.get(key)
+            if found is None:
+                unchanged = all(a is b for a, b in zip(kids, canon_kids))
+                found = self._register(
+                    key, node if unchanged else self._rebuild(node, canon_kids)
+                )
+            done[id(node)] = found
+
+        return done[id(tree)]
+
+
+def intern_tree(tree: LogicTreeNode, factory: Optional[NodeFactory] = None):
+    """Convenience wrapper: intern `tree` into `factory` (or a fresh one)."""
+    return (factory or NodeFactory()).intern(tree)
+
+
+__all__ = ["NodeFactory", "intern_tree"]
@@ -3,16 +3,15 @@ Comparison operation nodes.
 
 Defines EqOp (==) and NeqOp (!=) as concrete LogicOp nodes.
 These are expression-level operators, not statements: they do not
-write signals, they only read them. Each has its own _free_cache
-to support repeated free_vars() calls.
+write signals, they only read them. free_vars() is cached by LogicOp.
 """
 
 from __future__ import annotations
 
-from typing import FrozenSet, Optional
+from typing import FrozenSet
 
 from logictree.nodes.base import LogicTreeNode
-from logictree.nodes.ops.ops import LogicOp, LogicVar
+from logictree.nodes.ops.ops import LogicOp, LogicVar, child_property
 
 
 class EqOp(LogicOp):
@@ -20,24 +19,18 @@ class EqOp(LogicOp):
     Equality operation node: (lhs == rhs).
     """
 
-    _free_cache: Optional[FrozenSet[LogicVar]] = None
+    __slots__ = ()
+
+    lhs = child_property(0)
+    rhs = child_property(1)
 
     @property
     def operands(self):
         # Satisfy LogicOp’s abstract API and __repr__
-        return (self.lhs, self.rhs)
+        return self._kids
 
     def __init__(self, lhs: LogicTreeNode, rhs: LogicTreeNode):
         super().__init__(lhs, rhs)
-        self.lhs = lhs
-        self.rhs = rhs
-
-    def free_vars(self) -> FrozenSet[LogicVar]:
-        if self._free_cache is not None:
-            return self._free_cache
-        vars_ = set(self.lhs.free_vars()) | set(self.rhs.free_vars())
-        self._free_cache = frozenset(vars_)
-        return self._free_cache
 
     def writes(self) -> FrozenSet[LogicVar]:
         return frozenset()
@@ -61,23 +54,17 @@ class NeqOp(LogicOp):
     Inequality operation node: (lhs != rhs).
     """
 
-    _free_cache: Optional[FrozenSet[LogicVar]] = None
+    __slots__ = ()
+
+    lhs = child_property(0)
+    rhs = child_property(1)
 
     @property
     def operands(self):
-        return (self.lhs, self.rhs)
+        return self._kids
 
     def __init__(self, lhs: LogicTreeNode, rhs: LogicTreeNode):
         super().__init__(lhs, rhs)
-        self.lhs = lhs
-        self.rhs = rhs
-
-    def free_vars(self) -> FrozenSet[LogicVar]:
-        if self._free_cache is not None:
-            return self._free_cache
-        vars_ = set(self.lhs.free_vars()) | set(self.rhs.free_vars())
-        self._free_cache = frozenset(vars_)
-        return self._free_cache
 
     def writes(self) -> FrozenSet[LogicVar]:
         return frozenset()
@@ -1,13 +1,13 @@
-from dataclasses import field
-
 from ..base.base import LogicTreeNode
-from .ops import LogicOp
+from .ops import LogicOp, child_property
 
 __all__ = ["NotOp", "AndOp", "OrOp", "XorOp", "XnorOp", "NandOp", "NorOp"]
 
 
 def _commutative_equals(a, b):
     # assumes children = [lhs, rhs]
+    if a is b:
+        return True
     return a.__class__ is b.__class__ and (
         (a.children[0].equals(b.children[0]) and a.children[1].equals(b.children[1]))
         or (a.children[0].equals(b.children[1]) and a.children[1].equals(b.children[0]))
@@ -25,17 +25,13 @@ def _flatten_same(op_cls, ops):
 
 
 class NotOp(LogicOp):
-    metadata: dict = field(default_factory=dict, compare=False, repr=False)
-    operand: LogicTreeNode
+    __slots__ = ()
 
-    def __init__(self, operand):
-        super().__init__()
-        self._set_inputs([operand])
-        self.operand = operand
-        self.child = operand
+    operand = child_property(0)
+    child = operand
 
-    def _children(self):
-        return (self.operand,)
+    def __init__(self, operand: LogicTreeNode):
+        super().__init__(operand)
 
     @property
     def op(self):
@@ -49,11 +45,11 @@ class NotOp(LogicOp):
 
     @property
     def children(self):
-        return [self.operand]
+        return list(self._kids)
 
     @property
     def operands(self):
-        return [self.operand]
+        return list(self._kids)
 
     def __str__(self):
         return f"(~{self.operand})"
@@ -61,7 +57,13 @@ class NotOp(LogicOp):
     def __repr__(self):
         return f"NotOp({repr(self.operand)})"
 
+    def to_primitives(self):
+        # already primitive
+        return NotOp(self.operand)
+
     def equals(self, other):
+        if self is other:
+            return True
         return isinstance(other, NotOp) and self.operand.equals(other.operand)
 
     # def to_json_dict(self):
@@ -76,18 +78,13 @@ class NotOp(LogicOp):
 
 
 class AndOp(LogicOp):
-    a: LogicTreeNode
-    b: LogicTreeNode
-    metadata: dict = field(default_factory=dict, compare=False, repr=False)
+    __slots__ = ()
 
-    def __init__(self, a, b):
-        super().__init__()
-        self._set_inputs([a, b])
-        self.a = a
-        self.b = b
+    a = child_property(0)
+    b = child_property(1)
 
-    def _children(self):
-        return (self.a, self.b)
+    def __init__(self, a: LogicTreeNode, b: LogicTreeNode):
+        super().__init__(a, b)
 
     @property
     def op(self) -> str:
@@ -101,11 +98,11 @@ class AndOp(LogicOp):
 
     @property
     def children(self):
-        return [self.a, self.b]
+        return list(self._kids)
 
     @property
     def operands(self):
-        return [self.a, self.b]
+        return list(self._kids)
 
     @property
     def left(self):
@@ -123,7 +120,7 @@ class AndOp(LogicOp):
 
     def to_primitives(self):
         # already primitive
-        return AndOp(self.lhs, self.rhs)
+        return AndOp(self.a, self.b)
 
     def equals(self, other):
         return _commutative_equals(self, other)
@@ -141,18 +138,13 @@ class AndOp(LogicOp):
 
 
 class OrOp(LogicOp):
-    a: LogicTreeNode
-    b: LogicTreeNode
-    metadata: dict = field(default_factory=dict, compare=False, repr=False)
+    __slots__ = ()
 
-    def __init__(self, a, b):
-        super().__init__()
-        self._set_inputs([a, b])
-        self.a = a
-        self.b = b
+    a = child_property(0)
+    b = child_property(1)
 
-    def _children(self):
-        return (self.a, self.b)
+    def __init__(self, a: LogicTreeNode, b: LogicTreeNode):
+        super().__init__(a, b)
 
     @property
     def op(self) -> str:
@@ -166,11 +158,11 @@ class OrOp(LogicOp):
 
     @property
     def children(self):
-        return [self.a, self.b]
+        return list(self._kids)
 
     @property
     def operands(self):
-        return [self.a, self.b]
+        return list(self._kids)
 
     @property
     def left(self):
@@ -188,7 +180,7 @@ class OrOp(LogicOp):
 
     def to_primitives(self):
         # already primitive
-        return OrOp(self.lhs, self.rhs)
+        return OrOp(self.a, self.b)
 
     def equals(self, other):
         return _commutative_equals(self, other)
@@ -205,18 +197,13 @@ class OrOp(LogicOp):
 
 
 class XorOp(LogicOp):
-    a: LogicTreeNode
-    b: LogicTreeNode
-    metadata: dict = field(default_factory=dict, compare=False, repr=False)
+    __slots__ = ()
 
-    def __init__(self, a, b):
-        super().__init__()
-        self._set_inputs([a, b])
-        self.a = a
-        self.b = b
+    a = child_property(0)
+    b = child_property(1)
 
-    def _children(self):
-        return (self.a, self.b)
+    def __init__(self, a: LogicTreeNode, b: LogicTreeNode):
+        super().__init__(a, b)
 
     @property
     def op(self) -> str:
@@ -241,17 +228,17 @@ class XorOp(LogicOp):
 
     @property
     def children(self):
-        return [self.a, self.b]
+        return list(self._kids)
 
     @property
     def operands(self):
-        return [self.a, self.b]
+        return list(self._kids)
 
     def to_primitives(self):
         # (a & ~b) | (~a & b)
-        na = NotOp(self.lhs)
-        nb = NotOp(self.rhs)
-        return OrOp(AndOp(self.lhs, nb), AndOp(na, self.rhs))
+        na = NotOp(self.a)
+        nb = NotOp(self.b)
+        return OrOp(AndOp(self.a, nb), AndOp(na, self.b))
 
     def equals(self, other):
         return _commutative_equals(self, other)
@@ -268,18 +255,13 @@ class XorOp(LogicOp):
 
 
 class XnorOp(LogicOp):
-    a: LogicTreeNode
-    b: LogicTreeNode
-    metadata: dict = field(default_factory=dict, compare=False, repr=False)
+    __slots__ = ()
 
-    def __init__(self, a, b):
-        super().__init__()
-        self._set_inputs([a, b])
-        self.a = a
-        self.b = b
+    a = child_property(0)
+    b = child_property(1)
 
-    def _children(self):
-        return (self.a, self.b)
+    def __init__(self, a: LogicTreeNode, b: LogicTreeNode):
+        super().__init__(a, b)
 
     @property
     def op(self) -> str:
@@ -301,18 +283,18 @@ class XnorOp(LogicOp):
 
     @property
     def children(self):
-        return [self.a, self.b]
+        return list(self._kids)
 
     @property
     def operands(self):
-        return [self.a, self.b]
+        return list(self._kids)
 
     def __str__(self):
         return f"~({self.a} ^ {self.b})"
 
     def to_primitives(self):
         # ~(a ^ b)
-        return NotOp(XorOp(self.lhs, self.rhs))
+        return NotOp(XorOp(self.a, self.b))
 
     def equals(self, other):
         return _commutative_equals(self, other)
@@ -329,18 +311,13 @@ class XnorOp(LogicOp):
 
 
 class NandOp(LogicOp):
-    a: LogicTreeNode
-    b: LogicTreeNode
-    metadata: dict = field(default_factory=dict, compare=False, repr=False)
+    __slots__ = ()
 
-    def __init__(self, a, b):
-        super().__init__()
-        self._set_inputs([a, b])
-        self.a = a
-        self.b = b
+    a = child_property(0)
+    b = child_property(1)
 
-    def _children(self):
-        return (self.a, self.b)
+    def __init__(self, a: LogicTreeNode, b: LogicTreeNode):
+        super().__init__(a, b)
 
     @property
     def op(self) -> str:
@@ -362,17 +339,17 @@ class NandOp(LogicOp):
 
     @property
     def children(self):
-        return [self.a, self.b]
+        return list(self._kids)
 
     @property
     def operands(self):
-        return [self.a, self.b]
+        return list(self._kids)
 
     def __str__(self):
         return f"~({self.a} & {self.b})"
 
     def to_primitives(self):
-        return NotOp(AndOp(self.lhs, self.rhs))
+        return NotOp(AndOp(self.a, self.b))
 
     def equals(self, other):
         return _commutative_equals(self, other)
@@ -389,18 +366,13 @@ class NandOp(LogicOp):
 
 
 class NorOp(LogicOp):
-    a: LogicTreeNode
-    b: LogicTreeNode
-    metadata: dict = field(default_factory=dict, compare=False, repr=False)
+    __slots__ = ()
 
-    def __init__(self, a, b):
-        super().__init__()
-        self._set_inputs([a, b])
-        self.a = a
-        self.b = b
+    a = child_property(0)
+    b = child_property(1)
 
-    def _children(self):
-        return (self.a, self.b)
+    def __init__(self, a: LogicTreeNode, b: LogicTreeNode):
+        super().__init__(a, b)
 
     @property
     def op(self) -> str:
@@ -425,14 +397,14 @@ class NorOp(LogicOp):
 
     @property
     def children(self):
-        return [self.a, self.b]
+        return list(self._kids)
 
     @property
     def operands(self):
-        return [self.a, self.b]
+        return list(self._kids)
 
     def to_primitives(self):
-        return NotOp(OrOp(self.lhs, self.rhs))
+        return NotOp(OrOp(self.a, self.b))
 
     def equals(self, other):
         return _commutative_equals(self, other)
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import FrozenSet
+from typing import FrozenSet, Optional
 
 from logictree.nodes.base.base import LogicTreeNode
+from logictree.nodes.base.metrics import cached_metric
 from logictree.nodes.ops.ops import LogicVar
 
 
@@ -24,27 +25,52 @@ class LogicMux(LogicTreeNode):
     if_false: LogicTreeNode
     metadata: dict = field(default_factory=dict, compare=False, repr=False)
 
-    @property
-    def depth(self) -> int:
+    _depth_cache: Optional[int] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _delay_cache: Optional[int] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _free_cache: Optional[FrozenSet[LogicVar]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _shash_cache: Optional[tuple] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def _metric_children(self):
+        return [n for n in (self.selector, self.if_true, self.if_false) if n]
+
+    def _compute_depth(self) -> int:
         inputs = [self.if_true, self.if_false]
         input_depths = [inp.depth for inp in inputs if inp]
         sel_depth = self.selector.depth if self.selector else 0
         return 1 + max(input_depths + [sel_depth], default=0)
 
-    @property
-    def delay(self):
+    def _compute_delay(self) -> int:
         return max(self.if_true.delay, self.if_false.delay, self.selector.delay) + 1
 
-    def label(self) -> str:
-        return "MUX"
-
-    def free_vars(self) -> FrozenSet[LogicVar]:
+    def _compute_free_vars(self) -> FrozenSet[LogicVar]:
         return (
             self.selector.free_vars()
             | self.if_true.free_vars()
             | self.if_false.free_vars()
         )
 
+    @property
+    def depth(self) -> int:
+        return cached_metric(self, "_depth_cache", "_compute_depth")
+
+    @property
+    def delay(self):
+        return cached_metric(self, "_delay_cache", "_compute_delay")
+
+    def label(self) -> str:
+        return "MUX"
+
+    def free_vars(self) -> FrozenSet[LogicVar]:
+        return cached_metric(self, "_free_cache", "_compute_free_vars")
+
     def to_primitives(self) -> LogicTreeNode:
         """
         Lower to AOI form:
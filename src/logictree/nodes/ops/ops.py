@@ -6,6 +6,7 @@ from dataclasses import dataclass, field, replace
 from typing import FrozenSet, Optional, Union
 
 from logictree.nodes.base import LogicTreeNode
+from logictree.nodes.base.metrics import cached_metric
 from logictree.nodes.types import COMMUTATIVE_OPS
 
 log = logging.getLogger(__name__)
@@ -66,6 +67,8 @@ class LogicVar(LogicTreeNode):
         }
 
     def equals(self, other):
+        if self is other:
+            return True
         return isinstance(other, LogicVar) and self.name == other.name
 
     def __str__(self) -> str:
@@ -155,6 +158,8 @@ class LogicConst(LogicTreeNode):
         return []
 
     def equals(self, other):
+        if self is other:
+            return True
         return isinstance(other, LogicConst) and self.value == other.value
 
     @property
@@ -276,20 +281,54 @@ class LogicConst(LogicTreeNode):
         return my_id
 
 
+def child_property(index: int, doc: Optional[str] = None) -> property:
+    """Read-only named view (e.g. `a`, `operand`) of a LogicOp's `_kids` tuple."""
+    return property(lambda self: self._kids[index], doc=doc)
+
+
 class LogicOp(LogicTreeNode):
-    """Base for operator nodes (AND/OR/NOT/etc.)."""
+    """
+    Base for operator nodes (AND/OR/NOT/etc.).
+
+    Operator nodes are the bulk of every netlist, so they are slotted: the
+    children live in one fixed `_kids` tuple (exposed as `a`/`b`/`operand`/...
+    through child_property), and the `metadata` dict is only allocated the
+    first time someone asks for it. Subclasses must declare `__slots__ = ()`
+    to keep instances free of a per-node `__dict__`.
+    """
+
+    __slots__ = ("_kids", "_meta", "_depth_cache", "_free_cache", "_shash_cache")
 
     def __init__(self, *inputs):
-        self.metadata = {}
         super().__init__()
         if type(self) is LogicOp:
             raise TypeError(
                 "LogicOp is an abstract base class and cannot be instantiated"
             )
-        self._inputs: list[LogicTreeNode] = []
+        self._kids: tuple = tuple(inputs)
+        self._meta: Optional[dict] = None
+        # Lazily filled by cached_metric(); operator nodes are not mutated
+        # after construction, so the caches never need invalidating.
+        self._depth_cache: Optional[int] = None
+        self._free_cache: Optional[FrozenSet[LogicVar]] = None
+        self._shash_cache: Optional[tuple] = None  # see utils.structural_hash
+
+    @property
+    def metadata(self) -> dict:
+        if self._meta is None:
+            self._meta = {}
+        return self._meta
+
+    @metadata.setter
+    def metadata(self, value: dict):
+        self._meta = value
+
+    @property
+    def _inputs(self) -> list:
+        return list(self._kids)
 
     def _set_inputs(self, seq):
-        self._inputs = list(seq)
+        self._kids = tuple(seq)
 
     @property
     def name(self):
@@ -309,32 +348,21 @@ class LogicOp(LogicTreeNode):
         raise NotImplementedError("Subclasses must implement the 'operands' property")
 
     def inputs(self):
-        """Return child nodes in a list. Gate subclasses already expose a/b or operand."""
-        # If subclasses already define inputs(), keep using that.
-        # Otherwise, fall back to common attribute names.
-        if hasattr(self, "_inputs"):
-            return list(self._inputs)
-        if hasattr(self, "a") and hasattr(self, "b"):
-            return [self.a, self.b]
-        if hasattr(self, "operand"):
-            return [self.operand]
-        return []
+        """Return child nodes in a list."""
+        return list(self._kids)
 
     # if this is still abstract, you can omit or provide a generic union
     def _children(self):
-        # override in concrete ops if needed
-        return getattr(self, "children", ())
+        return self._kids
 
-    def free_vars(self) -> set[str]:
-        if hasattr(self, "_free_vars"):
-            return set(self._free_vars)
-        s = set().union(*(c.free_vars() for c in self._children()))
-        try:
-            # self._free_vars = set(s)
-            object.__setattr__(self, "_free_vars", set(s))  # ok with frozen dataclasses
-        except Exception:
-            pass  # caching is optional; correctness doesn’t depend on it
-        return s
+    def _metric_children(self):
+        return self._kids
+
+    def _compute_free_vars(self) -> FrozenSet[LogicVar]:
+        return frozenset().union(*(c.free_vars() for c in self._children()))
+
+    def free_vars(self) -> FrozenSet[LogicVar]:
+        return cached_metric(self, "_free_cache", "_compute_free_vars")
 
     def to_json_dict(self) -> dict:
         return {
@@ -346,11 +374,15 @@ class LogicOp(LogicTreeNode):
     def children(self):
         return tuple(self.operands)
 
+    def _compute_depth(self) -> int:
+        children = self.children
+        if not children:
+            return 0
+        return 1 + max(ch.depth for ch in children)
+
     @property
     def depth(self) -> int:
-        if not self.children:
-            return 0
-        return 1 + max(ch.depth for ch in self.children)
+        return cached_metric(self, "_depth_cache", "_compute_depth")
 
     @property
     def delay(self) -> int:
@@ -370,6 +402,8 @@ class LogicOp(LogicTreeNode):
     #    raise NotImplementedError("Subclasses must implement label()")
 
     def equals(self, other):
+        if self is other:
+            return True
         if not isinstance(other, LogicOp):
             return False
 
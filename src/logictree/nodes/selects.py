@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import FrozenSet, List
+from typing import FrozenSet, List, Optional
 
 from logictree.nodes.base.base import LogicTreeNode
+from logictree.nodes.base.metrics import cached_metric
 from logictree.nodes.ops import LogicVar
 
 
@@ -18,21 +19,38 @@ class BitSelect(LogicTreeNode):
     index: int
     width: int = field(init=False, default=1, repr=False)
     metadata: dict = field(default_factory=dict, compare=False, repr=False)
+    _depth_cache: Optional[int] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _delay_cache: Optional[int] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self):
         object.__setattr__(self, "width", 1)
 
-    @property
-    def depth(self) -> int:
+    def _metric_children(self):
+        return [self.base] if self.base else []
+
+    def _compute_depth(self) -> int:
         return 1 + self.base.depth if self.base else 0
 
-    @property
-    def delay(self):
+    def _compute_delay(self) -> int:
         if hasattr(self.base, "delay"):
             return self.base.delay + 1  # one extra step for indexing
         return 1  # minimum delay
 
+    @property
+    def depth(self) -> int:
+        return cached_metric(self, "_depth_cache", "_compute_depth")
+
+    @property
+    def delay(self):
+        return cached_metric(self, "_delay_cache", "_compute_delay")
+
     def equals(self, other: "LogicTreeNode") -> bool:
+        if self is other:
+            return True
         return (
             isinstance(other, BitSelect)
             and self.index == other.index
@@ -74,21 +92,38 @@ class PartSelect(LogicTreeNode):
     lsb: int
     width: int = field(init=False, default=1, repr=False)
     metadata: dict = field(default_factory=dict, compare=False, repr=False)
+    _depth_cache: Optional[int] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _delay_cache: Optional[int] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self):
         object.__setattr__(self, "width", abs(self.msb - self.lsb) + 1)
 
-    @property
-    def depth(self) -> int:
+    def _metric_children(self):
+        return [self.base] if self.base else []
+
+    def _compute_depth(self) -> int:
         return self.base.depth if self.base else 0
 
-    @property
-    def delay(self):
+    def _compute_delay(self) -> int:
         if hasattr(self.base, "delay"):
             return self.base.delay + 1  # selecting a range is usually a cheap op
         return 1
 
+    @property
+    def depth(self) -> int:
+        return cached_metric(self, "_depth_cache", "_compute_depth")
+
+    @property
+    def delay(self):
+        return cached_metric(self, "_delay_cache", "_compute_delay")
+
     def equals(self, other: "LogicTreeNode") -> bool:
+        if self is other:
+            return True
         return (
             isinstance(other, PartSelect)
             and self.msb == other.msb
@@ -131,6 +166,15 @@ class Concat(LogicTreeNode):
     parts: List[LogicTreeNode]
     width: int = field(init=False, default=1, repr=False)
     metadata: dict = field(default_factory=dict, compare=False, repr=False)
+    _depth_cache: Optional[int] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _delay_cache: Optional[int] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _free_cache: Optional[FrozenSet[LogicVar]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self):
         total = 0
@@ -143,16 +187,27 @@ class Concat(LogicTreeNode):
                 raise TypeError(f"Concat operand has no width: {p}")
         object.__setattr__(self, "width", total)
 
+    def _metric_children(self):
+        return self.parts
+
+    def _compute_depth(self) -> int:
+        return 1 + max(part.depth for part in self.parts)
+
+    def _compute_delay(self) -> int:
+        delays = [p.delay for p in self.parts if hasattr(p, "delay")]
+        return max(delays) if delays else 0
+
     @property
     def depth(self) -> int:
-        return 1 + max(part.depth for part in self.parts)
+        return cached_metric(self, "_depth_cache", "_compute_depth")
 
     @property
     def delay(self):
-        delays = [p.delay for p in self.parts if hasattr(p, "delay")]
-        return max(delays) if delays else 0
+        return cached_metric(self, "_delay_cache", "_compute_delay")
 
     def equals(self, other: "LogicTreeNode") -> bool:
+        if self is other:
+            return True
         if not isinstance(other, Concat):
             return False
         if len(self.parts) != len(other.parts):
@@ -168,7 +223,7 @@ class Concat(LogicTreeNode):
     def set_viz_label(self, label: str) -> None:
         object.__setattr__(self, "_viz_label", label)
 
-    def free_vars(self) -> FrozenSet[LogicVar]:
+    def _compute_free_vars(self) -> FrozenSet[LogicVar]:
         fv = set()
         for p in self.parts:
             if hasattr(p, "free_vars"):
@@ -177,6 +232,9 @@ class Concat(LogicTreeNode):
                 fv.add(p)
         return frozenset(fv)
 
+    def free_vars(self) -> FrozenSet[LogicVar]:
+        return cached_metric(self, "_free_cache", "_compute_free_vars")
+
     def __eq__(self, other) -> bool:
         return isinstance(other, Concat) and tuple(self.parts) == tuple(other.parts)
 
@@ -16,12 +16,16 @@ class Statement(ABC):
     _free_cache: Optional[FrozenSet[LogicVar]] = None
     _w_cache: Optional[FrozenSet[LogicVar]] = None
     _wm_cache: Optional[FrozenSet[LogicVar]] = None
+    _depth_cache: Optional[int] = None
+    _delay_cache: Optional[int] = None
 
     def _invalidate_rw_caches(self):
         """Clear any cached results for free_vars(), writes(), writes_must()."""
         self._free_cache = None
         self._w_cache = None
         self._wm_cache = None
+        self._depth_cache = None
+        self._delay_cache = None
 
     @abstractmethod
     def free_vars(self) -> FrozenSet[LogicVar]:
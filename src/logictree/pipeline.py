@@ -1,9 +1,16 @@
 import logging
-from typing import Any, Dict
+import os
+import time
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from logictree.fast_lowering import FastPathUnsupported, lower_module_text
 from logictree.nodes.base.base import LogicTreeNode
 from logictree.SVToLogicTreeLowerer import SVToLogicTreeLowerer
-from sv_parser.parse import parse_sv_file, parse_sv_text
+from logictree.utils.module_cache import ModuleCache
+from sv_parser.parse import ParseTiming, parse_sv_file, parse_sv_text
+from sv_parser.split import ModuleSource, split_modules
 from sv_parser.SystemVerilogSubsetParser import SystemVerilogSubsetParser
 
 try:
@@ -170,11 +177,229 @@ def _lower_all_modules(parse_tree) -> ModuleMap:
     return module_map
 
 
-def lower_sv_text_to_logic(src: str) -> ModuleMap:
-    parse_tree = parse_sv_text(src)
+def _lower_module_source(
+    piece: ModuleSource,
+    source: str,
+    timings: Optional[List[ParseTiming]] = None,
+    fast: bool = False,
+) -> ModuleMap:
+    """
+    Lower one module's text. With `fast`, try fast_lowering first and only
+    build an ANTLR parse tree for modules it declines.
+    """
+    label = f"{source}:{piece.name}"
+    if fast:
+        t0 = time.perf_counter()
+        try:
+            mod = lower_module_text(piece.text)
+        except FastPathUnsupported as e:
+            log.debug("Fast path declined %s (%s); parsing with ANTLR", label, e)
+        else:
+            if timings is not None:
+                timings.append(ParseTiming(label, time.perf_counter() - t0, "fast"))
+            return {mod.name: mod}
+    parse_tree = parse_sv_text(
+        piece.text, timings=timings, source=label, line=piece.line
+    )
     return _lower_all_modules(parse_tree)
 
 
-def lower_sv_file_to_logic(path: str) -> ModuleMap:
-    parse_tree = parse_sv_file(path)
+def _lower_text(
+    src: str,
+    source: str = "<text>",
+    timings: Optional[List[ParseTiming]] = None,
+    fast: bool = False,
+) -> ModuleMap:
+    if fast:
+        try:
+            pieces = list(split_modules(src.splitlines(keepends=True)))
+        except ValueError as e:
+            log.debug("Cannot split %s (%s); parsing it whole", source, e)
+        else:
+            module_map: ModuleMap = {}
+            for piece in pieces:
+                module_map.update(_lower_module_source(piece, source, timings, fast))
+            if not module_map:
+                raise RuntimeError("No valid module_declaration found in parsed file.")
+            return module_map
+    parse_tree = parse_sv_text(src, timings=timings, source=source)
     return _lower_all_modules(parse_tree)
+
+
+def lower_sv_text_to_logic(src: str, fast: bool = False) -> ModuleMap:
+    """
+    Parse and lower SystemVerilog text. fast=True lowers modules that only
+    contain ports, net declarations and continuous assigns without building
+    an ANTLR parse tree (see logictree.fast_lowering); the result is the same.
+    """
+    return _lower_text(src, fast=fast)
+
+
+def lower_sv_file_to_logic(
+    path: str,
+    cache: Optional[ModuleCache] = None,
+    timings: Optional[List[ParseTiming]] = None,
+    fast: bool = False,
+) -> ModuleMap:
+    """
+    Parse and lower one file. With a ModuleCache, a file whose bytes were
+    lowered before is loaded from the cache instead of being parsed again.
+    A ParseTiming for the file is appended to `timings` if given (one per
+    module with `fast`, as for lower_sv_text_to_logic()).
+    """
+    if cache is None and not fast:
+        parse_tree = parse_sv_file(path, timings=timings)
+        return _lower_all_modules(parse_tree)
+
+    t0 = time.perf_counter()
+    source = Path(path).read_bytes()
+    module_map = cache.get(source) if cache is not None else None
+    if module_map is not None:
+        log.debug("Cache hit for %s", path)
+        if timings is not None:
+            timings.append(ParseTiming(str(path), time.perf_counter() - t0, "cached"))
+        return module_map
+    # Same decoding as parse_sv_file()'s FileStream
+    module_map = _lower_text(source.decode("ascii"), str(path), timings, fast)
+    if cache is not None:
+        cache.put(source, module_map)
+    return module_map
+
+
+def iter_sv_file_modules(
+    path: str,
+    top: Optional[str] = None,
+    cache: Optional[ModuleCache] = None,
+    timings: Optional[List[ParseTiming]] = None,
+    fast: bool = False,
+) -> Iterator[Tuple[str, Module]]:
+    """
+    Lazily parse and lower a file one module at a time, yielding
+    (name, Module) pairs in source order.
+
+    The file is streamed through sv_parser.split.split_modules(), so only one
+    module's text is held at a time and each module is parsed on its own;
+    with `top`, every other module is skipped without being parsed. With a
+    ModuleCache, entries are keyed by each module's own text, so editing one
+    module of a large file does not invalidate the others. One ParseTiming
+    per parsed module (source "<path>:<module>") is appended to `timings`.
+    `fast` is as for lower_sv_text_to_logic().
+    """
+    only = None if top is None else {top}
+    # Same decoding as parse_sv_file()'s FileStream
+    with open(path, "r", encoding="ascii", newline="") as fh:
+        for piece in split_modules(fh, only=only):
+            source = f"{path}:{piece.name}"
+            key = piece.text.encode("ascii")
+            t0 = time.perf_counter()
+            module_map = cache.get(key) if cache is not None else None
+            if module_map is not None:
+                log.debug("Cache hit for %s", source)
+                if timings is not None:
+                    elapsed = time.perf_counter() - t0
+                    timings.append(ParseTiming(source, elapsed, "cached"))
+            else:
+                module_map = _lower_module_source(piece, path, timings, fast)
+                if cache is not None:
+                    cache.put(key, module_map)
+            yield from module_map.items()
+
+
+def _lower_file_job(path: str, cache: Optional[ModuleCache] = None, fast: bool = False):
+    # Runs in a worker process: exceptions are re-raised in the parent, so
+    # name the file here.
+    timings: List[ParseTiming] = []
+    try:
+        return lower_sv_file_to_logic(path, cache, timings, fast), timings
+    except Exception as e:
+        raise RuntimeError(f"{path}: {e}") from e
+
+
+def read_filelist(path: str) -> List[str]:
+    """
+    Source paths listed in a filelist (`-f` file), one per line.
+
+    Blank lines and `//` or `#` comments are ignored, relative paths are
+    taken relative to the filelist, nested `-f other.f` entries are expanded,
+    and other tool options (`+incdir+...`, `-v lib.v`, ...) are skipped.
+    """
+    base = Path(path).resolve().parent
+    files: List[str] = []
+    with open(path, "r", encoding="utf-8") as fh:
+        for raw in fh:
+            line = raw.split("//", 1)[0].strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("-f"):
+                nested = line[2:].strip()
+                files.extend(read_filelist(str(base / nested)))
+                continue
+            if line.startswith(("+", "-")):
+                log.debug("read_filelist: skipping option %r in %s", line, path)
+                continue
+            files.append(str(base / line))
+    return files
+
+
+def lower_sv_files_to_logic(
+    paths: Iterable[str],
+    jobs: Optional[int] = None,
+    on_duplicate: str = "warn",
+    cache: Optional[ModuleCache] = None,
+    timings: Optional[List[ParseTiming]] = None,
+    fast: bool = False,
+) -> ModuleMap:
+    """
+    Parse and lower several SystemVerilog files into one ModuleMap.
+
+    Files are handled by a pool of `jobs` worker processes (default: one per
+    CPU; `jobs=1` runs in-process), since parsing with the ANTLR Python
+    runtime is CPU bound. Modules are merged in file order.
+
+    A module name defined in more than one file is a duplicate: with
+    on_duplicate="warn" each one is logged and the first definition is kept,
+    with on_duplicate="error" a ValueError listing all of them is raised.
+
+    `cache` (a ModuleCache) is consulted and filled by each worker, and
+    the per-file ParseTimings are appended to `timings` in file order.
+    `fast` is as for lower_sv_text_to_logic().
+    """
+    if on_duplicate not in ("warn", "error"):
+        raise ValueError(
+            f"on_duplicate must be 'warn' or 'error', not {on_duplicate!r}"
+        )
+    paths = [str(p) for p in paths]
+    if not paths:
+        raise ValueError("lower_sv_files_to_logic(): no input files")
+
+    job = partial(_lower_file_job, cache=cache, fast=fast)
+    jobs = min(jobs or os.cpu_count() or 1, len(paths))
+    if jobs <= 1:
+        results = [job(p) for p in paths]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(job, paths))
+
+    merged: ModuleMap = {}
+    origin: Dict[str, str] = {}
+    duplicates: List[str] = []
+    for path, (module_map, file_timings) in zip(paths, results):
+        if timings is not None:
+            timings.extend(file_timings)
+        for name, mod in module_map.items():
+            if name in merged:
+                duplicates.append(
+                    f"module '{name}' in {path} (first defined in {origin[name]})"
+                )
+                continue
+            merged[name] = mod
+            origin[name] = path
+
+    if duplicates:
+        if on_duplicate == "error":
+            raise ValueError("Duplicate module names:\n  " + "\n  ".join(duplicates))
+        for dup in duplicates:
+            log.warning("Ignoring duplicate %s", dup)
+    return merged
@@ -0,0 +1,182 @@
+"""
+Incremental lowering for tools that re-run the pipeline on every save.
+
+A LoweringSession remembers, per source file, the span and a hash of each
+module's text. Updating a file re-splits it (sv_parser.split), and only
+modules whose text changed, or that are new, are parsed and lowered again;
+unchanged modules keep their Module objects even if they moved. Results of
+downstream analyses registered through LoweringSession.analysis() are cached
+per (module, output, analysis) and dropped only for the modules an update
+touched.
+
+    session = LoweringSession()
+    session.update_file("top.sv")
+    h = session.analysis("top", "y", "hash", lambda m, s: get_logic_hash(...))
+    update = session.update_file("top.sv")   # after an edit
+    update.dirty                             # modules re-lowered or removed
+"""
+
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from logictree.nodes.struct.module import Module
+from logictree.pipeline import ModuleMap, _lower_module_source
+from sv_parser.parse import ParseTiming
+from sv_parser.split import ModuleSource, split_modules
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class ModuleRecord:
+    """Where a module came from, and the hash of its text."""
+
+    name: str
+    source: str
+    line: int
+    end_line: int
+    digest: str
+    module: Module
+
+
+@dataclass
+class SessionUpdate:
+    """Outcome of LoweringSession.update_text()/update_file()."""
+
+    source: str
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+
+    @property
+    def dirty(self) -> List[str]:
+        """Modules whose cached analyses were invalidated."""
+        return self.added + self.changed + self.removed
+
+
+def _digest(piece: ModuleSource) -> str:
+    return hashlib.sha256(piece.text.encode("utf-8")).hexdigest()
+
+
+class LoweringSession:
+    """
+    Keeps lowered modules for a set of sources and relowers only what
+    changed. `fast` is passed through to the pipeline (see
+    lower_sv_text_to_logic()); ParseTimings for the modules that actually get
+    parsed are appended to `timings` if given.
+
+    A module name defined by two sources belongs to the first one; the
+    other definition is logged and ignored, as in lower_sv_files_to_logic().
+    """
+
+    def __init__(self, fast: bool = False, timings: Optional[List[ParseTiming]] = None):
+        self.fast = fast
+        self.timings = timings
+        self._records: Dict[str, ModuleRecord] = {}
+        self._by_source: Dict[str, List[str]] = {}
+        self._analyses: Dict[str, Dict[Tuple[str, str], Any]] = {}
+
+    # -- sources ----------------------------------------------------------------
+
+    def update_file(self, path: str) -> SessionUpdate:
+        # Same decoding as parse_sv_file()'s FileStream
+        with open(path, "r", encoding="ascii", newline="") as fh:
+            return self._update(str(path), split_modules(fh))
+
+    def update_text(self, text: str, source: str = "<text>") -> SessionUpdate:
+        return self._update(source, split_modules(text.splitlines(keepends=True)))
+
+    def remove_source(self, source: str) -> SessionUpdate:
+        update = SessionUpdate(source)
+        for name in self._by_source.pop(source, []):
+            del self._records[name]
+            self._analyses.pop(name, None)
+            update.removed.append(name)
+        return update
+
+    def _update(self, source: str, pieces) -> SessionUpdate:
+        update = SessionUpdate(source)
+        old = set(self._by_source.get(source, ()))
+        names: List[str] = []
+        for piece in pieces:
+            digest = _digest(piece)
+            record = self._records.get(piece.name)
+            if record is not None and record.source != source:
+                log.warning(
+                    "Ignoring duplicate module '%s' in %s (first defined in %s)",
+                    piece.name,
+                    source,
+                    record.source,
+                )
+                continue
+            if record is not None and record.digest == digest:
+                record.line, record.end_line = piece.line, piece.end_line
+                update.unchanged.append(piece.name)
+                names.append(piece.name)
+                continue
+            module_map: ModuleMap = _lower_module_source(
+                piece, source, self.timings, self.fast
+            )
+            for name, mod in module_map.items():
+                self._records[name] = ModuleRecord(
+                    name, source, piece.line, piece.end_line, digest, mod
+                )
+                self._analyses.pop(name, None)
+                (update.changed if name in old else update.added).append(name)
+                names.append(name)
+        for name in old.difference(names):
+            del self._records[name]
+            self._analyses.pop(name, None)
+            update.removed.append(name)
+        self._by_source[source] = names
+        log.debug(
+            "Session update of %s: %d relowered, %d unchanged, %d removed",
+            source,
+            len(update.added) + len(update.changed),
+            len(update.unchanged),
+            len(update.removed),
+        )
+        return update
+
+    # -- results ----------------------------------------------------------------
+
+    @property
+    def modules(self) -> ModuleMap:
+        return {name: rec.module for name, rec in self._records.items()}
+
+    def module_names(self, source: str) -> List[str]:
+        """Modules currently lowered from `source`, in source order."""
+        return list(self._by_source.get(source, ()))
+
+    def module(self, name: str) -> Module:
+        return self._records[name].module
+
+    def record(self, name: str) -> ModuleRecord:
+        return self._records[name]
+
+    def analysis(
+        self,
+        module: str,
+        signal: str,
+        name: str,
+        compute: Callable[[Module, str], Any],
+    ) -> Any:
+        """
+        compute(Module, signal), cached under (module, signal, name) until the
+        module is relowered or removed.
+        """
+        per_module = self._analyses.setdefault(module, {})
+        key = (signal, name)
+        if key not in per_module:
+            per_module[key] = compute(self._records[module].module, signal)
+        return per_module[key]
+
+    def invalidate(self, module: Optional[str] = None) -> None:
+        """Drop cached analyses for one module, or for all of them."""
+        if module is None:
+            self._analyses.clear()
+        else:
+            self._analyses.pop(module, None)
@@ -0,0 +1,88 @@
+"""
+Delay-aware balancing of associative gate chains.
+
+The lowerer builds AND/OR/XOR chains left-deep (_expand_vector_comparison,
+for one, ANDs one bit compare onto the running result), so an n-operand
+chain is n-1 gates deep. balance_tree() flattens every chain of the same
+associative operator into its operands and rebuilds it with
+huffman_tree_reduce(): the two operands that arrive first (lowest `delay`)
+are combined first, which gives each chain the least depth its operands'
+arrival times allow. A late operand ends up right below the chain's output
+instead of at the bottom of it. NAND/NOR/XNOR are an AND/OR/XOR chain under
+an inverting output gate.
+
+A chain node referenced from more than one place stays an operand, so shared
+logic is not duplicated, and a chain the rebuild would not make shallower is
+returned unchanged (the same object). Other nodes are rebuilt over their
+balanced children.
+
+    balanced = balance_tree(tree)
+    tree.delay, balanced.delay   # critical-path depth before and after
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+
+from logictree.nodes.base import LogicTreeNode
+from logictree.nodes.ops.ops import LogicOp
+from logictree.utils.reduce import _delay, huffman_tree_reduce
+from logictree.utils.traverse import children_of, fold, iter_postorder, rebuild_node
+
+# op -> the associative op its operands are chained with
+CHAIN_OPS = {
+    "AND": "AND",
+    "OR": "OR",
+    "XOR": "XOR",
+    "NAND": "AND",
+    "NOR": "OR",
+    "XNOR": "XOR",
+}
+
+
+def _is_chain(node) -> bool:
+    return isinstance(node, LogicOp) and node.op in CHAIN_OPS
+
+
+def _chain_operands(node, refs: Counter) -> list:
+    """Operands of the chain rooted at `node`, left to right."""
+    base = CHAIN_OPS[node.op]
+    operands: list = []
+    stack = list(reversed(node.children))
+    while stack:
+        n = stack.pop()
+        if isinstance(n, LogicOp) and n.op == base and refs[id(n)] == 1:
+            stack.extend(reversed(n.children))
+        else:
+            operands.append(n)
+    return operands
+
+
+def balance_tree(tree: LogicTreeNode) -> LogicTreeNode:
+    """`tree` with every associative chain rebuilt for minimum delay."""
+    refs: Counter = Counter()
+    for node in iter_postorder(tree):
+        for k in set(map(id, children_of(node))):
+            refs[k] += 1
+
+    def children(node):
+        return _chain_operands(node, refs) if _is_chain(node) else children_of(node)
+
+    def visit(node, results):
+        if not _is_chain(node):
+            kids = children_of(node)
+            if all(a is b for a, b in zip(kids, results)):
+                return node
+            return rebuild_node(node, tuple(results))
+        op = node.op
+        balanced = huffman_tree_reduce(CHAIN_OPS[op], results, root_op=op)
+        operands = children(node)
+        if all(a is b for a, b in zip(operands, results)):
+            if _delay(balanced) >= _delay(node):
+                return node
+        return balanced
+
+    return fold(tree, visit, children)
+
+
+__all__ = ["balance_tree", "CHAIN_OPS"]
@@ -4,7 +4,7 @@ Case → If lowering transforms.
 This module provides a clean separation of concerns:
 
   * case_to_if_tree(stmt): primitive lowering of a CaseStatement into an IfStatement
-  * transform_cases(node): recursively walks an IR node and lowers any CaseStatements
+  * transform_cases(node): walks an IR node and lowers any CaseStatements
   * lower_map_cases(signal_map): apply transform_cases across a dict[str, LogicTreeNode]
   * lower_module_cases(module): apply transform_cases to all assignments in a Module
 
@@ -16,12 +16,12 @@ arbitrary node or structure that may contain CaseStatements.
 import logging
 
 from logictree.nodes.base.base import LogicTreeNode
-from logictree.nodes.control.assign import LogicAssign
 from logictree.nodes.control.case import CaseStatement  # your actual classes
 from logictree.nodes.control.ifstatement import IfStatement
-from logictree.nodes.ops import LogicConst, LogicVar
+from logictree.nodes.ops import LogicConst
 from logictree.nodes.ops.comparison import EqOp
 from logictree.nodes.struct.module import Module
+from logictree.utils.traverse import children_of, rewrite
 
 log = logging.getLogger(__name__)
 
@@ -53,38 +53,25 @@ def case_to_if_tree(stmt: CaseStatement) -> IfStatement:
     return current
 
 
+def _case_children(node) -> tuple:
+    # CaseStatements are lowered whole; their arms are not visited first
+    if isinstance(node, CaseStatement):
+        return ()
+    return children_of(node)
+
+
 def transform_cases(node: LogicTreeNode) -> LogicTreeNode:
     """
-    Recursively transform a LogicTreeNode, lowering all CaseStatements into IfStatements.
+    Transform a LogicTreeNode, lowering all CaseStatements into IfStatements.
     Returns a structurally equivalent node tree with no CaseStatements.
     """
-    if isinstance(node, CaseStatement):
-        return case_to_if_tree(node)
-
-    if isinstance(node, IfStatement):
-        return IfStatement(
-            cond=transform_cases(node.cond),
-            then_branch=transform_cases(node.then_branch),
-            else_branch=transform_cases(node.else_branch) if node.else_branch else None,
-        )
-
-    if isinstance(node, LogicAssign):
-        return LogicAssign(
-            lhs=node.lhs,
-            rhs=transform_cases(node.rhs),
-        )
-
-    # short-circut for atomic leaves
-    if isinstance(node, (LogicConst, LogicVar)):
-        return node
 
-    # Generic n-ary operator
-    if hasattr(node, "children") and isinstance(node.children, (list, tuple)):
-        new_children = [transform_cases(c) for c in node.children]
-        return type(node)(*new_children)
+    def visit(n):
+        if isinstance(n, CaseStatement):
+            return case_to_if_tree(n)
+        return n
 
-    # Leaf or unhandled node → return unchanged
-    return node
+    return rewrite(node, visit, children=_case_children)
 
 
 def lower_map_cases(signal_map: dict[str, LogicTreeNode]) -> dict[str, LogicTreeNode]:
@@ -0,0 +1,220 @@
+"""
+Module-wide common subexpression elimination.
+
+Each output of a Module is its own tree, and resolve_signal_vars() inlines
+intermediate signals into every output that reads them, so logic used by
+several outputs is duplicated once per output. eliminate_common_subexpressions()
+interns all outputs through one NodeFactory: structurally equal subtrees,
+with the operands of commutative gates in either order, become one shared
+node, and the outputs become a single DAG. Every non-trivial node used more
+than once (by two parents, or as an output and inside another one) is then
+reported as an extracted signal, named `<prefix><n>` in dependency order.
+
+By default the outputs and the signals are nodes of the shared DAG, so
+passes that memoize per node (hashing, evaluation, gate counting) do the
+shared cones once. With `as_wires=True` every use of an extracted
+subexpression becomes a LogicVar reference to its wire instead, and the
+definitions form a netlist: each output and each wire is computed once and
+refers to earlier wires by name. An output that is itself used by another
+output is referenced under its own name rather than as a new wire.
+
+    result = cse_module(module, as_wires=True)
+    result.signals          # {'cse0': ..., 'cse1': ...} dependencies first
+    result.to_module(module)  # a Module with the wires as assignments
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Mapping, Optional
+
+from logictree.nodes.base import LogicTreeNode
+from logictree.nodes.control.assign import LogicAssign
+from logictree.nodes.factory import NodeFactory
+from logictree.nodes.ops.gates import NotOp
+from logictree.nodes.ops.mux import LogicMux
+from logictree.nodes.ops.ops import LogicConst, LogicOp, LogicVar
+from logictree.nodes.selects import BitSelect, PartSelect
+from logictree.nodes.struct.module import Module
+from logictree.transforms.signal_resolution import resolve_signal_vars
+from logictree.utils.traverse import children_of, fold, iter_postorder, rebuild_node
+
+log = logging.getLogger(__name__)
+
+_ROOT = object()
+
+
+@dataclass
+class CSEResult:
+    """Outputs and extracted signals; see the module docstring."""
+
+    outputs: Dict[str, LogicTreeNode]
+    signals: Dict[str, LogicTreeNode] = field(default_factory=dict)
+    as_wires: bool = False
+    gates_before: int = 0
+    gates_after: int = 0
+
+    def to_module(self, module: Module) -> Module:
+        """A copy of `module` assigning the outputs and, as wires, the signals."""
+        defs = {**self.signals, **self.outputs} if self.as_wires else self.outputs
+        signal_map = dict(module.signal_map)
+        signal_map.update(defs)
+        return Module(
+            name=module.name,
+            ports=list(module.ports),
+            signal_map=signal_map,
+            assignments={
+                name: LogicAssign(lhs=LogicVar(name, width=_width(tree)), rhs=tree)
+                for name, tree in defs.items()
+            },
+            instances=list(module.instances),
+            vector_widths=dict(module.vector_widths),
+        )
+
+
+def _width(node) -> int:
+    return getattr(node, "width", None) or 1
+
+
+def _is_leaf(node) -> bool:
+    if isinstance(node, (LogicVar, LogicConst)):
+        return True
+    if isinstance(node, (BitSelect, PartSelect)):
+        return isinstance(node.base, LogicVar)
+    return False
+
+
+def _worth_extracting(node) -> bool:
+    if isinstance(node, NotOp):
+        return not _is_leaf(node.operand)  # a lone inverter is not worth a wire
+    return isinstance(node, (LogicOp, LogicMux))
+
+
+def dag_gate_count(trees) -> int:
+    """Distinct gates (LogicOp nodes) reachable from any of `trees`."""
+    roots = list(trees)
+    kids = lambda n: roots if n is _ROOT else children_of(n)  # noqa: E731
+    return sum(isinstance(n, LogicOp) for n in iter_postorder(_ROOT, kids))
+
+
+def eliminate_common_subexpressions(
+    trees: Mapping[str, LogicTreeNode],
+    *,
+    as_wires: bool = False,
+    prefix: str = "cse",
+    factory: Optional[NodeFactory] = None,
+    reserved=(),
+) -> CSEResult:
+    """
+    Share equal subtrees across `trees` (output name -> tree) and extract the
+    ones used more than once. Wire names skip `reserved` and the output
+    names. `factory` may already hold the trees' nodes (e.g. from
+    resolve_signal_vars(..., factory=...)).
+    """
+    factory = factory or NodeFactory()
+    gates_before = sum(dag_gate_count([t]) for t in trees.values())
+    shared = {name: factory.intern(tree) for name, tree in trees.items()}
+
+    roots = list(shared.values())
+    kids = lambda n: roots if n is _ROOT else children_of(n)  # noqa: E731
+    uses: Counter = Counter()
+    order = []
+    for node in iter_postorder(_ROOT, kids):
+        if node is _ROOT:
+            continue
+        order.append(node)
+        for k in {id(c): c for c in children_of(node)}:
+            uses[k] += 1
+    owner: dict = {}  # id(root) -> first output computing it
+    for name, root in shared.items():
+        uses[id(root)] += 1
+        owner.setdefault(id(root), name)
+
+    taken = set(shared) | set(reserved)
+    names: dict = {}  # id(node) -> signal name
+    count = 0
+    for node in order:
+        if uses[id(node)] < 2 or not _worth_extracting(node):
+            continue
+        if id(node) in owner:
+            names[id(node)] = owner[id(node)]
+            continue
+        while f"{prefix}{count}" in taken:
+            count += 1
+        names[id(node)] = f"{prefix}{count}"
+        taken.add(names[id(node)])
+
+    signals = {
+        names[id(n)]: n for n in order if id(n) in names and names[id(n)] not in shared
+    }
+    result = CSEResult(shared, signals, as_wires, gates_before=gates_before)
+    if as_wires:
+        _to_wires(result, names, owner)
+    result.gates_after = dag_gate_count(
+        list(result.outputs.values()) + list(result.signals.values())
+    )
+    log.debug(
+        "CSE: %d signals extracted, gates %d -> %d",
+        len(names),
+        result.gates_before,
+        result.gates_after,
+    )
+    return result
+
+
+def _to_wires(result: CSEResult, names: dict, owner: dict) -> None:
+    """Replace every use of an extracted node by a reference to its wire."""
+    wires = {}
+    memo: dict = {}
+
+    def visit(node, results):
+        # result: (definition, what a parent refers to)
+        refs = tuple(r[1] for r in results)
+        defn = node
+        if any(a is not b for a, b in zip(children_of(node), refs)):
+            defn = rebuild_node(node, refs)
+        name = names.get(id(node))
+        if name is None:
+            return defn, defn
+        wire = wires.get(name)
+        if wire is None:
+            wire = wires[name] = LogicVar(name, width=_width(node))
+        return defn, wire
+
+    def definition(node):
+        return fold(node, visit, children_of, memo)[0]
+
+    result.signals = {name: definition(n) for name, n in result.signals.items()}
+    outputs = {}
+    for name, root in result.outputs.items():
+        first = owner[id(root)]
+        if first == name:
+            outputs[name] = definition(root)
+        else:  # same function as an earlier output
+            outputs[name] = LogicVar(first, width=_width(root))
+    result.outputs = outputs
+
+
+def cse_module(module: Module, **kwargs) -> CSEResult:
+    """
+    CSE over all outputs (assignments) of `module`, with intermediate
+    signals resolved first. See eliminate_common_subexpressions() for
+    `kwargs`.
+    """
+    factory = kwargs.pop("factory", None) or NodeFactory()
+    trees = {
+        name: resolve_signal_vars(asg.rhs, module.signal_map, factory)
+        for name, asg in module.assignments.items()
+    }
+    kwargs.setdefault("reserved", module.signal_map.keys())
+    return eliminate_common_subexpressions(trees, factory=factory, **kwargs)
+
+
+__all__ = [
+    "CSEResult",
+    "cse_module",
+    "dag_gate_count",
+    "eliminate_common_subexpressions",
+]
@@ -0,0 +1,343 @@
+"""
+Fixpoint rule-based rewriting of gate trees.
+
+A RewriteEngine walks a tree bottom-up (iteratively, through gates only) and
+settles each node: its rules are tried in order, and whenever one fires its
+replacement is settled in turn, until no rule applies. A settled node's
+children are settled too, so the returned tree is a fixpoint of the whole
+rule set in a single walk. Results are memoized per node identity: shared
+subtrees are rewritten once, settled nodes are never looked at again, and a
+subtree no rule touched is returned as the very same object.
+
+A Rule is a name, the node types it applies to and a function that returns a
+replacement node, or None when it does not apply. Rules only ever see nodes
+whose children are already settled. Every replacement must be strictly
+simpler (fewer gates) than the node it replaces, otherwise settling may not
+terminate; the engine gives up after `max_rewrites` rewrites of one node.
+
+Operand equality is decided by structural_hash(), which is linear, cached on
+the gates and already ignores operand order, nesting and double negation.
+Chain rules (flatten, absorption) look at the AND/OR/XOR chain rooted at a
+node through at most CHAIN_LIMIT operands, which keeps long left-deep
+chains linear.
+
+    engine = RewriteEngine()
+    tree = engine.run(tree)
+    engine.hits  # Counter({'constants': 12, 'absorption': 3, ...})
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from functools import reduce
+from typing import Callable, Iterable, Optional, Tuple
+
+from logictree.nodes.base import LogicTreeNode
+from logictree.nodes.ops import LogicConst
+from logictree.nodes.ops.gates import AndOp, NandOp, NorOp, NotOp, OrOp, XnorOp, XorOp
+from logictree.utils.structural_hash import structural_hash
+from logictree.utils.traverse import rewrite
+
+log = logging.getLogger(__name__)
+
+_GATES = (NotOp, AndOp, OrOp, XorOp, XnorOp, NandOp, NorOp)
+_BINARY = (AndOp, OrOp, XorOp, XnorOp, NandOp, NorOp)
+_CHAINS = (AndOp, OrOp, XorOp)
+
+CHAIN_LIMIT = 32
+
+
+@dataclass(frozen=True)
+class Rule:
+    """`apply(node)` returns the replacement of `node`, or None."""
+
+    name: str
+    types: Tuple[type, ...]
+    apply: Callable[[LogicTreeNode], Optional[LogicTreeNode]]
+
+
+def _gate_children(node) -> tuple:
+    # Only descend through gates; anything else is kept whole
+    return tuple(node.children) if isinstance(node, _GATES) else ()
+
+
+class RewriteEngine:
+    """Applies a rule set to a fixpoint; see the module docstring."""
+
+    def __init__(self, rules: Optional[Iterable[Rule]] = None, max_rewrites=1000):
+        self.rules = list(DEFAULT_RULES if rules is None else rules)
+        self.max_rewrites = max_rewrites
+        self.hits: Counter = Counter()
+        self._by_type: dict = {}
+
+    def _rules_for(self, cls) -> list:
+        rules = self._by_type.get(cls)
+        if rules is None:
+            rules = self._by_type[cls] = [
+                r for r in self.rules if issubclass(cls, r.types)
+            ]
+        return rules
+
+    def run(self, tree: LogicTreeNode) -> LogicTreeNode:
+        memo: dict = {}
+        before = sum(self.hits.values())
+        result = self._rewrite(tree, memo)
+        log.debug(
+            "RewriteEngine: %d rewrites %s",
+            sum(self.hits.values()) - before,
+            dict(self.hits),
+        )
+        return result
+
+    def _rewrite(self, tree, memo):
+        return rewrite(
+            tree, lambda n: self._settle(n, memo), children=_gate_children, memo=memo
+        )
+
+    def _settle(self, node, memo):
+        for _ in range(self.max_rewrites):
+            new = None
+            for rule in self._rules_for(type(node)):
+                new = rule.apply(node)
+                if new is not None and new is not node:
+                    self.hits[rule.name] += 1
+                    break
+                new = None
+            if new is None:
+                memo[id(node)] = (node, node)  # settled: a fixpoint of every rule
+                return node
+            # Settle the replacement's new parts; settled parts are memo hits
+            hit = memo.get(id(new))
+            if hit is not None and hit[0] is new:
+                return hit[1]
+            node = new
+            kids = _gate_children(node)
+            new_kids = [self._rewrite(k, memo) for k in kids]
+            if any(a is not b for a, b in zip(kids, new_kids)):
+                node = type(node)(*new_kids)
+        raise RuntimeError(
+            f"RewriteEngine: no fixpoint after {self.max_rewrites} rewrites; "
+            "a rule is not simplifying"
+        )
+
+
+# === Rules ===
+
+
+def _const(node) -> Optional[int]:
+    if isinstance(node, LogicConst) and node.value in (0, 1):
+        return int(node.value)
+    return None
+
+
+def _key(node):
+    try:
+        return structural_hash(node)
+    except TypeError:  # nodes the hash does not cover: equal only to themselves
+        return ("id", id(node))
+
+
+def _complements(x, y) -> bool:
+    return (isinstance(y, NotOp) and _key(y.operand) == _key(x)) or (
+        isinstance(x, NotOp) and _key(x.operand) == _key(y)
+    )
+
+
+def _chain(node, cls) -> list:
+    """Operands of the `cls` chain rooted at `node`, left to right."""
+    leaves: list = []
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        if type(n) is cls and len(leaves) + len(stack) < CHAIN_LIMIT:
+            stack.extend(reversed(n.children))
+        else:
+            leaves.append(n)
+    return leaves
+
+
+def _build_chain(cls, leaves, identity: int):
+    if not leaves:
+        return LogicConst(identity)
+    return reduce(cls, leaves)
+
+
+def _constants(node):
+    if isinstance(node, NotOp):
+        v = _const(node.operand)
+        return None if v is None else LogicConst(1 - v)
+    a, b = node.children
+    va, vb = _const(a), _const(b)
+    if va is None and vb is None:
+        return None
+    if va is not None and vb is not None:
+        value = {
+            AndOp: va & vb,
+            OrOp: va | vb,
+            XorOp: va ^ vb,
+            XnorOp: 1 - (va ^ vb),
+            NandOp: 1 - (va & vb),
+            NorOp: 1 - (va | vb),
+        }[type(node)]
+        return LogicConst(value)
+    v, other = (va, b) if va is not None else (vb, a)
+    cls = type(node)
+    if cls is AndOp:
+        return other if v else LogicConst(0)
+    if cls is OrOp:
+        return LogicConst(1) if v else other
+    if cls is XorOp:
+        return NotOp(other) if v else other
+    if cls is XnorOp:
+        return other if v else NotOp(other)
+    if cls is NandOp:
+        return NotOp(other) if v else LogicConst(1)
+    return LogicConst(0) if v else NotOp(other)  # NorOp
+
+
+def _double_negation(node):
+    return node.operand.operand if isinstance(node.operand, NotOp) else None
+
+
+def _idempotence(node):
+    a, b = node.children
+    if _key(a) != _key(b):
+        return None
+    cls = type(node)
+    if cls in (AndOp, OrOp):
+        return a
+    if cls in (NandOp, NorOp):
+        return NotOp(a)
+    return LogicConst(0 if cls is XorOp else 1)
+
+
+def _complement(node):
+    a, b = node.children
+    if not _complements(a, b):
+        return None
+    return LogicConst(0 if type(node) in (AndOp, XnorOp, NorOp) else 1)
+
+
+def _flatten(node):
+    cls = type(node)
+    leaves = _chain(node, cls)
+    if len(leaves) <= 2:
+        return None  # two operands: the local rules above cover them
+    if cls is XorOp:
+        return _flatten_xor(leaves)
+    identity, absorbing = (1, 0) if cls is AndOp else (0, 1)
+    a, b = node.children
+    for chain, extra in ((a, b), (b, a)):
+        if type(chain) is cls and type(extra) is not cls:
+            # `chain` is settled: only `extra` can repeat or contradict it
+            rest = leaves[:-1] if chain is a else leaves[1:]
+            return _extend_chain(chain, extra, rest, absorbing)
+    seen: dict = {}
+    changed = False
+    for leaf in leaves:
+        v = _const(leaf)
+        if v == absorbing:
+            return LogicConst(absorbing)
+        k = None if v is not None else _key(leaf)
+        if v is not None or k in seen:
+            changed = True
+            continue
+        seen[k] = leaf
+    for leaf in seen.values():
+        if isinstance(leaf, NotOp) and _key(leaf.operand) in seen:
+            return LogicConst(absorbing)  # x & ~x / x | ~x
+    return _build_chain(cls, list(seen.values()), identity) if changed else None
+
+
+def _extend_chain(chain, extra, leaves, absorbing: int):
+    k = _key(extra)
+    keys = {_key(leaf) for leaf in leaves}
+    if k in keys:
+        return chain
+    if isinstance(extra, NotOp) and _key(extra.operand) in keys:
+        return LogicConst(absorbing)
+    for leaf in leaves:
+        if isinstance(leaf, NotOp) and _key(leaf.operand) == k:
+            return LogicConst(absorbing)
+    return None
+
+
+def _flatten_xor(leaves):
+    # x ^ x cancels, constants and inversions fold into the output polarity
+    invert = 0
+    counts: dict = {}
+    changed = False
+    for leaf in leaves:
+        v = _const(leaf)
+        if v is not None:
+            invert ^= v
+            changed = True
+            continue
+        if isinstance(leaf, NotOp):
+            invert ^= 1
+            leaf = leaf.operand
+        k = _key(leaf)
+        if k in counts:
+            changed = True
+            counts[k][1] += 1
+        else:
+            counts[k] = [leaf, 1]
+    if not changed:
+        return None
+    kept = [leaf for leaf, n in counts.values() if n % 2]
+    chain = _build_chain(XorOp, kept, 0)
+    return NotOp(chain) if invert else chain
+
+
+def _absorption(node):
+    # a | (a & b) -> a, a & (a | b) -> a, across whole chains
+    cls = type(node)
+    dual = OrOp if cls is AndOp else AndOp
+    leaves = _chain(node, cls)
+    if not any(isinstance(leaf, dual) for leaf in leaves):
+        return None
+    keys = {_key(leaf) for leaf in leaves}
+    kept = [
+        leaf
+        for leaf in leaves
+        if not (
+            isinstance(leaf, dual) and any(_key(x) in keys for x in _chain(leaf, dual))
+        )
+    ]
+    if len(kept) == len(leaves):
+        return None
+    return _build_chain(cls, kept, 1 if cls is AndOp else 0)
+
+
+def _de_morgan(node):
+    # ~a & ~b -> ~(a | b) (and the duals): inversions move to the output
+    a, b = node.children
+    if not (isinstance(a, NotOp) and isinstance(b, NotOp)):
+        return None
+    x, y = a.operand, b.operand
+    cls = type(node)
+    if cls is AndOp:
+        return NotOp(OrOp(x, y))
+    if cls is OrOp:
+        return NotOp(AndOp(x, y))
+    if cls is NandOp:
+        return OrOp(x, y)
+    if cls is NorOp:
+        return AndOp(x, y)
+    return None  # ~a ^ ~b is left to the XOR chain rules
+
+
+DEFAULT_RULES: Tuple[Rule, ...] = (
+    Rule("constants", _GATES, _constants),
+    Rule("double_negation", (NotOp,), _double_negation),
+    Rule("idempotence", _BINARY, _idempotence),
+    Rule("complement", _BINARY, _complement),
+    Rule("flatten", _CHAINS, _flatten),
+    Rule("absorption", (AndOp, OrOp), _absorption),
+    Rule("de_morgan", (AndOp, OrOp, NandOp, NorOp), _de_morgan),
+)
+
+
+__all__ = ["Rule", "RewriteEngine", "DEFAULT_RULES", "CHAIN_LIMIT"]
@@ -1,28 +1,144 @@
+"""
+Inlining of intermediate signals into the expressions that read them.
+
+A Module's signal_map maps each assigned signal to its defining expression;
+resolution replaces every LogicVar naming such a signal by the (resolved)
+definition. The walk is iterative and memoized per node, and a
+SignalResolver keeps that memo across calls: a signal read by many outputs,
+or many times through reconvergent wires, is resolved once, and every reader
+gets the same resolved subtree, so the outputs form one DAG instead of
+exponentially large copies.
+
+A signal whose definition reads itself, directly or through other signals,
+is a combinational loop and raises CombinationalLoopError with the signal
+path (e.g. a -> b -> a).
+
+Selects stay as they are: v[i] names the input bit "v[i]" for the BDD and
+AIG builders, whatever v is defined as.
+
+    resolver = SignalResolver(module.signal_map)
+    trees = {name: resolver.resolve(asg) for name, asg in module.assignments.items()}
+"""
+
 import logging
+from typing import List, Optional
 
 from logictree.nodes import ops
 from logictree.nodes.base import LogicTreeNode
+from logictree.nodes.selects import BitSelect, PartSelect
+from logictree.utils.traverse import children_of, fold, iter_preorder, rebuild_node
 
 log = logging.getLogger(__name__)
 
 
-def resolve_signal_vars(tree: LogicTreeNode, signal_map: dict) -> LogicTreeNode:
+class CombinationalLoopError(ValueError):
+    """A signal depends on itself; `path` lists the signals around the loop."""
+
+    def __init__(self, path: List[str]):
+        self.path = path
+        super().__init__(f"Cycle detected: combinational loop {' -> '.join(path)}")
+
+
+class SignalResolver:
     """
-    Recursively replaces LogicVar nodes with their corresponding tree in signal_map.
-    Returns a new tree with inlined signal definitions.
+    Resolves trees against one signal_map, sharing results between calls
+    (see the module docstring). The signal_map must not change while the
+    resolver is in use.
+
+    If a NodeFactory is given, rebuilt nodes are interned through it, so
+    resolved trees also share structurally equal subtrees.
     """
-    if isinstance(tree, ops.LogicVar):
-        if tree.name in signal_map:
-            resolved = resolve_signal_vars(signal_map[tree.name], signal_map)
-            return resolved
-        return tree
-    elif isinstance(tree, ops.LogicOp):
-        new_children = [
-            resolve_signal_vars(child, signal_map) for child in tree.children
+
+    def __init__(self, signal_map: dict, factory=None):
+        self.signal_map = signal_map
+        self.factory = factory
+        self._memo: dict = {}
+
+    def definition(self, var) -> Optional[LogicTreeNode]:
+        d = self.signal_map.get(var.name)
+        # Ports map to themselves: a var defined as itself is an input
+        if d is None or (isinstance(d, ops.LogicVar) and d.name == var.name):
+            return None
+        return d
+
+    def _children(self, node) -> tuple:
+        if isinstance(node, ops.LogicVar):
+            d = self.definition(node)
+            return () if d is None else (d,)
+        if isinstance(node, (BitSelect, PartSelect)):
+            return ()
+        return children_of(node)
+
+    def _visit(self, node, kids):
+        factory = self.factory
+        if isinstance(node, ops.LogicVar):
+            if kids:
+                return kids[0]
+            return factory.intern(node) if factory is not None else node
+        if factory is not None and isinstance(node, ops.LogicOp):
+            return factory.op(node.__class__, *kids)
+        if any(a is not b for a, b in zip(children_of(node), kids)):
+            node = rebuild_node(node, tuple(kids))
+        return factory.intern(node) if factory is not None else node
+
+    def resolve(self, tree: LogicTreeNode) -> LogicTreeNode:
+        """`tree` with every intermediate signal inlined."""
+        try:
+            return fold(tree, self._visit, self._children, self._memo)
+        except ValueError as e:
+            path = self.find_loop(tree)
+            if path is None:
+                raise
+            raise CombinationalLoopError(path) from e
+
+    def _reads(self, node) -> list:
+        """Signals with a definition that `node` reads, not looking through them."""
+
+        def children(n):
+            return () if isinstance(n, ops.LogicVar) else self._children(n)
+
+        return [
+            n.name
+            for n in iter_preorder(node, children)
+            if isinstance(n, ops.LogicVar) and self.definition(n) is not None
         ]
-        return tree.__class__(*new_children)
-    else:
-        return tree
+
+    def find_loop(self, tree: LogicTreeNode) -> Optional[List[str]]:
+        """Signal path of a combinational loop reachable from `tree`, or None."""
+        state: dict = {}  # name -> True while on the path, False when done
+        for start in self._reads(tree):
+            if start in state:
+                continue
+            path = [start]
+            state[start] = True
+            stack = [iter(self._reads(self.signal_map[start]))]
+            while stack:
+                name = next(stack[-1], None)
+                if name is None:
+                    state[path.pop()] = False
+                    stack.pop()
+                elif state.get(name) is True:
+                    return path[path.index(name) :] + [name]
+                elif name not in state:
+                    path.append(name)
+                    state[name] = True
+                    stack.append(iter(self._reads(self.signal_map[name])))
+        return None
+
+
+def resolve_signal_vars(
+    tree: LogicTreeNode, signal_map: dict, factory=None
+) -> LogicTreeNode:
+    """
+    Replaces LogicVar nodes with their corresponding tree in signal_map.
+    Returns a new tree with inlined signal definitions.
+
+    If a NodeFactory is given, rebuilt nodes are interned through it, so an
+    intermediate signal referenced several times is shared instead of copied.
+    To resolve several trees against the same signal_map, use one
+    SignalResolver so they share their resolved signals.
+    """
+    return SignalResolver(signal_map, factory).resolve(tree)
 
 
-__all__ = ["resolve_signal_vars"]
+__all__ = ["resolve_signal_vars", "SignalResolver", "CombinationalLoopError"]
@@ -1,10 +1,12 @@
 import hashlib
 import logging
-from typing import Dict
+import os
+from typing import Dict, List, Optional
 
 from dd.autoref import BDD
 
 from logictree.nodes.types import GATE_TYPES
+from logictree.utils.bdd_context import BDDContext
 from logictree.utils.build import _build_bdd
 from logictree.utils.display import _pretty_print_expr, to_symbolic_expr_str
 
@@ -12,16 +14,19 @@ log = logging.getLogger(__name__)
 
 
 def count_gate_type(tree, gate_name):
-    from logictree.nodes.base.base import LogicTreeNode
     from logictree.nodes.ops.ops import LogicOp
+    from logictree.utils.traverse import fold
 
-    if isinstance(tree, LogicOp):
-        return int(tree.name == gate_name) + sum(
-            count_gate_type(inp, gate_name) for inp in tree.inputs()
-        )
-    elif isinstance(tree, LogicTreeNode):
+    # Tree semantics: a shared subtree counts once per reference
+    def children(node):
+        return tuple(node.inputs()) if isinstance(node, LogicOp) else ()
+
+    def visit(node, counts):
+        if isinstance(node, LogicOp):
+            return int(node.name == gate_name) + sum(counts)
         return 0
-    return 0
+
+    return fold(tree, visit, children)
 
 
 # NEW: return the full breakdown as a dict
@@ -45,51 +50,102 @@ def _as_var_name(v) -> str:
     return getattr(v, "name", str(v))
 
 
-def get_logic_hash(tree, ordering=None, return_expr=False):
-    bdd = BDD()
-    var_map = {}
-
-    # Collect inputs (prefer an explicit API if your nodes provide it)
-    # inputs = tree.inputs() if hasattr(tree, "inputs") else (tree.children if hasattr(tree, "children") else [])
-
-    from logictree.utils.traverse import collect_logic_vars
+def get_logic_hash(tree, ordering=None, return_expr=False, ctx=None):
+    """
+    SHA256 of the canonical BDD expression of `tree`.
 
-    vars_ = sorted({v.name for v in collect_logic_vars(tree)})
-    log.info("Collected inputs: %s", vars_)
-
-    # Declare BDD vars as strings
-    for var in vars_:
-        bdd.declare(_as_var_name(var))
-
-    node = _build_bdd(tree, bdd, var_map)
-    expr = str(bdd.to_expr(node))
-    logic_hash = hashlib.sha256(expr.encode("utf-8")).hexdigest()
-    expr_str = to_symbolic_expr_str(tree)
+    Pass a BDDContext (see logictree.utils.bdd_context.get_bdd_context) to
+    share one manager and its memoized cones across many signals; without one
+    a private context is used.
+    """
+    ctx = ctx if ctx is not None else BDDContext()
+    logic_hash = ctx.hash(tree)
 
     if return_expr:
-        return logic_hash, expr_str
+        return logic_hash, to_symbolic_expr_str(tree)
     else:
         return logic_hash
 
 
-# TODO: Update explain_logic_hash to use collect_logic_vars helper method to initialize inputs in BDD
-def explain_logic_hash(tree, ordering=None):
-    bdd = BDD()
-    var_map = {}
+# Below this many distinct nodes in total, starting worker processes costs
+# more than building every cone in-process.
+PARALLEL_HASH_MIN_NODES = 5000
+
+
+def _cone_size(tree) -> int:
+    from logictree.utils.traverse import iter_postorder
+
+    return sum(1 for _ in iter_postorder(tree))
+
+
+def _hash_chunk(items: List[tuple]) -> List[tuple]:
+    # Runs in a worker process. One manager per chunk: cones shared between
+    # the chunk's signals survive pickling and are built once.
+    ctx = BDDContext()
+    try:
+        return [(name, ctx.hash(tree)) for name, tree in items]
+    finally:
+        ctx.close()
+
+
+def _chunk_by_cone_size(sizes: Dict[str, int], n: int) -> List[List[str]]:
+    # Largest cones first, each to the currently lightest chunk
+    chunks: List[List[str]] = [[] for _ in range(n)]
+    loads = [0] * n
+    for name in sorted(sizes, key=lambda k: -sizes[k]):
+        i = loads.index(min(loads))
+        chunks[i].append(name)
+        loads[i] += sizes[name]
+    return [c for c in chunks if c]
+
+
+def hash_signals(
+    signal_map: Dict[str, object],
+    jobs: Optional[int] = None,
+    ctx: Optional[BDDContext] = None,
+) -> Dict[str, str]:
+    """
+    get_logic_hash() of every signal in `signal_map`, in the map's order.
+
+    LogicAssign values are hashed by their rhs. With more than one job and
+    enough logic (PARALLEL_HASH_MIN_NODES), signals are split into `jobs`
+    chunks of similar total cone size and hashed by a process pool (default:
+    one worker per CPU); otherwise they are hashed in-process, in `ctx` if
+    given. Hashes are the same either way.
+    """
+    trees = {name: getattr(t, "rhs", t) for name, t in signal_map.items()}
+    sizes = {name: _cone_size(t) for name, t in trees.items()}
+    jobs = min(jobs or os.cpu_count() or 1, len(trees))
+    if jobs <= 1 or sum(sizes.values()) < PARALLEL_HASH_MIN_NODES:
+        ctx = ctx if ctx is not None else BDDContext()
+        return {name: ctx.hash(tree) for name, tree in trees.items()}
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunks = [
+        [(name, trees[name]) for name in chunk]
+        for chunk in _chunk_by_cone_size(sizes, jobs)
+    ]
+    log.debug("hash_signals: %d signals in %d chunks", len(trees), len(chunks))
+    with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+        hashes = dict(
+            pair for result in pool.map(_hash_chunk, chunks) for pair in result
+        )
+    return {name: hashes[name] for name in trees}
 
-    inputs = tree.inputs() if hasattr(tree, "inputs") else []
-    # vars_ = sorted({v.name for v in collect_logic_vars(tree)})
+
+def explain_logic_hash(tree, ordering=None, ctx=None):
     if ordering is not None:
-        inputs = ordering
+        # Explicit variable order: needs its own manager
+        bdd = BDD()
+        for var in ordering:
+            bdd.declare(_as_var_name(var))
+        node = _build_bdd(tree, bdd, {})
+        expr_str = str(bdd.to_expr(node))
     else:
-        # Best‐effort stable order by var name
-        inputs = sorted(inputs, key=_as_var_name)
-
-    for var in inputs:
-        bdd.declare(_as_var_name(var))
+        ctx = ctx if ctx is not None else BDDContext()
+        expr_str = ctx.expr(tree)
 
-    node = _build_bdd(tree, bdd, var_map)
-    expr_str = str(bdd.to_expr(node))
     hash_str = hashlib.sha256(expr_str.encode("utf-8")).hexdigest()
     _pretty_print_expr(expr_str)
     log.info("\nSHA256 Logic Hash:\n:%s", hash_str)
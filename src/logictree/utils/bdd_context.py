@@ -0,0 +1,98 @@
+"""
+Shared BDD manager for hashing and comparing many signals.
+
+A BDDContext owns one dd manager per module. Variables are kept in sorted
+name order, which is the same relative order get_logic_hash() has always
+used for a lone tree, so hashes computed in a shared context are identical
+to the standalone ones. Built functions are memoized per node identity:
+hashing every output of a module builds each shared cone once.
+
+Use get_bdd_context(module_name) for the session-wide context of a module,
+or BDDContext() for a private one.
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import logging
+
+from dd.autoref import BDD
+
+from logictree.utils.build import _build_bdd
+
+log = logging.getLogger(__name__)
+
+
+class BDDContext:
+    def __init__(self, name: str = ""):
+        self.name = name
+        self.bdd = BDD()
+        self.bdd.configure(reordering=False)  # order is managed explicitly
+        self._var_map: dict = {}
+        self._memo: dict = {}
+
+    def __repr__(self):
+        return (
+            f"BDDContext(name={self.name!r}, vars={len(self.bdd.vars)}, "
+            f"cached={len(self._memo)})"
+        )
+
+    def _restore_order(self) -> None:
+        levels = self.bdd.vars
+        names = sorted(levels)
+        if any(levels[v] != i for i, v in enumerate(names)):
+            log.debug("BDDContext %s: reordering %d vars", self.name, len(names))
+            self.bdd.reorder({v: i for i, v in enumerate(names)})
+
+    def declare(self, names) -> None:
+        """Declare variables up front (optional; build() declares lazily)."""
+        new = sorted(set(names) - set(self.bdd.vars))
+        if new:
+            self.bdd.declare(*new)
+            self._restore_order()
+
+    def build(self, tree):
+        """BDD function for `tree`, reusing any subtree already built here."""
+        fn = _build_bdd(tree, self.bdd, self._var_map, self._memo)
+        self._restore_order()
+        return fn
+
+    def expr(self, tree) -> str:
+        return str(self.bdd.to_expr(self.build(tree)))
+
+    def hash(self, tree) -> str:
+        return hashlib.sha256(self.expr(tree).encode("utf-8")).hexdigest()
+
+    def clear(self) -> None:
+        """Drop memoized functions (the manager and its variables are kept)."""
+        self._memo.clear()
+
+    def close(self) -> None:
+        """Release every function held by this context before the manager goes."""
+        self._memo.clear()
+        self._var_map.clear()
+
+
+_CONTEXTS: dict[str, BDDContext] = {}
+
+
+def get_bdd_context(module_name: str = "") -> BDDContext:
+    """Session-wide BDDContext for `module_name`, created on first use."""
+    ctx = _CONTEXTS.get(module_name)
+    if ctx is None:
+        ctx = _CONTEXTS[module_name] = BDDContext(module_name)
+    return ctx
+
+
+def clear_bdd_contexts() -> None:
+    for ctx in _CONTEXTS.values():
+        ctx.close()
+    _CONTEXTS.clear()
+
+
+# dd's manager complains if it is collected while functions still reference it
+atexit.register(clear_bdd_contexts)
+
+
+__all__ = ["BDDContext", "get_bdd_context", "clear_bdd_contexts"]
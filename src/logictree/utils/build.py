@@ -4,62 +4,152 @@ from logictree.nodes.base.base import LogicTreeNode
 from logictree.nodes.hole.hole import LogicHole
 
 
-def _build_bdd(tree: LogicTreeNode, bdd: BDD, var_map: dict) -> int:
+def _bdd_var(bdd: BDD, var_map: dict, name: str):
+    # Variables are declared on first use, so a shared manager can grow as
+    # new signals are hashed.
+    fn = var_map.get(name)
+    if fn is None:
+        if name not in bdd.vars:
+            bdd.declare(name)
+        fn = var_map[name] = bdd.var(name)
+    return fn
+
+
+def _bits(result) -> list:
+    """Bits of a child result, LSB first (scalar results are one bit wide)."""
+    return result if isinstance(result, list) else [result]
+
+
+def _scalar(node, result, bdd: BDD):
+    """A child result used as a single-bit operand."""
+    from logictree.nodes.ops.ops import LogicConst
+
+    if isinstance(node, LogicConst):
+        return bdd.true if node.value else bdd.false
+    if isinstance(result, list):
+        if len(result) != 1:
+            raise TypeError(f"Unsupported node type: {type(node)}")
+        return result[0]
+    return result
+
+
+def _bdd_children(tree) -> tuple:
+    from logictree.nodes.control.ifstatement import IfStatement
+    from logictree.nodes.ops.mux import LogicMux
+    from logictree.nodes.ops.ops import LogicOp
+    from logictree.nodes.selects import Concat
+
+    if isinstance(tree, LogicOp):
+        return tuple(tree.children)
+    if isinstance(tree, LogicMux):
+        return (tree.selector, tree.if_true, tree.if_false)
+    if isinstance(tree, IfStatement):
+        kids = (tree.cond, tree.then_branch, tree.else_branch)
+        return tuple(k for k in kids if k is not None)
+    if isinstance(tree, Concat):
+        return tuple(tree.parts)
+    return ()
+
+
+def _build_bdd(tree: LogicTreeNode, bdd: BDD, var_map: dict, memo=None) -> int:
+    """
+    Build the BDD of `tree` in `bdd`.
+
+    `memo` (id(node) -> (node, result)) lets callers that keep one manager
+    around reuse results for subtrees they have already built; see
+    logictree.utils.bdd_context. Multi-bit operands (constants, part selects,
+    concatenations) are carried as bit lists until a comparison consumes them.
+    """
+    from logictree.utils.traverse import fold
+
+    def visit(node, results):
+        return _build_bdd_node(node, results, bdd, var_map)
+
+    return _scalar(tree, fold(tree, visit, _bdd_children, memo), bdd)
+
+
+def _build_equal(results, bdd: BDD):
+    a = _bits(results[0])
+    b = _bits(results[1])
+    n = max(len(a), len(b))
+    a = a + [bdd.false] * (n - len(a))
+    b = b + [bdd.false] * (n - len(b))
+    result = bdd.true
+    for x, y in zip(a, b):
+        result &= ~bdd.apply("xor", x, y)
+    return result
+
+
+def _build_bdd_node(tree: LogicTreeNode, results: list, bdd: BDD, var_map: dict):
+    from logictree.nodes.control.ifstatement import IfStatement
+    from logictree.nodes.ops.mux import LogicMux
     from logictree.nodes.ops.ops import LogicConst, LogicOp, LogicVar
+    from logictree.nodes.selects import BitSelect, Concat, PartSelect
 
     if isinstance(tree, LogicConst):
-        return bdd.true if tree.value else bdd.false
+        v = int(tree.value)
+        return [bdd.true if (v >> i) & 1 else bdd.false for i in range(tree.width)]
 
     elif isinstance(tree, LogicVar):
-        # return bdd.var(tree.name)
-        name = tree.name
-        if name not in var_map:
-            var_map[name] = bdd.var(name)
-        return var_map[name]
+        return _bdd_var(bdd, var_map, tree.name)
+
+    elif isinstance(tree, BitSelect):
+        return _bdd_var(bdd, var_map, f"{tree.base.name}[{tree.index}]")
+
+    elif isinstance(tree, PartSelect):
+        step = 1 if tree.lsb <= tree.msb else -1
+        return [
+            _bdd_var(bdd, var_map, f"{tree.base.name}[{i}]")
+            for i in range(tree.lsb, tree.msb + step, step)
+        ]
+
+    elif isinstance(tree, Concat):
+        bits = []
+        # parts are MSB-first
+        for part, result in zip(reversed(tree.parts), reversed(results)):
+            w = getattr(part, "width", 1)
+            bits.extend((_bits(result) + [bdd.false] * w)[:w])
+        return bits
 
     elif isinstance(tree, LogicHole):
         # Treat symbolic holes as unique BDD variables
-        return bdd.var(tree.name)
+        return _bdd_var(bdd, var_map, tree.name)
+
+    kids = _bdd_children(tree)
+    if isinstance(tree, LogicOp) and tree.op in ("==", "!="):
+        eq = _build_equal(results, bdd)
+        return eq if tree.op == "==" else ~eq
+
+    children = [_scalar(k, r, bdd) for k, r in zip(kids, results)]
+
+    if isinstance(tree, LogicMux):
+        cond, a, b = children
+        return (cond & a) | (~cond & b)
+
+    elif isinstance(tree, IfStatement):
+        cond, t_branch = children[:2]
+        e_branch = children[2] if len(children) > 2 else bdd.false
+        return (cond & t_branch) | (~cond & e_branch)
 
     elif isinstance(tree, LogicOp):
         if tree.op == "NOT":
-            assert len(tree.children) == 1
-            return ~_build_bdd(tree.children[0], bdd, var_map)
+            assert len(children) == 1
+            return ~children[0]
         elif tree.op == "AND":
-            return bdd.apply(
-                "and", *[_build_bdd(c, bdd, var_map) for c in tree.children]
-            )
+            return bdd.apply("and", *children)
         elif tree.op == "OR":
-            return bdd.apply(
-                "or", *[_build_bdd(c, bdd, var_map) for c in tree.children]
-            )
+            return bdd.apply("or", *children)
         elif tree.op == "XOR":
-            return bdd.apply(
-                "xor", *[_build_bdd(c, bdd, var_map) for c in tree.children]
-            )
+            return bdd.apply("xor", *children)
         elif tree.op == "XNOR":
-            a, b = tree.children
-            return ~bdd.apply(
-                "xor", _build_bdd(a, bdd, var_map), _build_bdd(b, bdd, var_map)
-            )
-        elif tree.op == "MUX":
-            # Mux(cond, a, b) = (cond & a) | (~cond & b)
-            cond, a, b = (_build_bdd(c, bdd, var_map) for c in tree.children)
-            return bdd.apply(
-                "or",
-                bdd.apply("and", cond, a),
-                bdd.apply("and", bdd.apply("not", cond), b),
-            )
-        elif tree.op == "IF":
-            cond = _build_bdd(tree.children[0], bdd, var_map)
-            t_branch = _build_bdd(tree.children[1], bdd, var_map)
-            e_branch = _build_bdd(tree.children[2], bdd, var_map)
-            return (cond & t_branch) | (~cond & e_branch)
+            return ~bdd.apply("xor", *children)
+        elif tree.op == "NAND":
+            return ~bdd.apply("and", *children)
+        elif tree.op == "NOR":
+            return ~bdd.apply("or", *children)
         elif tree.op == "EQ":
-            a = _build_bdd(tree.children[0], bdd, var_map)
-            b = _build_bdd(tree.children[1], bdd, var_map)
+            a, b = children
             return (a & b) | (~a & ~b)
-            # Or: return ~(a ^ b)
         else:
             raise ValueError(f"Unknown logic operator: {tree.op}")
 
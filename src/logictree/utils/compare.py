@@ -1,34 +1,44 @@
 # from logictree.nodes import LogicOp, LogicVar, LogicConst, LogicHole, LogicNode, CaseStatement, CaseItem, IfStatement, LogicAssign
 # import hashlib
-import itertools
-
 from dd.autoref import BDD
 
 from logictree.nodes import base
 from logictree.utils.analysis import get_logic_hash
+from logictree.utils.bdd_context import BDDContext
 from logictree.utils.build import _build_bdd
+from logictree.utils.structural_hash import structural_hash
+from logictree.utils.truth_table import truth_tables_equal
 
 
 # === LOGICTREE COMPARISON ===
-def compare_logic_trees(tree1, tree2, method="auto", debug=False):
+def compare_logic_trees(tree1, tree2, method="auto", debug=False, ctx=None):
+    # hash and bdd checks share one manager (a module's BDDContext if given)
+    ctx = ctx if ctx is not None else BDDContext()
     if method == "structure":
         return _compare_structure(tree1, tree2)
     elif method == "eval":
         return _compare_truth_table(tree1, tree2)
     elif method == "bdd":
-        return _compare_bdd(tree1, tree2)
+        return _compare_bdd(tree1, tree2, ctx)
     elif method == "hash":
-        return get_logic_hash(tree1) == get_logic_hash(tree2)
+        return get_logic_hash(tree1, ctx=ctx) == get_logic_hash(tree2, ctx=ctx)
+    elif method == "structural_hash":
+        return structural_hash(tree1) == structural_hash(tree2)
     elif method == "auto":
+        # Linear-time tier first; a mismatch proves nothing, so fall through
+        if _compare_structural_hash(tree1, tree2):
+            if debug:
+                print("Structural hash matched.")
+            return True
         if _compare_structure(tree1, tree2):
             if debug:
                 print("Structure matched.")
             return True
-        if get_logic_hash(tree1) == get_logic_hash(tree2):
+        if get_logic_hash(tree1, ctx=ctx) == get_logic_hash(tree2, ctx=ctx):
             if debug:
                 print("Hash matched.")
             return True
-        if _compare_bdd(tree1, tree2):
+        if _compare_bdd(tree1, tree2, ctx):
             if debug:
                 print("BDD matched.")
             return True
@@ -37,6 +47,13 @@ def compare_logic_trees(tree1, tree2, method="auto", debug=False):
         raise ValueError(f"Unknown comparison method: {method}")
 
 
+def _compare_structural_hash(t1, t2):
+    try:
+        return structural_hash(t1) == structural_hash(t2)
+    except TypeError:  # e.g. case statements: leave it to the BDD
+        return False
+
+
 def _compare_structure(t1, t2):
     if t1.op != t2.op or len(t1.children) != len(t2.children):
         return False
@@ -44,25 +61,24 @@ def _compare_structure(t1, t2):
 
 
 def _compare_truth_table(t1, t2):
-    inputs = sorted(set(t1.inputs()) | set(t2.inputs()))
-    for assignment in itertools.product([False, True], repeat=len(inputs)):
-        env = dict(zip(inputs, assignment))
-        if t1.evaluate(env) != t2.evaluate(env):
-            return False
-    return True
+    # Exhaustive over the union of both input sets, as packed NumPy tables.
+    return truth_tables_equal(t1, t2)
 
 
-def _compare_bdd(t1, t2):
-    return to_bdd(t1) == to_bdd(t2)
+def _compare_bdd(t1, t2, ctx=None):
+    # Both trees must live in one manager for the functions to be comparable
+    ctx = ctx if ctx is not None else BDDContext()
+    return ctx.build(t1) == ctx.build(t2)
 
 
 # === BDD BACKEND ===
-def to_bdd(tree: base.LogicTreeNode, ordering=None) -> int:
-    # bdd = _bdd.BDD()
+def to_bdd(tree: base.LogicTreeNode, ordering=None, ctx=None) -> int:
+    if ordering is None:
+        ctx = ctx if ctx is not None else BDDContext()
+        return ctx.bdd, ctx.build(tree)
     bdd = BDD()
     var_map = {}
-    inputs = sorted(tree.operands) if ordering is None else ordering
-    for var in inputs:
+    for var in ordering:
         bdd.declare(var)
     root = _build_bdd(tree, bdd, var_map)
     return bdd, root
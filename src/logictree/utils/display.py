@@ -1,11 +1,7 @@
 import re
 
-import sympy as sympy
-from rich.console import Console
-from rich.text import Text
-from sympy.logic.boolalg import And, Not, Or
-
-import graphviz
+# sympy, rich and graphviz are imported by the functions that use them: they
+# dominate import time, and most callers (the lowerer, hashing) need none.
 
 
 def pretty_print(tree, indent=0):
@@ -74,6 +70,9 @@ def pretty_print(tree, indent=0):
 
 
 def _pretty_print_expr(expr_str):
+    from rich.console import Console
+    from rich.text import Text
+
     console = Console()
     tokens = re.findall(r"[\w\[\]]+|[~&|()!^]", expr_str)
     styled = Text()
@@ -113,6 +112,8 @@ def to_dot(tree, g=None, parent=None, node_id_gen=[0]):
     from logictree.nodes.ops.ops import LogicConst, LogicOp, LogicVar
 
     if g is None:
+        import graphviz
+
         g = graphviz.Digraph()
 
     my_id = f"n{node_id_gen[0]}"
@@ -165,10 +166,10 @@ def to_symbolic_expr_str(node):
         return "<?>"
 
 
-from sympy.logic.boolalg import BooleanFalse, BooleanTrue
-
-
 def to_sympy_expr(tree):
+    import sympy
+    from sympy.logic.boolalg import And, BooleanFalse, BooleanTrue, Not, Or
+
     from logictree.nodes.hole.hole import LogicHole
     from logictree.nodes.ops.ops import LogicConst, LogicOp, LogicVar
 
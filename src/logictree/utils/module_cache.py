@@ -0,0 +1,154 @@
+"""
+Persistent cache of lowered modules, keyed by source content.
+
+Lowering a file runs the ANTLR lexer/parser and SVToLogicTreeLowerer, which
+dominates CLI runtime on unchanged RTL. ModuleCache stores the resulting
+ModuleMap on disk so a later run over the same bytes skips the front end.
+
+Layout (default root: $LOGICTREE_CACHE_DIR/logictree, else
+$XDG_CACHE_HOME/logictree, else ~/.cache/logictree):
+
+    <root>/<tag>/<sha256 of source>.ltc
+
+`tag` combines the logictree version, a fingerprint of the generated
+grammar (the serialized ATNs of lexer and parser) and CACHE_FORMAT. A new
+release or regenerated grammar therefore looks in a fresh directory, and the
+stale ones are deleted the first time an entry is written. Only directories
+named like a tag are ever deleted, so anything else under the root is left
+alone. Entries are zlib-compressed pickles, written atomically; an
+unreadable entry is dropped and treated as a miss.
+
+Set LOGICTREE_NO_CACHE=1 to disable the default cache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+import re
+import shutil
+import tempfile
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+log = logging.getLogger(__name__)
+
+# Bump when the pickled representation of Module/LogicTreeNode changes
+CACHE_FORMAT = 3
+
+_SUFFIX = ".ltc"
+_TAG_RE = re.compile(r"v[^/\\]+-g[0-9a-f]+-f\d+")
+
+
+def default_cache_dir() -> Path:
+    # Always a dedicated subdirectory: the cache prunes what it owns
+    base = os.environ.get("LOGICTREE_CACHE_DIR") or os.environ.get("XDG_CACHE_HOME")
+    return (Path(base) if base else Path.home() / ".cache") / "logictree"
+
+
+@lru_cache(maxsize=None)
+def grammar_fingerprint() -> str:
+    """Short hash of the generated lexer and parser ATNs."""
+    from sv_parser import SystemVerilogSubsetLexer as lexer_mod
+    from sv_parser import SystemVerilogSubsetParser as parser_mod
+
+    h = hashlib.sha256()
+    for mod in (lexer_mod, parser_mod):
+        h.update(repr(mod.serializedATN()).encode())
+    return h.hexdigest()[:16]
+
+
+@lru_cache(maxsize=None)
+def logictree_version() -> str:
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("logictree")
+    except PackageNotFoundError:
+        return "0+unknown"
+
+
+class ModuleCache:
+    """On-disk ModuleMap cache; see module docstring."""
+
+    def __init__(self, root: Optional[os.PathLike] = None):
+        self.root = Path(root) if root is not None else default_cache_dir()
+        self.tag = f"v{logictree_version()}-g{grammar_fingerprint()}-f{CACHE_FORMAT}"
+        self.dir = self.root / self.tag
+        self._pruned = False
+
+    def __repr__(self):
+        return f"ModuleCache({str(self.dir)!r})"
+
+    @staticmethod
+    def key(source: bytes) -> str:
+        return hashlib.sha256(source).hexdigest()
+
+    def _path(self, source: bytes) -> Path:
+        return self.dir / f"{self.key(source)}{_SUFFIX}"
+
+    def get(self, source: bytes):
+        """The cached ModuleMap for these source bytes, or None."""
+        path = self._path(source)
+        try:
+            blob = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            return pickle.loads(zlib.decompress(blob))
+        except Exception as e:
+            log.warning("Dropping unreadable cache entry %s: %s", path, e)
+            path.unlink(missing_ok=True)
+            return None
+
+    def put(self, source: bytes, modules) -> bool:
+        """Store `modules` for these source bytes; False if it could not be."""
+        try:
+            blob = zlib.compress(pickle.dumps(modules, pickle.HIGHEST_PROTOCOL))
+        except (pickle.PicklingError, RecursionError, TypeError) as e:
+            log.debug("Not caching module map: %s", e)
+            return False
+        try:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            self._prune_stale()
+            fd, tmp = tempfile.mkstemp(dir=self.dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(blob)
+            os.replace(tmp, self._path(source))
+        except OSError as e:
+            log.warning("Could not write cache entry in %s: %s", self.dir, e)
+            return False
+        return True
+
+    def _tag_dirs(self):
+        try:
+            entries = list(self.root.iterdir())
+        except OSError:
+            return []
+        return [d for d in entries if d.is_dir() and _TAG_RE.fullmatch(d.name)]
+
+    def _prune_stale(self):
+        # Entries from other versions/grammars can never be hit again
+        if self._pruned:
+            return
+        self._pruned = True
+        for other in self._tag_dirs():
+            if other.name != self.tag:
+                log.info("Removing stale logictree cache %s", other)
+                shutil.rmtree(other, ignore_errors=True)
+
+    def clear(self):
+        """Delete every entry (all versions); the root itself is kept."""
+        for tag_dir in self._tag_dirs():
+            shutil.rmtree(tag_dir, ignore_errors=True)
+
+
+def get_default_cache() -> Optional[ModuleCache]:
+    """The default ModuleCache, or None when LOGICTREE_NO_CACHE is set."""
+    if os.environ.get("LOGICTREE_NO_CACHE", "").strip() not in ("", "0"):
+        return None
+    return ModuleCache()
@@ -1,13 +1,13 @@
+import heapq
+
 from .gate_factory import create_gate
 
 
 def balance_logic_tree(tree):
-    try:
-        balanced_children = [balance_logic_tree(child) for child in tree.children]
-        return balanced_tree_reduce(tree.op, balanced_children)
-    except AttributeError:
-        # Base case: leaf node without .children/.op
-        return tree
+    """Rebalance every associative chain in `tree` for minimum delay."""
+    from logictree.transforms.balance import balance_tree
+
+    return balance_tree(tree)
 
 
 def balanced_tree_reduce(op_name, inputs):
@@ -18,3 +18,29 @@ def balanced_tree_reduce(op_name, inputs):
     left = balanced_tree_reduce(op_name, inputs[:mid])
     right = balanced_tree_reduce(op_name, inputs[mid:])
     return create_gate(op_name, left, right)
+
+
+def _delay(node) -> int:
+    return getattr(node, "delay", 0) or 0
+
+
+def huffman_tree_reduce(op_name, inputs, arrival=_delay, root_op=None):
+    """
+    Builds a tree of LogicOps over the inputs that minimizes the arrival time
+    of its output: like Huffman coding, the two operands that arrive first
+    are combined first, each gate adding one unit of delay. `arrival(input)`
+    defaults to the input's `delay`; ties keep the input order. `root_op`
+    (e.g. NAND over an AND tree) is used for the output gate.
+    """
+    if len(inputs) == 1:
+        return inputs[0]
+    heap = [(arrival(x), i, x) for i, x in enumerate(inputs)]
+    heapq.heapify(heap)
+    seq = len(heap)
+    while True:
+        ta, _, a = heapq.heappop(heap)
+        tb, _, b = heapq.heappop(heap)
+        if not heap:
+            return create_gate(root_op or op_name, a, b)
+        heapq.heappush(heap, (max(ta, tb) + 1, seq, create_gate(op_name, a, b)))
+        seq += 1
@@ -3,6 +3,7 @@ import logging
 
 from logictree.nodes.control.assign import LogicAssign
 from logictree.utils.overlay import get_label
+from logictree.utils.traverse import fold
 
 log = logging.getLogger(__name__)
 
@@ -16,36 +17,50 @@ def logic_tree_to_json(tree):
         except Exception:
             return str(x)
 
-    def serialize_node(node):
+    def meta(node, children):
+        return {
+            "type": node.__class__.__name__,
+            "label": safe_label(node),
+            "depth": getattr(node, "depth", None),
+            "delay": getattr(node, "delay", None),
+            "expr_source": getattr(node, "expr_source", None),
+            "children": children,
+        }
+
+    # Nodes whose JSON children are serialized subtrees, in output order.
+    def json_children(node):
+        node_type = node.__class__.__name__
+        if node_type == "IfStatement":
+            return tuple(b for b in (node.then_branch, node.else_branch) if b)
+        if node_type == "FlattenedIfStatement":
+            kids = [node.then_branch, *(b for _, b in node.else_if_branches)]
+            if node.else_branch:
+                kids.append(node.else_branch)
+            return tuple(kids)
+        if node_type == "CaseStatement":
+            kids = [node.selector] if hasattr(node, "selector") else []
+            kids.extend(it.body for it in getattr(node, "items", []))
+            return tuple(kids)
+        if isinstance(node, LogicAssign):
+            return (node.rhs,) if node.rhs else ()
+        return tuple(c for c in getattr(node, "children", []) if c is not None)
+
+    def serialize_node(node, kids):
         node_type = node.__class__.__name__
+        kids = iter(kids)
 
         # Handle IfStatement
         if node_type == "IfStatement":
             children = []
             if node.then_branch:
                 children.append(
-                    {
-                        "type": "ThenBranch",
-                        "label": "then",
-                        "children": [serialize_node(node.then_branch)],
-                    }
+                    {"type": "ThenBranch", "label": "then", "children": [next(kids)]}
                 )
             if node.else_branch:
                 children.append(
-                    {
-                        "type": "ElseBranch",
-                        "label": "else",
-                        "children": [serialize_node(node.else_branch)],
-                    }
+                    {"type": "ElseBranch", "label": "else", "children": [next(kids)]}
                 )
-            return {
-                "type": node_type,
-                "label": safe_label(node),
-                "depth": getattr(node, "depth", None),
-                "delay": getattr(node, "delay", None),
-                "expr_source": getattr(node, "expr_source", None),
-                "children": children,
-            }
+            return meta(node, children)
 
         # Handle FlattenedIfStatement
         elif node_type == "FlattenedIfStatement":
@@ -54,15 +69,15 @@ def logic_tree_to_json(tree):
                 {
                     "type": "IfCondition",
                     "label": f"if({safe_label(node.cond)})",
-                    "children": [serialize_node(node.then_branch)],
+                    "children": [next(kids)],
                 }
             )
-            for cond, branch in node.else_if_branches:
+            for cond, _ in node.else_if_branches:
                 children.append(
                     {
                         "type": "ElseIfCondition",
                         "label": f"else if({safe_label(cond)})",
-                        "children": [serialize_node(branch)],
+                        "children": [next(kids)],
                     }
                 )
             if node.else_branch:
@@ -70,17 +85,10 @@ def logic_tree_to_json(tree):
                     {
                         "type": "ElseCondition",
                         "label": "else",
-                        "children": [serialize_node(node.else_branch)],
+                        "children": [next(kids)],
                     }
                 )
-            return {
-                "type": node_type,
-                "label": safe_label(node),
-                "depth": getattr(node, "depth", None),
-                "delay": getattr(node, "delay", None),
-                "expr_source": getattr(node, "expr_source", None),
-                "children": children,
-            }
+            return meta(node, children)
 
         # Handle CaseStatement
         elif node_type == "CaseStatement":
@@ -90,7 +98,7 @@ def logic_tree_to_json(tree):
                     {
                         "type": "Selector",
                         "label": f"selector = {safe_label(node.selector)}",
-                        "children": [serialize_node(node.selector)],
+                        "children": [next(kids)],
                     }
                 )
             for case_item in getattr(node, "items", []):
@@ -100,44 +108,25 @@ def logic_tree_to_json(tree):
                     {
                         "type": "CaseItem",
                         "label": f"case {case_label_str}",
-                        "children": [serialize_node(case_item.body)],
+                        "children": [next(kids)],
                     }
                 )
-            return {
-                "type": node_type,
-                "label": safe_label(node),
-                "depth": getattr(node, "depth", None),
-                "delay": getattr(node, "delay", None),
-                "expr_source": getattr(node, "expr_source", None),
-                "children": children,
-            }
+            return meta(node, children)
 
         # Handle LogicAssign
         elif isinstance(node, LogicAssign):
-            return {
-                "type": "LogicAssign",
-                "label": f"{node.lhs} = {safe_label(node.rhs)}",
-                "depth": getattr(node, "depth", None),
-                "delay": getattr(node, "delay", None),
-                "expr_source": getattr(node, "expr_source", None),
-                "children": [serialize_node(node.rhs)] if node.rhs else [],
-            }
+            data = meta(node, list(kids))
+            data["type"] = "LogicAssign"
+            data["label"] = f"{node.lhs} = {safe_label(node.rhs)}"
+            return data
 
         # Fallback serialization
-        return {
-            "type": node_type,
-            "label": safe_label(node),
-            "depth": getattr(node, "depth", None),
-            "delay": getattr(node, "delay", None),
-            "expr_source": getattr(node, "expr_source", None),
-            "children": [
-                serialize_node(child)
-                for child in getattr(node, "children", [])
-                if child is not None
-            ],
-        }
+        return meta(node, list(kids))
+
+    json_data = fold(tree, serialize_node, json_children)
 
-    json_data = serialize_node(tree)
+    if not log.isEnabledFor(logging.INFO):
+        return json_data
 
     try:
         log.info("Serialize JSON: %s", json.dumps(json_data, indent=2))
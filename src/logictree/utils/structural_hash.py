@@ -0,0 +1,251 @@
+"""
+Canonical structural (Merkle) hash of a LogicTree, without a BDD.
+
+get_logic_hash() canonicalizes through a BDD, which is exact but can blow up
+exponentially (multipliers, XOR-heavy logic). structural_hash() is linear in
+the number of distinct nodes instead. Each node's digest is computed from
+its children's digests after a few cheap, semantics-preserving
+normalizations:
+
+  * operands of the COMMUTATIVE_OPS are order-insensitive, and nested
+    chains of the same associative op are flattened: a & (c & b) and
+    (b & a) & c hash alike
+  * NAND/NOR/XNOR are the negated AND/OR/XOR, double negations cancel, and
+    inversions on XOR operands are moved to the XOR's output
+  * constants are folded (x & 0 -> 0, x | 0 -> x, x ^ 1 -> ~x, a mux with
+    a constant selector picks its branch, mux(~s, a, b) -> mux(s, b, a))
+
+Constant folding and chain flattening only apply to gates whose operands
+are all one bit wide: on a vector, x & 1 keeps only bit 0 of x. Wider gates
+keep their constants and hash as opaque (still order-insensitive) leaves.
+  * a bit select a[i] hashes like the variable "a[i]", as in the BDD
+
+Equal hashes mean equal functions (up to SHA-256 collisions); different
+hashes mean nothing, since e.g. absorption or De Morgan is not applied.
+That makes it the cheap first tier of compare_logic_trees(method="auto")
+and of golden checks, with the BDD hash as the exact fallback.
+
+The normalized form of every gate and mux, with its width, is cached on the
+node (the `_shash_cache` slot), so re-hashing a shared or already hashed cone
+is O(1).
+"""
+
+from __future__ import annotations
+
+import hashlib
+from functools import lru_cache
+
+from logictree.nodes.control.assign import LogicAssign
+from logictree.nodes.control.ifstatement import IfStatement
+from logictree.nodes.hole.hole import LogicHole
+from logictree.nodes.ops.mux import LogicMux
+from logictree.nodes.ops.ops import LogicConst, LogicOp, LogicVar
+from logictree.nodes.selects import BitSelect, Concat, PartSelect
+from logictree.utils.traverse import fold
+
+# Normalized forms (the cache holds (form, width) pairs):
+#   ("K", v)                    constant 0/1
+#   ("L", neg, digest)          anything else, possibly inverted
+#   (op, neg, acc, count, digest)
+#                               flattened AND/OR/XOR of `count` 1-bit operands;
+#                               acc is the sum of their digests mod 2**256
+# The last item of the non-constant forms is the digest of the uninverted
+# form.
+# Summing operand digests makes the hash order-insensitive and lets a
+# nested chain be spliced into its parent in O(1).
+_MOD = 1 << 256
+
+# op -> (flattened op, inverted output)
+_AC_OPS = {
+    "AND": ("AND", False),
+    "OR": ("OR", False),
+    "XOR": ("XOR", False),
+    "NAND": ("AND", True),
+    "NOR": ("OR", True),
+    "XNOR": ("XOR", True),
+}
+# flattened op -> (identity, absorbing constant)
+_UNITS = {"AND": (1, 0), "OR": (0, 1), "XOR": (0, None)}
+
+
+def _h(*parts) -> bytes:
+    h = hashlib.sha256()
+    for p in parts:
+        if isinstance(p, str):
+            p = p.encode("utf-8")
+        h.update(len(p).to_bytes(4, "little"))
+        h.update(p)
+    return h.digest()
+
+
+_CONST_DIGESTS = (_h("K", "0"), _h("K", "1"))
+
+
+def _digest(form) -> bytes:
+    if form[0] == "K":
+        return _CONST_DIGESTS[form[1]]
+    d = form[-1]
+    return _h("!", d) if form[1] else d
+
+
+def _negate(form):
+    if form[0] == "K":
+        return ("K", 1 - form[1])
+    return (form[0], not form[1]) + form[2:]
+
+
+def _leaf(*parts):
+    return ("L", False, _h(*parts))
+
+
+@lru_cache(maxsize=1 << 16)
+def _var(name: str):
+    return _leaf("V", name)
+
+
+def _ac(op: str, forms, narrow: bool = True):
+    if not narrow:
+        return _wide_ac(op, forms)
+    identity, absorbing = _UNITS[op]
+    acc = count = 0
+    invert = False
+    sole = None
+    for f in forms:
+        if f[0] == "K":
+            if op == "XOR":
+                invert ^= bool(f[1])
+            elif f[1] == absorbing:
+                return ("K", absorbing)
+            continue
+        if f[0] == op and (op == "XOR" or not f[1]):
+            # nested chain of the same op: splice its operands in
+            acc += f[2]
+            count += f[3]
+            invert ^= f[1]
+            continue
+        if op == "XOR" and f[1]:
+            f = _negate(f)
+            invert = not invert
+        acc += int.from_bytes(_digest(f), "little")
+        count += 1
+        sole = f
+    if count == 0:
+        form = ("K", identity)
+    elif count == 1:
+        form = sole  # spliced chains contribute at least two operands
+    else:
+        acc %= _MOD
+        form = (op, False, acc, count, _h(op, acc.to_bytes(32, "little"), str(count)))
+    return _negate(form) if invert else form
+
+
+def _wide_ac(op: str, forms):
+    # Bitwise on vectors: no folding, and a leaf so no parent splices it in
+    acc = sum(int.from_bytes(_digest(f), "little") for f in forms) % _MOD
+    return _leaf(op, "W", acc.to_bytes(32, "little"), str(len(forms)))
+
+
+def _mux(sel, if_true, if_false):
+    if sel[0] == "K":
+        return if_true if sel[1] else if_false
+    if sel[1]:
+        sel, if_true, if_false = _negate(sel), if_false, if_true
+    dt, df = _digest(if_true), _digest(if_false)
+    if dt == df:
+        return if_true
+    return _leaf("MUX", _digest(sel), dt, df)
+
+
+def _select_base(node):
+    return () if isinstance(node.base, LogicVar) else (node.base,)
+
+
+def _children(node) -> tuple:
+    if getattr(node, "_shash_cache", None) is not None:
+        return ()
+    if isinstance(node, LogicOp):
+        return tuple(node.children)
+    if isinstance(node, LogicMux):
+        return (node.selector, node.if_true, node.if_false)
+    if isinstance(node, IfStatement):
+        kids = (node.cond, node.then_branch, node.else_branch)
+        return tuple(k for k in kids if k is not None)
+    if isinstance(node, LogicAssign):
+        return (node.rhs,)
+    if isinstance(node, Concat):
+        return tuple(node.parts)
+    if isinstance(node, (BitSelect, PartSelect)):
+        return _select_base(node)
+    return ()
+
+
+def _visit(node, kids: list):
+    # kids and the result are (form, width) pairs; widths follow evaluate()
+    cached = getattr(node, "_shash_cache", None)
+    if cached is not None:
+        return cached
+    forms = [k[0] for k in kids]
+    width = max((k[1] for k in kids), default=1)
+
+    if isinstance(node, LogicOp):
+        op = node.op
+        if op in _AC_OPS:
+            flat_op, invert = _AC_OPS[op]
+            form = _ac(flat_op, forms, narrow=width == 1)
+            form = _negate(form) if invert else form
+        elif op == "NOT":
+            form = _negate(forms[0])
+        elif op in ("==", "!="):
+            form = ("L", op == "!=", _h("==", *(_digest(k) for k in forms)))
+            width = 1
+        else:
+            raise TypeError(f"structural_hash(): unsupported operator {op!r}")
+        node._shash_cache = (form, width)
+        return node._shash_cache
+
+    if isinstance(node, LogicMux):
+        result = (_mux(*forms), max(kids[1][1], kids[2][1]))
+        object.__setattr__(node, "_shash_cache", result)
+        return result
+
+    if isinstance(node, LogicConst):
+        v = int(node.value)
+        form = ("K", v) if v in (0, 1) else _leaf("C", str(v), str(node.width))
+        return form, node.width or 1
+    if isinstance(node, (LogicVar, LogicHole)):
+        return _var(node.name), 1
+    if isinstance(node, BitSelect):
+        if not kids:
+            return _var(f"{node.base.name}[{node.index}]"), 1
+        return _leaf("BIT", _digest(forms[0]), str(node.index)), 1
+    if isinstance(node, PartSelect):
+        base = node.base.name if not kids else _digest(forms[0])
+        return _leaf("PART", base, str(node.msb), str(node.lsb)), node.width
+    if isinstance(node, Concat):
+        widths = (str(getattr(p, "width", 1)) for p in node.parts)
+        cat = (x for w, k in zip(widths, forms) for x in (w, _digest(k)))
+        return _leaf("CAT", *cat), node.width
+    if isinstance(node, IfStatement):
+        else_kid = kids[2] if len(kids) > 2 else (("K", 0), 1)
+        return _mux(forms[0], forms[1], else_kid[0]), max(kids[1][1], else_kid[1])
+    if isinstance(node, LogicAssign):
+        return kids[0]
+    raise TypeError(f"structural_hash(): unsupported node type {type(node).__name__}")
+
+
+def structural_hash(tree) -> str:
+    """
+    Hex SHA-256 of the normalized structure of `tree` (see module docstring).
+
+    Linear in the number of distinct nodes; raises TypeError for nodes it
+    cannot hash (e.g. case statements, which should be lowered first).
+    """
+    result = getattr(tree, "_shash_cache", None)
+    if result is None:
+        if type(tree) is LogicVar:
+            return _digest(_var(tree.name)).hex()
+        result = fold(tree, _visit, _children)
+    return _digest(result[0]).hex()
+
+
+__all__ = ["structural_hash"]
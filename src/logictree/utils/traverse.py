@@ -1,10 +1,193 @@
+"""
+Iterative traversal helpers shared by the IR passes.
+
+Every walk here uses an explicit stack, so depth is bounded by memory rather
+than by Python's recursion limit: a left-deep 100k-input AND chain is fine.
+Shared subtrees (DAGs from NodeFactory or signal resolution) are visited once
+per walk; results are memoized per node identity.
+
+  * children_of(node): structural children of an expression/statement node
+  * iter_preorder / iter_postorder: yield each distinct reachable node once
+  * fold(root, visit): bottom-up evaluation, visit(node, child_results)
+  * rewrite(root, visit): bottom-up rebuild, visit(node_with_new_children)
+
+Passes that need a different notion of "children" (e.g. only descending
+through gates) pass their own `children` callable. A node reached again while
+it is still being expanded means the structure is cyclic; that raises
+ValueError.
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Callable, Iterator, Optional
+
+from logictree.nodes.control.assign import LogicAssign
+from logictree.nodes.control.case import CaseStatement
+from logictree.nodes.control.ifstatement import IfStatement
+from logictree.nodes.ops.mux import LogicMux
 from logictree.nodes.ops.ops import LogicOp, LogicVar
+from logictree.nodes.selects import BitSelect, Concat, PartSelect
 
+_OPEN = object()
 
-def collect_logic_vars(node):
-    """Yield all LogicVar nodes inside a tree."""
-    if isinstance(node, LogicVar):
+
+def children_of(node) -> tuple:
+    """Structural children of `node` (missing optional branches are skipped)."""
+    if isinstance(node, LogicOp):
+        return tuple(node.children)
+    if isinstance(node, LogicMux):
+        return (node.selector, node.if_true, node.if_false)
+    if isinstance(node, (BitSelect, PartSelect)):
+        return (node.base,)
+    if isinstance(node, Concat):
+        return tuple(node.parts)
+    if isinstance(node, IfStatement):
+        kids = (node.cond, node.then_branch, node.else_branch)
+        return tuple(k for k in kids if k is not None)
+    if isinstance(node, LogicAssign):
+        return (node.rhs,)
+    if isinstance(node, CaseStatement):
+        return (node.selector, *(it.body for it in node.items))
+    return ()
+
+
+def rebuild_node(node, kids: tuple):
+    """A copy of `node` over new children, in the order children_of() returns."""
+    if isinstance(node, LogicOp):
+        return type(node)(*kids)
+    if isinstance(node, LogicMux):
+        return LogicMux(*kids)
+    if isinstance(node, BitSelect):
+        return BitSelect(kids[0], node.index)
+    if isinstance(node, PartSelect):
+        return PartSelect(kids[0], node.msb, node.lsb)
+    if isinstance(node, Concat):
+        return Concat(list(kids))
+    if isinstance(node, IfStatement):
+        return IfStatement(kids[0], kids[1], kids[2] if len(kids) > 2 else None)
+    if isinstance(node, LogicAssign):
+        return LogicAssign(lhs=node.lhs, rhs=kids[0])
+    if isinstance(node, CaseStatement):
+        items = [replace(it, body=body) for it, body in zip(node.items, kids[1:])]
+        return replace(node, selector=kids[0], items=items)
+    raise TypeError(f"rebuild_node(): cannot rebuild {type(node).__name__}")
+
+
+def _cycle(node):
+    return ValueError(f"Cycle detected while traversing at {node!r}")
+
+
+def iter_postorder(root, children: Callable = children_of) -> Iterator:
+    """Yield each distinct node reachable from `root`, children first."""
+    state: dict[int, object] = {}
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            state[id(node)] = True
+            yield node
+            continue
+        seen = state.get(id(node))
+        if seen is True:
+            continue
+        if seen is _OPEN:
+            raise _cycle(node)
+        state[id(node)] = _OPEN
+        stack.append((node, True))
+        for k in reversed(children(node)):
+            s = state.get(id(k))
+            if s is _OPEN:
+                raise _cycle(k)
+            if s is None:
+                stack.append((k, False))
+
+
+def iter_preorder(root, children: Callable = children_of) -> Iterator:
+    """Yield each distinct node reachable from `root`, parents first."""
+    seen = {id(root)}
+    stack = [root]
+    while stack:
+        node = stack.pop()
         yield node
-    elif isinstance(node, LogicOp):
-        for child in node.children:
-            yield from collect_logic_vars(child)
+        for k in reversed(children(node)):
+            if id(k) not in seen:
+                seen.add(id(k))
+                stack.append(k)
+
+
+def fold(
+    root,
+    visit: Callable,
+    children: Callable = children_of,
+    memo: Optional[dict] = None,
+):
+    """
+    Bottom-up evaluation: returns visit(root, [results of children(root)]).
+
+    visit runs once per distinct node. `memo` maps id(node) -> (node, result)
+    and may be shared across calls to reuse results between walks.
+    """
+    memo = {} if memo is None else memo
+
+    def cached(node):
+        hit = memo.get(id(node))
+        return hit is not None and hit[0] is node
+
+    if cached(root):
+        return memo[id(root)][1]
+
+    open_ids: set[int] = set()
+    stack = [(root, None)]
+    while stack:
+        node, kids = stack.pop()
+        if kids is not None:
+            open_ids.discard(id(node))
+            memo[id(node)] = (node, visit(node, [memo[id(k)][1] for k in kids]))
+            continue
+        if cached(node):
+            continue
+        if id(node) in open_ids:
+            raise _cycle(node)
+        open_ids.add(id(node))
+        kids = tuple(children(node))
+        stack.append((node, kids))
+        for k in reversed(kids):
+            if id(k) in open_ids:
+                raise _cycle(k)
+            if not cached(k):
+                stack.append((k, None))
+    return memo[id(root)][1]
+
+
+def rewrite(
+    root,
+    visit: Optional[Callable] = None,
+    children: Callable = children_of,
+    rebuild: Callable = rebuild_node,
+    memo: Optional[dict] = None,
+):
+    """
+    Bottom-up rebuild. Each node is rebuilt over its rewritten children (or
+    kept as-is when none changed) and then handed to `visit`, whose return
+    value replaces it.
+    """
+
+    def step(node, new_kids):
+        old_kids = children(node)
+        if any(a is not b for a, b in zip(old_kids, new_kids)):
+            node = rebuild(node, tuple(new_kids))
+        return visit(node) if visit is not None else node
+
+    return fold(root, step, children, memo)
+
+
+def _gate_children(node) -> tuple:
+    return tuple(node.children) if isinstance(node, LogicOp) else ()
+
+
+def collect_logic_vars(node):
+    """Yield all LogicVar nodes inside a tree (each distinct node once)."""
+    for n in iter_preorder(node, _gate_children):
+        if isinstance(n, LogicVar):
+            yield n
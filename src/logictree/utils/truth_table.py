@@ -0,0 +1,136 @@
+"""
+Exhaustive truth tables as packed NumPy bit arrays.
+
+A TruthTable over n inputs holds the value of a tree for all 2^n minterms.
+Each output bit is one "plane": a uint64 array whose bit k of word j is the
+output for minterm 64*j + k. Input i of minterm m is (m >> i) & 1, i.e.
+inputs[0] is the least significant bit of the minterm index.
+
+The table is produced by running the straight-line code from
+logictree.eval.compile_tree() once over whole arrays, so every gate costs a
+single NumPy bitwise op across all minterms.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from logictree.eval import CompiledTree, compile_tree
+
+DEFAULT_MAX_INPUTS = 26
+
+_WORD_BITS = 64
+_ALL_ONES = np.uint64(0xFFFFFFFFFFFFFFFF)
+# Input i < 6 toggles inside a word with period 2^(i+1).
+_IN_WORD_PATTERNS = (
+    0xAAAAAAAAAAAAAAAA,
+    0xCCCCCCCCCCCCCCCC,
+    0xF0F0F0F0F0F0F0F0,
+    0xFF00FF00FF00FF00,
+    0xFFFF0000FFFF0000,
+    0xFFFFFFFF00000000,
+)
+
+
+class TruthTable:
+    """Packed exhaustive truth table; see module docstring for the layout."""
+
+    def __init__(self, inputs, planes):
+        self.inputs = tuple(inputs)
+        self.planes = tuple(planes)  # LSB first, one uint64 array per bit
+
+    def __repr__(self):
+        return f"TruthTable(inputs={len(self.inputs)}, width={self.width})"
+
+    @property
+    def width(self) -> int:
+        return len(self.planes)
+
+    @property
+    def num_minterms(self) -> int:
+        return 1 << len(self.inputs)
+
+    def value(self, minterm: int) -> int:
+        """Output value for one minterm."""
+        word, bit = divmod(minterm, _WORD_BITS)
+        return sum(
+            ((int(plane[word]) >> bit) & 1) << i for i, plane in enumerate(self.planes)
+        )
+
+    def count_ones(self, plane: int = 0) -> int:
+        """Number of minterms for which output bit `plane` is 1."""
+        return int(np.unpackbits(self.planes[plane].view(np.uint8)).sum())
+
+    def __eq__(self, other):
+        if not isinstance(other, TruthTable):
+            return NotImplemented
+        if self.inputs != other.inputs:
+            return False
+        zero = np.zeros_like(self.planes[0]) if self.planes else None
+        n = max(self.width, other.width)
+        for i in range(n):
+            a = self.planes[i] if i < self.width else zero
+            b = other.planes[i] if i < other.width else zero
+            if not np.array_equal(a, b):
+                return False
+        return True
+
+    __hash__ = None
+
+
+def _input_words(n):
+    """Packed minterm patterns for n inputs, plus the live-bit mask."""
+    n_words = max(1, (1 << n) // _WORD_BITS)
+    if n < 6:
+        mask = np.full(n_words, (1 << (1 << n)) - 1, dtype=np.uint64)
+    else:
+        mask = np.full(n_words, _ALL_ONES, dtype=np.uint64)
+    words = []
+    word_index = np.arange(n_words, dtype=np.uint64)
+    for i in range(n):
+        if i < 6:
+            w = np.full(n_words, _IN_WORD_PATTERNS[i], dtype=np.uint64)
+        else:
+            bit = (word_index >> np.uint64(i - 6)) & np.uint64(1)
+            w = bit * _ALL_ONES
+        words.append(w & mask)
+    return words, mask
+
+
+def truth_table(tree, inputs=None, max_inputs=DEFAULT_MAX_INPUTS) -> TruthTable:
+    """
+    Build the exhaustive truth table of `tree` (or of an already compiled
+    CompiledTree).
+
+    `inputs` fixes the variable order and may include names the tree does not
+    read (useful for comparing two trees over a common input set); it defaults
+    to the tree's own inputs, sorted. Input names follow evaluate(): plain
+    signal names and "base[i]" for selected bits.
+    """
+    compiled = tree if isinstance(tree, CompiledTree) else compile_tree(tree)
+    inputs = tuple(compiled.inputs if inputs is None else inputs)
+    missing = set(compiled.inputs) - set(inputs)
+    if missing:
+        raise ValueError(f"truth_table(): inputs missing {sorted(missing)}")
+    if len(inputs) > max_inputs:
+        raise ValueError(
+            f"truth_table(): {len(inputs)} inputs exceeds max_inputs={max_inputs}"
+        )
+
+    words, mask = _input_words(len(inputs))
+    env = dict(zip(inputs, words))
+    planes = [
+        np.broadcast_to(np.asarray(p, dtype=np.uint64), mask.shape) & mask
+        for p in compiled.run(env, mask)
+    ]
+    return TruthTable(inputs, planes)
+
+
+def truth_tables_equal(t1, t2, max_inputs=DEFAULT_MAX_INPUTS) -> bool:
+    """Exhaustive equivalence of two trees over the union of their inputs."""
+    c1, c2 = compile_tree(t1), compile_tree(t2)
+    inputs = sorted(set(c1.inputs) | set(c2.inputs))
+    return truth_table(c1, inputs, max_inputs) == truth_table(c2, inputs, max_inputs)
+
+
+__all__ = ["TruthTable", "truth_table", "truth_tables_equal"]
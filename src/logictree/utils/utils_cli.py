@@ -1,18 +1,65 @@
 import json
 import os
 
+from logictree.utils.structural_hash import structural_hash
 
-def write_golden_file(path, name, logic_hash, expr_str, inputs_flat, inputs_decl):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
+GOLDEN_DIR = "golden_hashes"
+
+
+def golden_path(name, golden_dir=GOLDEN_DIR):
+    return os.path.join(golden_dir, f"{name}.json")
+
+
+def write_golden_file(
+    path, name, logic_hash, expr_str, inputs_flat, inputs_decl, shash=None
+):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
     data = {
         "name": name,
         "hash": logic_hash,
         "expr": expr_str,
         "inputs": {"flat": sorted(inputs_flat), "decl": inputs_decl or []},
     }
+    if shash is not None:
+        data["structural_hash"] = shash
     with open(path, "w") as f:
         json.dump(data, f, indent=2)
 
 
-def check_against_golden(name, tree):
-    pass
+def save_golden(name, tree, path=None):
+    """Write the golden file of `tree`: BDD hash, structural hash and inputs."""
+    from logictree.utils.analysis import get_logic_hash
+    from logictree.utils.traverse import collect_logic_vars
+
+    path = path or golden_path(name)
+    logic_hash, expr_str = get_logic_hash(tree, return_expr=True)
+    inputs = {v.name for v in collect_logic_vars(tree)}
+    try:
+        shash = structural_hash(tree)
+    except TypeError:
+        shash = None
+    write_golden_file(path, name, logic_hash, expr_str, inputs, [], shash=shash)
+    return path
+
+
+def check_against_golden(name, tree, path=None):
+    """
+    True if `tree` matches its golden file.
+
+    The structural hash is checked first; only when it is missing or differs
+    (an equivalent but differently structured tree) is the BDD hash computed.
+    """
+    with open(path or golden_path(name)) as f:
+        data = json.load(f)
+    expected = data.get("structural_hash")
+    if expected is not None:
+        try:
+            if structural_hash(tree) == expected:
+                return True
+        except TypeError:
+            pass
+    if "hash" not in data:
+        return False
+    from logictree.utils.analysis import get_logic_hash
+
+    return get_logic_hash(tree) == data["hash"]
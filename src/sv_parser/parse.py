@@ -1,25 +1,102 @@
+"""
+Front door to the generated SystemVerilogSubset parser.
+
+Parsing defaults to ANTLR's two-stage strategy: the file is first parsed
+with SLL prediction and a bail-out error strategy, which is much cheaper on
+the left-recursive expression rules. Only if that stage hits a syntax error
+(a real one, or one SLL cannot resolve) is the token stream rewound and
+re-parsed with full LL prediction and the default error reporting/recovery,
+so diagnostics are the same as a plain LL parse. mode="ll" skips the first
+stage.
+
+Pass a list as `timings` to receive one ParseTiming per parse.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
 from antlr4 import CommonTokenStream, FileStream, InputStream
+from antlr4.atn.PredictionMode import PredictionMode
+from antlr4.error.ErrorListener import ConsoleErrorListener
+from antlr4.error.Errors import ParseCancellationException
+from antlr4.error.ErrorStrategy import BailErrorStrategy, DefaultErrorStrategy
 
 from sv_parser.SystemVerilogSubsetLexer import SystemVerilogSubsetLexer
 from sv_parser.SystemVerilogSubsetParser import SystemVerilogSubsetParser
 
+log = logging.getLogger(__name__)
 
-def parse_sv_file(path: str):
-    """Parse a SystemVerilog file into an ANTLR parse tree (compilation_unit)."""
-    input_stream = FileStream(path)
-    lexer = SystemVerilogSubsetLexer(input_stream)
-    tokens = CommonTokenStream(lexer)
-    parser = SystemVerilogSubsetParser(tokens)
-    return parser.compilation_unit()
+PARSE_MODES = ("two_stage", "ll")
+
+
+@dataclass
+class ParseTiming:
+    """Wall time spent lexing and parsing one source."""
+
+    source: str
+    seconds: float
+    mode: str  # "SLL", "LL" (two_stage fell back, or mode="ll"), "cached", "fast"
+    tokens: int = 0
 
 
-def parse_sv_text(src: str):
-    """Parse SystemVerilog source text into an ANTLR parse tree (compilation_unit)."""
-    input_stream = InputStream(src)
+def _parse(
+    input_stream, source: str, mode: str, timings: Optional[List], line: int = 1
+):
+    if mode not in PARSE_MODES:
+        raise ValueError(f"Unknown parse mode {mode!r}; expected one of {PARSE_MODES}")
+
+    t0 = time.perf_counter()
     lexer = SystemVerilogSubsetLexer(input_stream)
+    lexer.line = line  # so diagnostics for a slice point into the whole file
     tokens = CommonTokenStream(lexer)
     parser = SystemVerilogSubsetParser(tokens)
-    return parser.compilation_unit()
+
+    used = "LL"
+    tree = None
+    if mode == "two_stage":
+        parser._interp.predictionMode = PredictionMode.SLL
+        parser._errHandler = BailErrorStrategy()
+        parser.removeErrorListeners()
+        try:
+            tree = parser.compilation_unit()
+            used = "SLL"
+        except ParseCancellationException:
+            log.debug("SLL parse of %s bailed out; retrying with LL", source)
+            parser.reset()  # rewinds the (already lexed) token stream
+            parser._errHandler = DefaultErrorStrategy()
+            parser.addErrorListener(ConsoleErrorListener.INSTANCE)
+            parser._interp.predictionMode = PredictionMode.LL
+    if tree is None:
+        tree = parser.compilation_unit()
+
+    elapsed = time.perf_counter() - t0
+    log.info(
+        "Parsed %s in %.3f s (%s, %d tokens)", source, elapsed, used, len(tokens.tokens)
+    )
+    if timings is not None:
+        timings.append(ParseTiming(source, elapsed, used, len(tokens.tokens)))
+    return tree
+
+
+def parse_sv_file(path: str, mode: str = "two_stage", timings: Optional[List] = None):
+    """Parse a SystemVerilog file into an ANTLR parse tree (compilation_unit)."""
+    return _parse(FileStream(path), str(path), mode, timings)
+
+
+def parse_sv_text(
+    src: str,
+    mode: str = "two_stage",
+    timings: Optional[List] = None,
+    source: str = "<text>",
+    line: int = 1,
+):
+    """
+    Parse SystemVerilog source text into an ANTLR parse tree (compilation_unit).
+    `line` is the line number of the text's first line in `source`.
+    """
+    return _parse(InputStream(src), source, mode, timings, line)
 
 
 def first_module_declaration(tree):
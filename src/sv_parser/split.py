@@ -0,0 +1,122 @@
+"""
+Token-level module splitter.
+
+split_modules() streams source lines and finds the `module ... endmodule`
+spans without running the ANTLR lexer or parser, so each module can be
+parsed on its own, in order, and modules nobody asked for are never parsed
+(or even kept in memory). It understands exactly the lexical structure that
+matters for the SystemVerilogSubset grammar: `//` and `/* */` comments are
+skipped (the grammar has no string literals), and `module`/`endmodule` only
+count as whole identifiers.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Container, Iterable, Iterator, Optional
+
+_SCAN_RE = re.compile(r"//|/\*|\b(?:endmodule|module)\b")
+_IDENT_RE = re.compile(r"[A-Za-z_][A-Za-z_0-9]*")
+_WS_RE = re.compile(r"\s*")
+
+
+@dataclass
+class ModuleSource:
+    """Source text of one module, from `module` through `endmodule`."""
+
+    name: str
+    text: str
+    line: int  # 1-based line of the `module` keyword
+    column: int  # 0-based column of the `module` keyword
+    end_line: int  # line of the `endmodule` keyword
+
+
+class _Splitter:
+    def __init__(self, only: Optional[Container[str]]):
+        self.only = only
+        self.in_comment = False
+        self.start = None  # (line, column) of the open module
+        self.name = None
+        self.expect_name = False
+        self.keep = False
+        self.parts = []
+
+    def _skip_comment(self, line: str, pos: int) -> int:
+        end = line.find("*/", pos)
+        if end < 0:
+            return len(line)
+        self.in_comment = False
+        return end + 2
+
+    def feed(self, lineno: int, line: str) -> Iterator[ModuleSource]:
+        pos = 0
+        piece_start = 0 if self.start is not None else None
+        while pos < len(line):
+            if self.in_comment:
+                pos = self._skip_comment(line, pos)
+                continue
+            if self.expect_name:
+                pos = _WS_RE.match(line, pos).end()
+                # a comment between `module` and its name falls through to
+                # the scan below
+                if pos < len(line) and not line.startswith(("//", "/*"), pos):
+                    ident = _IDENT_RE.match(line, pos)
+                    self.name = ident.group(0) if ident else ""
+                    self.expect_name = False
+                    self.keep = self.only is None or self.name in self.only
+                    if not self.keep:
+                        self.parts = []
+                    continue
+            m = _SCAN_RE.search(line, pos)
+            if m is None:
+                break
+            tok = m.group(0)
+            if tok == "//":
+                break
+            if tok == "/*":
+                self.in_comment = True
+                pos = m.end()
+                continue
+            pos = m.end()
+            if tok == "module" and self.start is None:
+                self.start = (lineno, m.start())
+                self.expect_name = True
+                self.keep = True  # until the name says otherwise
+                self.parts = []
+                piece_start = m.start()
+            elif tok == "endmodule" and self.start is not None:
+                if self.keep:
+                    self.parts.append(line[piece_start : m.end()])
+                    yield ModuleSource(
+                        self.name or "",
+                        "".join(self.parts),
+                        self.start[0],
+                        self.start[1],
+                        lineno,
+                    )
+                self.start = None
+                self.name = None
+                self.expect_name = False
+                self.parts = []
+                piece_start = None
+        if self.start is not None and self.keep and piece_start is not None:
+            self.parts.append(line[piece_start:])
+
+
+def split_modules(
+    lines: Iterable[str], only: Optional[Container[str]] = None
+) -> Iterator[ModuleSource]:
+    """
+    Yield a ModuleSource for each module in `lines` (an open file or any
+    iterable of lines with their line endings), in source order. With `only`,
+    modules whose name is not in it are skipped without buffering their text.
+
+    Raises ValueError if the input ends inside a module.
+    """
+    splitter = _Splitter(only)
+    for lineno, line in enumerate(lines, 1):
+        yield from splitter.feed(lineno, line)
+    if splitter.start is not None:
+        raise ValueError(
+            f"module '{splitter.name or '?'}' at line {splitter.start[0]} "
+            "has no matching endmodule"
+        )
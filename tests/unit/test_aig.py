@@ -0,0 +1,116 @@
+import itertools
+import sys
+from pathlib import Path
+
+import pytest
+
+from logictree.aig import AIG, AND, FALSE, TRUE, from_logic_tree
+from logictree.eval import evaluate
+from logictree.nodes.ops.comparison import EqOp
+from logictree.nodes.ops.gates import AndOp, NandOp, NorOp, NotOp, OrOp, XnorOp, XorOp
+from logictree.nodes.ops.mux import LogicMux
+from logictree.nodes.ops.ops import LogicConst, LogicVar
+from logictree.nodes.selects import PartSelect
+from logictree.pipeline import lower_sv_file_to_logic
+from logictree.utils.compare import compare_logic_trees
+
+pytestmark = [pytest.mark.unit]
+
+GOLDEN = Path(__file__).resolve().parents[2] / "golden_circuits"
+
+a, b, c = LogicVar("a"), LogicVar("b"), LogicVar("c")
+
+
+@pytest.mark.parametrize("cls", [XorOp, XnorOp, NandOp, NorOp, AndOp, OrOp])
+def test_gate_to_primitives_is_equivalent(cls):
+    gate = cls(a, b)
+    assert compare_logic_trees(gate, gate.to_primitives(), method="bdd")
+
+
+def test_structural_hashing_and_constant_folding():
+    aig = AIG()
+    x, y = aig.input("x"), aig.input("y")
+    assert aig.and_(x, y) == aig.and_(y, x)
+    assert aig.and_(x, x ^ 1) == FALSE
+    assert aig.and_(x, TRUE) == x
+    assert aig.or_(x, TRUE) == TRUE
+    assert aig.num_ands == 1
+    assert list(aig.kind).count(AND) == 1
+
+
+def test_round_trip_preserves_function():
+    tree = OrOp(
+        XnorOp(a, LogicMux(c, b, NotOp(a))),
+        NorOp(EqOp(PartSelect(LogicVar("s", width=2), 1, 0), LogicConst(2)), c),
+    )
+    aig = from_logic_tree(tree)
+    back = aig.to_logic_tree(aig.outputs["out"])
+    assert compare_logic_trees(tree, back, method="bdd")
+
+    names = ["a", "b", "c", "s[0]", "s[1]"]
+    for bits in itertools.product((0, 1), repeat=len(names)):
+        env = dict(zip(names, bits))
+        assert aig.evaluate(env)["out"] == evaluate(back, env)
+
+
+def test_bit_parallel_simulation():
+    aig = from_logic_tree(XorOp(a, b))
+    # four patterns at once: a = 0011, b = 0101
+    assert aig.evaluate({"a": 0b0011, "b": 0b0101}, mask=0b1111)["out"] == 0b0110
+
+
+def test_counting_depth_hash_and_cleanup():
+    aig = AIG.from_trees({"x": AndOp(a, b), "y": OrOp(AndOp(a, b), c)})
+    assert aig.count_ands() == 2
+    assert aig.depth() == 2
+    aig.and_(aig.input("a"), aig.input("c"))  # dangling
+    compact = aig.cleanup()
+    assert compact.num_ands == 2
+    assert compact.structural_hash(compact.outputs["y"]) == aig.structural_hash(
+        aig.outputs["y"]
+    )
+    other = from_logic_tree(AndOp(b, a))
+    assert other.structural_hash(other.outputs["out"]) == aig.structural_hash(
+        aig.outputs["x"]
+    )
+
+
+def test_structural_hash_ignores_creation_order():
+    def build(order, and_first):
+        aig = AIG()
+        lit = {n: aig.input(n) for n in order}
+        ab, cd = (lit["a"], lit["b"]), (lit["c"], lit["d"])
+        x, y = (aig.and_(*p) for p in ((ab, cd) if and_first else (cd, ab)))
+        return aig.structural_hash(aig.or_(x, y))
+
+    def late_c(declare_c_first):
+        aig = AIG()
+        c_lit = aig.input("c") if declare_c_first else None
+        ab = aig.and_(aig.input("a"), aig.input("b"))
+        c_lit = aig.input("c") if c_lit is None else c_lit
+        return aig.structural_hash(aig.and_(ab, c_lit))
+
+    assert build("abcd", True) == build("dcba", False) == build("cadb", True)
+    assert late_c(True) == late_c(False)
+    assert build("abcd", True) != late_c(True)
+
+
+def test_deep_chain_converts_without_recursion():
+    node = a
+    for i in range(sys.getrecursionlimit() * 3):
+        node = XorOp(node, b if i % 2 else c)
+    aig = from_logic_tree(node)
+    assert aig.evaluate({"a": 1, "b": 0, "c": 0})["out"] == 1
+    tree = aig.to_logic_tree(aig.outputs["out"])
+    assert isinstance(tree, (AndOp, NotOp))
+
+
+def test_golden_module_outputs_match_evaluate():
+    mod = next(
+        iter(lower_sv_file_to_logic(str(GOLDEN / "rv_alu_decode_simple.sv")).values())
+    )
+    trees = {n: asg.rhs for n, asg in mod.assignments.items()}
+    aig = AIG.from_trees(trees)
+    for name, tree in trees.items():
+        back = aig.to_logic_tree(aig.outputs[name])
+        assert compare_logic_trees(tree, back, method="bdd")
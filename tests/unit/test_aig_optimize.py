@@ -0,0 +1,118 @@
+import random
+from functools import reduce
+from pathlib import Path
+
+import pytest
+
+from logictree.aig import AIG
+from logictree.aig_opt import (
+    balance,
+    npn_canonical,
+    optimize,
+    optimize_trees,
+    refactor,
+    rewrite,
+)
+from logictree.nodes import AndOp, LogicMux, LogicVar, NandOp, NotOp, OrOp, XorOp
+from logictree.pipeline import lower_sv_file_to_logic
+from logictree.utils.compare import compare_logic_trees
+from tests.utils.tree_helpers import random_tree
+
+pytestmark = [pytest.mark.unit]
+
+GOLDEN = Path(__file__).resolve().parents[2] / "golden_circuits"
+a, b, c, d = (LogicVar(n) for n in "abcd")
+MASK = (1 << 256) - 1
+OPS = [AndOp, OrOp, XorOp, NandOp, NotOp, LogicMux]
+
+
+def _equivalent(x: AIG, y: AIG, seed=0) -> bool:
+    rng = random.Random(seed)
+    env = {name: rng.getrandbits(256) for name in x.inputs}
+    return x.evaluate(env, MASK) == y.evaluate(env, MASK)
+
+
+def test_npn_canonical_form():
+    # the 256 functions of three inputs fall into 14 NPN classes
+    classes = {npn_canonical(t | t << 8)[0] for t in range(256)}
+    assert len(classes) == 14
+    tt = 0b0110_1001_1001_0110 ^ 0x0F0F  # some XOR-ish function
+    canon, perm, neg, out = npn_canonical(tt)
+    for x in range(16):
+        y = sum((((x >> perm[j]) ^ (neg >> j)) & 1) << j for j in range(4))
+        assert (tt >> x) & 1 == ((canon >> y) & 1) ^ out
+
+
+def test_rewrite_collapses_redundant_logic():
+    # (a & b) | (a & ~b) | (a & c) == a, spelled out the long way
+    tree = OrOp(OrOp(AndOp(a, b), AndOp(a, NotOp(b))), AndOp(a, c))
+    aig = AIG.from_trees({"y": tree, "z": XorOp(XorOp(a, b), XorOp(b, c))})
+    opt = rewrite(aig)
+    assert _equivalent(aig, opt)
+    assert opt.outputs["y"] == opt.input("a")
+    assert opt.count_ands() == 3  # a ^ c
+
+
+def test_balance_minimizes_depth():
+    xs = [LogicVar(f"x{i}") for i in range(64)]
+    aig = AIG.from_trees({"y": reduce(AndOp, xs), "z": reduce(OrOp, xs[:16])})
+    assert aig.depth() == 63
+    opt = balance(aig)
+    assert opt.depth() == 6
+    assert opt.count_ands() == aig.count_ands()
+    assert _equivalent(aig, opt)
+
+
+def test_passes_keep_function_and_optimize_never_grows():
+    rng = random.Random(5)
+    leaves = [LogicVar(f"v{i}") for i in range(7)]
+    for seed in range(15):
+        trees = {f"o{j}": random_tree(rng, 5, OPS, leaves) for j in range(3)}
+        aig = AIG.from_trees(trees)
+        for opt in (rewrite(aig), refactor(aig), balance(aig)):
+            assert _equivalent(aig, opt, seed)
+        opt, report = optimize(aig)
+        assert _equivalent(aig, opt, seed)
+        assert report.ands_after <= report.ands_before == aig.count_ands()
+        assert report.ands_after == opt.count_ands()
+        assert report.depth_after == opt.depth()
+
+
+def test_optimize_report_and_budget():
+    rng = random.Random(9)
+    leaves = [LogicVar(f"v{i}") for i in range(12)]
+    aig = AIG.from_trees({f"o{j}": random_tree(rng, 7, OPS, leaves) for j in range(4)})
+    opt, report = optimize(aig, max_iterations=1, script=("rewrite",))
+    assert report.iterations == 1 and len(report.passes) == 1
+    assert report.passes[0].name == "rewrite"
+    assert "ands:" in report.summary()
+
+    opt, report = optimize(aig, time_budget=0.0)
+    assert report.out_of_time and not report.passes
+    assert report.ands_after == report.ands_before
+    assert _equivalent(aig, opt)
+
+    with pytest.raises(ValueError, match="unknown"):
+        optimize(aig, script=("resub",))
+
+
+def test_optimize_trees_reports_total_gates():
+    mod = next(
+        iter(lower_sv_file_to_logic(str(GOLDEN / "rv_alu_decode_simple.sv")).values())
+    )
+    trees = {n: asg.rhs for n, asg in mod.assignments.items()}
+    result, report = optimize_trees(trees)
+    assert report.depth_after < report.depth_before
+    assert report.total_gates_after <= report.total_gates_before
+    assert "total_gates:" in report.summary()
+    for name, tree in trees.items():
+        assert compare_logic_trees(tree, result[name], method="bdd")
+
+
+def test_optimize_trees_handles_deep_chains():
+    # the shape of a wide equality compare: one long AND chain
+    chain = reduce(AndOp, (LogicVar(f"x{i}") for i in range(5000)))
+    result, report = optimize_trees({"y": chain}, script=("balance",))
+    assert report.depth_after == 13
+    assert report.total_gates_before == report.total_gates_after == 4999
+    assert result["y"].depth == 13
@@ -0,0 +1,104 @@
+import random
+from functools import reduce
+
+import pytest
+
+from cli.main import main
+from logictree.nodes import (
+    AndOp,
+    LogicAssign,
+    LogicMux,
+    LogicVar,
+    NandOp,
+    NotOp,
+    OrOp,
+    XnorOp,
+    XorOp,
+)
+from logictree.pipeline import lower_sv_text_to_logic
+from logictree.transforms.balance import balance_tree
+from logictree.utils.analysis import gate_count
+from logictree.utils.reduce import balance_logic_tree, huffman_tree_reduce
+from logictree.utils.truth_table import truth_tables_equal
+
+pytestmark = [pytest.mark.unit]
+
+xs = [LogicVar(f"x{i}") for i in range(16)]
+
+COMPARE_SV = """
+module cmp(input logic [15:0] a, input logic b, output logic y);
+  assign y = (a == 16'hA5F0) & b;
+endmodule
+"""
+
+
+def test_huffman_reduce_puts_late_inputs_near_the_output():
+    late = reduce(XorOp, xs[8:12])  # delay 3
+    tree = huffman_tree_reduce("AND", [late] + xs[:4])
+    assert tree.delay == 4  # not 3 + ceil(log2(5))
+    assert late in tree.children
+    assert isinstance(huffman_tree_reduce("AND", xs[:2], root_op="NAND"), NandOp)
+
+
+def test_chains_are_flattened_and_rebuilt_for_min_depth():
+    chain = reduce(AndOp, xs)
+    assert chain.delay == 15
+    balanced = balance_tree(chain)
+    assert balanced.delay == 4
+    assert gate_count(balanced) == gate_count(chain)
+    assert truth_tables_equal(chain, balanced)
+
+    # XNOR over a left-deep XOR chain keeps its inverting output gate
+    xnor = XnorOp(reduce(XorOp, xs[:7]), xs[7])
+    balanced = balance_tree(xnor)
+    assert isinstance(balanced, XnorOp) and balanced.delay == 3
+    assert truth_tables_equal(xnor, balanced)
+
+
+def test_shared_and_already_shallow_chains_are_kept():
+    shared = AndOp(AndOp(xs[0], xs[1]), xs[2])
+    tree = OrOp(AndOp(shared, xs[3]), NotOp(shared))
+    balanced = balance_tree(tree)
+    # `shared` stays one operand of the AND above it, and one object
+    assert balanced.a.a is shared or balanced.a.b is shared
+    assert balanced.b.operand is shared
+
+    shallow = AndOp(AndOp(xs[0], xs[1]), AndOp(xs[2], xs[3]))
+    assert balance_tree(shallow) is shallow
+    mux = LogicMux(xs[0], shallow, xs[1])
+    assert balance_tree(mux) is mux
+
+
+def test_random_trees_keep_their_function_and_never_deepen():
+    rng = random.Random(4)
+
+    def rand(depth):
+        if depth == 0:
+            return rng.choice(xs[:6])
+        op = rng.choice([AndOp, OrOp, XorOp, NandOp, XnorOp, NotOp])
+        if op is NotOp:
+            return NotOp(rand(depth - 1))
+        return op(rand(depth - 1), rand(depth - 1))
+
+    for _ in range(100):
+        tree = rand(rng.randint(1, 6))
+        balanced = balance_logic_tree(tree)
+        assert truth_tables_equal(tree, balanced)
+        assert balanced.delay <= tree.delay
+
+
+def test_vector_compare_balances_and_cli_reports_depth(tmp_path, capsys):
+    mod = lower_sv_text_to_logic(COMPARE_SV)["cmp"]
+    rhs = mod.assignments["y"].rhs
+    balanced = balance_tree(rhs)
+    assert balanced.delay < rhs.delay
+    assert truth_tables_equal(rhs, balanced)
+    assert balance_tree(LogicAssign(lhs=LogicVar("y"), rhs=rhs)).rhs.delay == (
+        balanced.delay
+    )
+
+    path = tmp_path / "cmp.sv"
+    path.write_text(COMPARE_SV)
+    main([str(path), "--balance", "--no_cache"])
+    err = capsys.readouterr().err
+    assert f"{rhs.delay:6d} -> {balanced.delay:<6d} critical path" in err
@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import pytest
+
+from logictree.nodes.ops.comparison import EqOp, NeqOp
+from logictree.nodes.ops.gates import AndOp, NotOp, OrOp, XorOp
+from logictree.nodes.ops.ops import LogicConst, LogicVar
+from logictree.nodes.selects import BitSelect, PartSelect
+from logictree.pipeline import lower_sv_file_to_logic
+from logictree.utils.analysis import get_logic_hash
+from logictree.utils.bdd_context import (
+    BDDContext,
+    clear_bdd_contexts,
+    get_bdd_context,
+)
+from logictree.utils.compare import compare_logic_trees
+
+pytestmark = [pytest.mark.unit]
+
+GOLDEN = Path(__file__).resolve().parents[2] / "golden_circuits"
+
+
+def test_shared_context_hash_matches_private_hash():
+    a, b, c, d = (LogicVar(n) for n in "abcd")
+    trees = [AndOp(d, c), OrOp(XorOp(b, a), NotOp(c)), XorOp(a, AndOp(d, b))]
+    ctx = BDDContext()
+    # Declaring vars out of order must not change the canonical hashes
+    for tree in trees:
+        assert get_logic_hash(tree, ctx=ctx) == get_logic_hash(tree)
+    assert sorted(ctx.bdd.vars, key=ctx.bdd.vars.get) == ["a", "b", "c", "d"]
+
+
+def test_shared_cones_are_built_once():
+    shared = XorOp(LogicVar("a"), LogicVar("b"))
+    out1 = AndOp(shared, LogicVar("c"))
+    out2 = OrOp(shared, LogicVar("d"))
+    ctx = BDDContext()
+    ctx.build(out1)
+    cached = len(ctx._memo)
+    ctx.build(out2)
+    # only out2 and its new leaf d are added
+    assert len(ctx._memo) == cached + 2
+
+
+def test_module_contexts_are_reused_per_name():
+    clear_bdd_contexts()
+    assert get_bdd_context("top") is get_bdd_context("top")
+    assert get_bdd_context("top") is not get_bdd_context("other")
+    clear_bdd_contexts()
+
+
+def test_eq_neq_and_selects_are_supported():
+    s = LogicVar("s", width=2)
+    eq = EqOp(PartSelect(s, 1, 0), LogicConst(2, width=2))
+    manual = AndOp(BitSelect(s, 1), NotOp(BitSelect(s, 0)))
+    assert compare_logic_trees(eq, manual, method="bdd")
+    assert compare_logic_trees(
+        NeqOp(LogicVar("a"), LogicConst(0)), LogicVar("a"), method="bdd"
+    )
+
+
+def test_hash_every_output_of_a_module():
+    mod = next(
+        iter(lower_sv_file_to_logic(str(GOLDEN / "rv_alu_decode_simple.sv")).values())
+    )
+    ctx = get_bdd_context(mod.name)
+    hashes = {n: get_logic_hash(a.rhs, ctx=ctx) for n, a in mod.assignments.items()}
+    assert hashes == {n: get_logic_hash(a.rhs) for n, a in mod.assignments.items()}
+    clear_bdd_contexts()
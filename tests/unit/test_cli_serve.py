@@ -0,0 +1,149 @@
+import io
+import json
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+from cli.serve import Server, serve_stream, serve_unix
+
+pytestmark = [pytest.mark.unit]
+
+SRC = (
+    "module top(input logic a, b, output logic y, z);\n"
+    "  assign y = a ^ b;\n"
+    "  assign z = a & b;\n"
+    "endmodule\n"
+)
+XOR = (
+    "module alt(input logic a, b, output logic o);\n"
+    "  assign o = (a & ~b) | (~a & b);\n"
+    "endmodule\n"
+)
+
+
+def _run(server, *requests):
+    infile = io.StringIO("".join(json.dumps(r) + "\n" for r in requests))
+    out = io.StringIO()
+    serve_stream(server, infile, out)
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+@pytest.fixture
+def sv(tmp_path):
+    path = tmp_path / "top.sv"
+    path.write_text(SRC)
+    return str(path)
+
+
+def test_requests_share_one_session(sv):
+    server = Server()
+    lower, again, hashed, evaled = _run(
+        server,
+        {"id": 1, "method": "lower", "params": {"path": sv}},
+        {"id": 2, "method": "lower", "params": {"path": sv}},
+        {"id": 3, "method": "hash", "params": {"path": sv, "signals": ["y"]}},
+        {
+            "id": 4,
+            "method": "eval",
+            "params": {
+                "path": sv,
+                "signal": "y",
+                "envs": [{"a": 1, "b": 0}, {"a": 1, "b": 1}],
+            },
+        },
+    )
+    assert lower["result"]["modules"]["top"]["signals"] == ["y", "z"]
+    assert lower["result"]["relowered"] == ["top"]
+    assert again["result"]["relowered"] == []  # unchanged file is not re-read
+    assert list(hashed["result"]["hashes"]) == ["y"]
+    assert evaled == {"id": 4, "result": {"values": [1, 0]}}
+
+
+def test_compare_across_sources_and_simplify(sv):
+    compared, simplified, tree = _run(
+        Server(),
+        {
+            "id": "c",
+            "method": "compare",
+            "params": {
+                "a": {"path": sv, "signal": "y"},
+                "b": {"text": XOR, "source": "alt.sv", "signal": "o"},
+            },
+        },
+        {"id": "s", "method": "simplify", "params": {"path": sv, "signal": "z"}},
+        {"id": "j", "method": "serialize", "params": {"path": sv, "signal": "z"}},
+    )
+    assert compared == {"id": "c", "result": {"equal": True}}
+    assert simplified["result"]["gates_after"] <= simplified["result"]["gates_before"]
+    assert tree["result"]["tree"]["type"] == "AndOp"
+
+
+def test_errors_are_responses_and_shutdown_stops(sv):
+    server = Server()
+    infile = io.StringIO(
+        "not json\n"
+        + "\n".join(
+            json.dumps(r)
+            for r in (
+                {"id": 1, "method": "nope"},
+                {"id": 2, "method": "eval", "params": {"path": sv, "signal": "q"}},
+                {"id": 3, "method": "lower", "params": {"path": sv + ".missing"}},
+                {"id": 4, "method": "shutdown"},
+                {"id": 5, "method": "lower", "params": {"path": sv}},
+            )
+        )
+    )
+    out = io.StringIO()
+    serve_stream(server, infile, out)
+    responses = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [r["id"] for r in responses] == [None, 1, 2, 3, 4]
+    assert responses[1]["error"]["type"] == "RequestError"
+    assert "no signal 'q'" in responses[2]["error"]["message"]
+    assert responses[3]["error"]["type"] == "FileNotFoundError"
+    assert responses[4] == {"id": 4, "result": None}
+    assert not server.running
+
+
+def test_edited_file_is_relowered(sv):
+    server = Server()
+    _run(server, {"id": 1, "method": "hash", "params": {"path": sv}})
+    with open(sv, "w") as f:
+        f.write(SRC.replace("a & b", "a | b"))
+    st = os.stat(sv)
+    os.utime(sv, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    (evaled,) = _run(
+        server,
+        {
+            "id": 2,
+            "method": "eval",
+            "params": {"path": sv, "signal": "z", "env": {"a": 1, "b": 0}},
+        },
+    )
+    assert evaled["result"] == {"value": 1}
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+def test_unix_socket_round_trip(sv, tmp_path):
+    path = str(tmp_path / "serve.sock")
+    thread = threading.Thread(target=serve_unix, args=(Server(), path), daemon=True)
+    thread.start()
+    for _ in range(100):
+        if os.path.exists(path):
+            break
+        time.sleep(0.01)
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        requests = [
+            {"id": 1, "method": "lower", "params": {"path": sv}},
+            {"id": 2, "method": "shutdown"},
+        ]
+        sock.sendall("".join(json.dumps(r) + "\n" for r in requests).encode())
+        reply = sock.makefile("r").read()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert [json.loads(line)["id"] for line in reply.splitlines()] == [1, 2]
+    assert not os.path.exists(path)
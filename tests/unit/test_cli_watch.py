@@ -0,0 +1,99 @@
+import io
+import os
+
+import pytest
+
+from cli.main import build_parser, main
+from cli.watch import Watcher, _fingerprint
+from logictree.nodes import AndOp, LogicVar, OrOp
+from logictree.utils.structural_hash import structural_hash
+
+pytestmark = [pytest.mark.unit]
+
+SRC = (
+    "module top(input logic a, b, output logic y, z);\n"
+    "  assign y = a ^ b;\n"
+    "  assign z = a & b;\n"
+    "endmodule\n"
+)
+OTHER = "module leaf(input logic p, output logic q);\n  assign q = ~p;\nendmodule\n"
+
+
+def _touch(path, text):
+    path.write_text(text)
+    st = os.stat(path)
+    # make sure the stamp differs even on coarse mtime filesystems
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def watcher(tmp_path):
+    top, leaf = tmp_path / "top.sv", tmp_path / "leaf.sv"
+    top.write_text(SRC)
+    leaf.write_text(OTHER)
+    args = build_parser().parse_args([str(top), str(leaf), "--watch", "--hash_tree"])
+    return Watcher([str(top), str(leaf)], args, file=io.StringIO()), top, leaf
+
+
+def test_only_changed_signals_are_output(watcher, capsys):
+    w, top, leaf = watcher
+    assert sorted(w.poll()) == ["y", "z"]
+    assert w.poll() is None
+    capsys.readouterr()
+
+    _touch(top, SRC.replace("a & b", "a | b"))
+    assert sorted(w.poll()) == ["z"]
+    out = capsys.readouterr().out
+    assert "Hash for z" in out and "Hash for y" not in out
+
+    # whitespace-only edits relower the module but change no signal
+    _touch(top, SRC.replace("a & b", "a | b").replace("  assign", "\tassign"))
+    assert w.poll() == {}
+
+
+def test_edits_outside_the_top_module_do_not_rerun(watcher):
+    w, top, leaf = watcher
+    w.poll()
+    _touch(leaf, OTHER.replace("~p", "p"))
+    assert w.poll() == {}
+    assert "leaf" in w.session.modules
+
+
+def test_errors_keep_the_watcher_alive(watcher):
+    w, top, leaf = watcher
+    w.poll()
+    _touch(top, SRC.replace("endmodule", ""))
+    assert w.poll() == {}
+    assert "no matching endmodule" in w.file.getvalue()
+    _touch(top, SRC)
+    assert w.poll() == {}  # back to the text it had before
+    # without --top the first module of the first file with modules is top
+    os.remove(top)
+    assert sorted(w.poll()) == ["q"]
+
+
+def test_watch_runs_the_same_pipeline_as_a_single_run(tmp_path, capsys):
+    top = tmp_path / "top.sv"
+    top.write_text(SRC.replace("a ^ b", "(a & b) ^ b").replace("a & b;", "a & b | b;"))
+    flags = ["--cse", "--aig_optimize", "--hash_tree", "--no_cache"]
+    main([str(top), *flags])
+    single = capsys.readouterr()
+
+    args = build_parser().parse_args([str(top), "--watch", *flags])
+    w = Watcher([str(top)], args, file=io.StringIO())
+    assert sorted(w.poll()) == ["y", "z"]
+    assert capsys.readouterr().out == single.out
+    assert "cse: 1 shared subexpressions" in single.err
+    assert "cse: 1 shared subexpressions" in w.file.getvalue()
+    assert "total_gates:" in w.file.getvalue()
+
+
+def test_fingerprint_ignores_cached_metrics_and_sharing():
+    a, b = LogicVar("a"), LogicVar("b")
+    shared = AndOp(a, b)
+    tree = OrOp(shared, shared)
+    before = _fingerprint(tree)
+    tree.depth, structural_hash(tree)
+    assert _fingerprint(tree) == before
+    assert _fingerprint(OrOp(AndOp(a, b), AndOp(a, b))) == before
+    assert _fingerprint(OrOp(AndOp(a, b), AndOp(b, a))) != before
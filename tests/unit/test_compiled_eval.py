@@ -0,0 +1,113 @@
+import random
+from pathlib import Path
+
+import pytest
+
+from logictree.eval import compile_tree, evaluate, evaluate_many
+from logictree.nodes.control.ifstatement import IfStatement
+from logictree.nodes.ops.comparison import EqOp, NeqOp
+from logictree.nodes.ops.gates import AndOp, NandOp, NotOp, OrOp, XorOp
+from logictree.nodes.ops.mux import LogicMux
+from logictree.nodes.ops.ops import LogicConst, LogicVar
+from logictree.nodes.selects import BitSelect, Concat, PartSelect
+from logictree.pipeline import lower_sv_file_to_logic
+
+pytestmark = [pytest.mark.unit]
+
+GOLDEN = Path(__file__).resolve().parents[2] / "golden_circuits"
+
+
+def _random_envs(names, n, seed=0):
+    rng = random.Random(seed)
+    return [{name: rng.randint(0, 1) for name in names} for _ in range(n)]
+
+
+def test_compiled_matches_evaluate_on_gates():
+    a, b, c = LogicVar("a"), LogicVar("b"), LogicVar("c")
+    tree = OrOp(AndOp(a, NotOp(b)), XorOp(b, AndOp(c, LogicConst(1))))
+    compiled = compile_tree(tree)
+    assert compiled.inputs == ["a", "b", "c"]
+
+    envs = _random_envs(compiled.inputs, 200)
+    assert compiled.evaluate_batch(envs) == [evaluate(tree, env) for env in envs]
+
+
+def test_compiled_matches_evaluate_on_selects_and_concat():
+    s = LogicVar("s", width=4)
+    tree = AndOp(
+        EqOp(PartSelect(s, 3, 0), LogicConst(0b1010)),
+        NeqOp(Concat([BitSelect(s, 0), LogicVar("a")]), LogicConst(3)),
+    )
+    names = [f"s[{i}]" for i in range(4)] + ["a"]
+    envs = _random_envs(names, 130, seed=1)
+    assert evaluate_many(tree, envs) == [evaluate(tree, env) for env in envs]
+
+
+def test_multi_bit_outputs_unpack_per_vector():
+    a, b = LogicVar("a"), LogicVar("b")
+    tree = Concat([a, LogicConst(1), b])
+    envs = [{"a": 1, "b": 0}, {"a": 0, "b": 1}, {"a": 1, "b": 1}]
+    assert compile_tree(tree).width == 3
+    assert evaluate_many(tree, envs) == [0b110, 0b011, 0b111]
+
+
+def test_run_on_packed_words():
+    a, b = LogicVar("a"), LogicVar("b")
+    compiled = compile_tree(AndOp(a, NotOp(b)))
+    # 64 vectors at once: a = 0b1100..., b = 0b1010...
+    a_word = int("1100" * 16, 2)
+    b_word = int("1010" * 16, 2)
+    mask = (1 << 64) - 1
+    (out,) = compiled.run({"a": a_word, "b": b_word}, mask)
+    assert out == a_word & ~b_word & mask
+
+
+def test_mux_if_and_compound_gates():
+    s, a, b = LogicVar("s"), LogicVar("a"), LogicVar("b")
+    mux = LogicMux(s, a, b)
+    compiled = compile_tree(mux)
+    envs = _random_envs(["s", "a", "b"], 64, seed=2)
+    assert compiled.evaluate_batch(envs) == [
+        env["a"] if env["s"] else env["b"] for env in envs
+    ]
+
+    if_tree = IfStatement(s, a, b)
+    assert evaluate_many(if_tree, envs) == [evaluate(if_tree, env) for env in envs]
+
+    nand = NandOp(a, b)
+    assert evaluate_many(nand, envs) == [1 - (env["a"] & env["b"]) for env in envs]
+
+
+def test_multi_bit_conditions_are_tested_as_a_whole():
+    # like evaluate(), a condition is true when any of its bits is set
+    cond = PartSelect(LogicVar("x", width=2), 1, 0)
+    a, b = LogicVar("a"), LogicVar("b")
+    envs = [{"x[0]": x0, "x[1]": x1, "a": 1, "b": 0} for x1 in (0, 1) for x0 in (0, 1)]
+    if_tree = IfStatement(cond, a, b)
+    assert evaluate_many(if_tree, envs) == [evaluate(if_tree, env) for env in envs]
+    assert evaluate_many(if_tree, envs) == [0, 1, 1, 1]
+    assert evaluate_many(LogicMux(cond, a, b), envs) == [0, 1, 1, 1]
+
+
+def test_shared_subtrees_are_compiled_once():
+    shared = AndOp(LogicVar("a"), LogicVar("b"))
+    tree = OrOp(shared, NotOp(shared))
+    assert compile_tree(tree).source.count(" & ") == 1
+
+
+def test_deep_chain_compiles_without_recursion():
+    node = LogicVar("x0")
+    for i in range(1, 5000):
+        node = XorOp(node, LogicVar(f"x{i % 5}"))
+    envs = _random_envs([f"x{i}" for i in range(5)], 8, seed=3)
+    assert len(evaluate_many(node, envs)) == 8
+
+
+def test_alu_decode_exhaustive_random_against_evaluate():
+    mod = next(
+        iter(lower_sv_file_to_logic(str(GOLDEN / "rv_alu_decode_simple.sv")).values())
+    )
+    for name, assign in mod.assignments.items():
+        compiled = compile_tree(assign.rhs)
+        envs = _random_envs(compiled.inputs, 256, seed=len(name))
+        assert compiled.evaluate_batch(envs) == [evaluate(assign.rhs, e) for e in envs]
@@ -0,0 +1,100 @@
+import pytest
+
+from cli.main import main
+from logictree.eval import evaluate
+from logictree.nodes import AndOp, LogicVar, NotOp, OrOp, XorOp
+from logictree.pipeline import lower_sv_text_to_logic
+from logictree.transforms.cse import (
+    cse_module,
+    dag_gate_count,
+    eliminate_common_subexpressions,
+)
+from logictree.transforms.signal_resolution import resolve_signal_vars
+from logictree.utils.truth_table import truth_tables_equal
+
+pytestmark = [pytest.mark.unit]
+
+a, b, c, d = (LogicVar(n) for n in "abcd")
+
+SV = """
+module m(input logic a, input logic b, input logic c, input logic d,
+         output logic x, output logic y, output logic z);
+  assign x = ((a & b) | (c ^ d)) & a;
+  assign y = ((b & a) | (d ^ c)) | (b & a);
+  assign z = ~((d ^ c) | (a & b));
+endmodule
+"""
+
+
+def test_equal_subtrees_are_shared_across_outputs():
+    trees = {
+        "x": AndOp(OrOp(AndOp(a, b), XorOp(c, d)), a),
+        "y": OrOp(XorOp(d, c), AndOp(b, a)),  # same OR, operands swapped
+        "z": NotOp(AndOp(b, a)),
+    }
+    result = eliminate_common_subexpressions(trees)
+    x, y, z = (result.outputs[n] for n in "xyz")
+    assert x.a is y and z.operand is x.a.a  # one node per distinct subtree
+    # y is used inside x but is an output already: only a & b is extracted
+    assert list(result.signals) == ["cse0"]
+    assert result.signals["cse0"] is z.operand
+    assert result.gates_before == 9 and result.gates_after == 5
+    assert dag_gate_count(result.outputs.values()) == 5
+    for name, tree in trees.items():
+        assert truth_tables_equal(tree, result.outputs[name])
+
+
+def test_unshared_and_trivial_nodes_are_not_extracted():
+    trees = {"x": AndOp(NotOp(a), b), "y": OrOp(NotOp(a), c)}
+    result = eliminate_common_subexpressions(trees)
+    assert result.signals == {}
+    assert result.outputs["x"].a is result.outputs["y"].a  # still shared
+
+
+def test_wires_reference_extracted_signals_and_outputs():
+    trees = {
+        "x": OrOp(AndOp(a, b), c),
+        "y": AndOp(OrOp(c, AndOp(b, a)), XorOp(d, AndOp(a, b))),
+        "z": OrOp(AndOp(b, a), c),  # the same function as x
+    }
+    result = eliminate_common_subexpressions(trees, as_wires=True, reserved={"cse0"})
+    assert list(result.signals) == ["cse1"]
+    assert result.signals["cse1"] == AndOp(a, b)
+    y = result.outputs["y"]
+    assert y.a == LogicVar("x") and y.b == XorOp(d, LogicVar("cse1"))
+    assert result.outputs["z"] == LogicVar("x")
+    assert result.outputs["x"] == OrOp(LogicVar("cse1"), c)
+
+    # inlining the wires again gives back the original functions
+    defs = {**result.signals, **result.outputs}
+    for name, tree in trees.items():
+        assert truth_tables_equal(tree, resolve_signal_vars(defs[name], defs))
+
+
+def test_cse_module_and_to_module():
+    mod = lower_sv_text_to_logic(SV)["m"]
+    result = cse_module(mod, as_wires=True)
+    assert result.gates_after < result.gates_before
+    assert set(result.signals) == {"cse0", "cse1"}
+    new = cse_module(mod).to_module(mod)
+    assert set(new.assignments) == {"x", "y", "z"}
+    wired = result.to_module(mod)
+    assert set(wired.assignments) == {"x", "y", "z", "cse0", "cse1"}
+    assert wired.assignments["cse0"].lhs == LogicVar("cse0")
+    for bits in range(16):
+        env = {n: (bits >> i) & 1 for i, n in enumerate("abcd")}
+        for name in "xyz":
+            expected = evaluate(mod.assignments[name].rhs, env)
+            got = resolve_signal_vars(wired.assignments[name].rhs, wired.signal_map)
+            assert evaluate(got, env) == expected
+
+
+def test_cli_cse_wires_outputs_named_wires(tmp_path, capsys):
+    path = tmp_path / "m.sv"
+    path.write_text(SV)
+    main([str(path), "--cse_wires", "--to_sympy", "--no_cache"])
+    out, err = capsys.readouterr()
+    assert "cse: 2 shared subexpressions" in err
+    lines = [line for line in out.splitlines() if line.startswith("Sympy")]
+    assert [line.split()[3] for line in lines] == ["cse0:", "cse1:", "x:", "y:", "z:"]
+    assert "Sympy expression for z: ~cse1" in out
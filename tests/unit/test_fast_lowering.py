@@ -0,0 +1,129 @@
+from pathlib import Path
+
+import pytest
+
+from logictree.fast_lowering import FastPathUnsupported, lower_module_text
+from logictree.pipeline import lower_sv_file_to_logic, lower_sv_text_to_logic
+from logictree.utils.analysis import get_logic_hash
+
+pytestmark = [pytest.mark.unit]
+
+GOLDEN = Path(__file__).resolve().parents[2] / "golden_circuits"
+
+HEADER = (
+    "module m(input logic [3:0] a, b, input logic c, d,\n"
+    "         output logic y, output logic [1:0] z);\n"
+)
+
+EXPRESSIONS = [
+    "c",
+    "c & d",
+    "c | d",
+    "c ^ d",
+    "c ~^ d",
+    "!c",
+    "~c",
+    "-c",
+    "(c)",
+    "4'b1010",
+    "8'hA5",
+    "3'd5",
+    "7",
+    "a[2]",
+    "a[3:1]",
+    "{a[0], c, d}",
+    "a == 4'b0110",
+    "a != 4'd9",
+    "a[2:1] == 2'b10",
+    "a[3:2] != 2'b01",
+    "{c, d} == 2'b11",
+    "c == d",
+    "c != d",
+    "a == b",
+    # precedence and associativity, as ANTLR resolves them
+    "c | d & c",
+    "c & d | c ^ d ~^ c",
+    "c ^ d == c != d",
+    "c & d & c & d",
+    "~c & d",
+    "~a[0]",
+    "a & b[0]",
+    "a[0] & b | ~a[1] ^ (a == 4'b1010)",
+    "!(c | d) & -d",
+    "{a[0], {c, d}}[1]",
+]
+
+
+def _hash(tree):
+    try:
+        return get_logic_hash(tree)
+    except (AttributeError, TypeError):  # e.g. part-selects have no BDD encoding
+        return None
+
+
+def _summary(module_map):
+    return {
+        name: (
+            mod.ports,
+            mod.signal_map,
+            mod.vector_widths,
+            {
+                lhs: (repr(a.lhs), str(a.rhs), _hash(a.rhs))
+                for lhs, a in mod.assignments.items()
+            },
+        )
+        for name, mod in module_map.items()
+    }
+
+
+def _assert_same(src):
+    expected = _summary(lower_sv_text_to_logic(src))
+    mod = lower_module_text(src)
+    assert _summary({mod.name: mod}) == expected
+    assert _summary(lower_sv_text_to_logic(src, fast=True)) == expected
+
+
+@pytest.mark.parametrize("expr", EXPRESSIONS)
+def test_expression_matches_antlr_path(expr):
+    _assert_same(HEADER + f"  assign y = {expr};\nendmodule\n")
+
+
+def test_lvalues_nets_and_comments_match_antlr_path():
+    _assert_same(
+        HEADER + "  logic t, u;\n"
+        "  wire v; // trailing comment\n"
+        "  /* block\n     comment */ assign z [ 0 ] = c;\n"
+        "  assign z[1:1] = d;\n"
+        "  assign t = c & d;\n"
+        "endmodule\n"
+    )
+
+
+@pytest.mark.parametrize(
+    "src",
+    [
+        HEADER + "  always_comb begin y = c; end\nendmodule\n",
+        HEADER + "  logic [3:0] w;\nendmodule\n",
+        HEADER + "  assign y = 4'bx01x;\nendmodule\n",
+        HEADER + "  assign y = a[c];\nendmodule\n",
+        HEADER + "  assign y = c &;\nendmodule\n",
+        HEADER + "  assign y = c;\nendmodule\nmodule n(); endmodule\n",
+    ],
+    ids=["always_comb", "ranged_net", "xz_literal", "var_index", "syntax", "two"],
+)
+def test_unsupported_modules_are_declined(src):
+    with pytest.raises(FastPathUnsupported):
+        lower_module_text(src)
+
+
+def test_pipeline_falls_back_per_module(tmp_path):
+    path = tmp_path / "mixed.sv"
+    path.write_text(
+        (GOLDEN / "rv_alu_decode_simple.sv").read_text()
+        + (GOLDEN / "expr_simp.sv").read_text()
+    )
+    timings = []
+    fast = lower_sv_file_to_logic(str(path), timings=timings, fast=True)
+    assert _summary(fast) == _summary(lower_sv_file_to_logic(str(path)))
+    modes = {t.source.rsplit(":", 1)[1]: t.mode for t in timings}
+    assert modes["expr_simp"] == "fast"
@@ -0,0 +1,56 @@
+import copy
+import pickle
+
+import pytest
+
+from logictree.nodes.ops.comparison import EqOp, NeqOp
+from logictree.nodes.ops.gates import AndOp, NandOp, NorOp, NotOp, OrOp, XnorOp, XorOp
+from logictree.nodes.ops.ops import LogicConst, LogicVar
+
+pytestmark = [pytest.mark.unit]
+
+BINARY = [AndOp, OrOp, XorOp, XnorOp, NandOp, NorOp, EqOp, NeqOp]
+
+
+@pytest.mark.parametrize("cls", BINARY + [NotOp])
+def test_gates_have_no_instance_dict(cls):
+    a, b = LogicVar("a"), LogicVar("b")
+    node = cls(a) if cls is NotOp else cls(a, b)
+    assert not hasattr(node, "__dict__")
+    with pytest.raises(AttributeError):
+        node.scratch = 1
+
+
+def test_named_children_are_views_of_one_tuple():
+    a, b = LogicVar("a"), LogicConst(1)
+    g = AndOp(a, b)
+    assert (g.a, g.b) == (a, b)
+    assert g.children == [a, b] and g.operands == [a, b]
+    assert g.inputs() == [a, b] and g._inputs == [a, b]
+
+    n = NotOp(g)
+    assert n.operand is n.child is g
+    assert n._kids == (g,)
+
+    eq = EqOp(a, b)
+    assert (eq.lhs, eq.rhs) == (a, b)
+    assert str(eq) == "(a == 1'd1)"
+
+
+def test_metadata_is_allocated_on_first_use():
+    g = OrOp(LogicVar("a"), LogicVar("b"))
+    assert g._meta is None
+    g.metadata["origin"] = "rtl"
+    assert g.metadata == {"origin": "rtl"}
+    g.metadata = {"x": 1}
+    assert g._meta == {"x": 1}
+
+
+def test_copy_and_pickle_round_trip():
+    tree = NotOp(XorOp(LogicVar("a"), EqOp(LogicVar("b"), LogicConst(0))))
+    tree.metadata["k"] = 1
+    for clone in (copy.deepcopy(tree), pickle.loads(pickle.dumps(tree))):
+        assert str(clone) == str(tree)
+        assert clone.operand.b.lhs.name == "b"
+        assert clone.metadata == {"k": 1}
+        assert clone.depth == tree.depth == 3
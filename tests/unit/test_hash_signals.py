@@ -0,0 +1,44 @@
+import pytest
+
+from logictree.nodes import AndOp, LogicAssign, LogicVar, NotOp, OrOp, XorOp
+from logictree.utils import analysis
+from logictree.utils.analysis import get_logic_hash, hash_signals
+
+pytestmark = [pytest.mark.unit]
+
+
+def _signals():
+    a, b, c, d = (LogicVar(n) for n in "abcd")
+    shared = XorOp(a, OrOp(b, c))
+    wide = shared
+    for v in (d, a, b, c) * 5:
+        wide = XorOp(AndOp(wide, v), NotOp(v))
+    return {
+        "y": LogicAssign(lhs=LogicVar("y"), rhs=AndOp(shared, d)),
+        "z": OrOp(shared, NotOp(d)),
+        "w": wide,
+        "k": LogicVar("a"),
+    }
+
+
+def test_in_process_hashes_match_get_logic_hash():
+    signals = _signals()
+    hashes = hash_signals(signals, jobs=1)
+    assert list(hashes) == ["y", "z", "w", "k"]
+    assert hashes["y"] == get_logic_hash(signals["y"].rhs)
+    assert hashes["w"] == get_logic_hash(signals["w"])
+
+
+def test_pool_gives_the_same_hashes(monkeypatch):
+    signals = _signals()
+    serial = hash_signals(signals, jobs=1)
+    monkeypatch.setattr(analysis, "PARALLEL_HASH_MIN_NODES", 0)
+    assert hash_signals(signals, jobs=2) == serial
+
+
+def test_chunks_balance_cone_sizes():
+    sizes = {"big": 100, "m1": 50, "m2": 45, "s1": 5, "s2": 4}
+    chunks = analysis._chunk_by_cone_size(sizes, 2)
+    loads = sorted(sum(sizes[n] for n in c) for c in chunks)
+    assert loads == [100, 104]
+    assert analysis._chunk_by_cone_size({"x": 1}, 4) == [["x"]]
@@ -0,0 +1,51 @@
+import importlib.util
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytestmark = [pytest.mark.unit]
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _bench():
+    spec = importlib.util.spec_from_file_location(
+        "bench_import_time", ROOT / "scripts" / "bench_import_time.py"
+    )
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _loaded_after(code):
+    out = subprocess.run(
+        [sys.executable, "-c", code + "\nimport sys; print(' '.join(sys.modules))"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=ROOT / "src",
+    ).stdout.split()
+    return {name.split(".")[0] for name in out}
+
+
+@pytest.mark.parametrize("module", ["cli.main", "logictree", "logictree.pipeline"])
+def test_heavy_backends_are_not_imported_eagerly(module):
+    heavy = set(_bench().HEAVY_MODULES)
+    assert not heavy & _loaded_after(f"import {module}")
+
+
+def test_backends_load_when_their_feature_runs():
+    code = (
+        "from logictree.nodes import LogicVar\n"
+        "from logictree.utils.display import to_sympy_expr\n"
+        "to_sympy_expr(LogicVar('x'))"
+    )
+    assert "sympy" in _loaded_after(code)
+
+
+def test_importtime_rows_are_parsed():
+    rows = _bench().measure("logictree.nodes")
+    assert rows[-1][0] == "logictree.nodes"
+    assert all(self_us <= cum_us for _, self_us, cum_us in rows)
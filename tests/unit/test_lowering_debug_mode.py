@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import pytest
+
+import logictree.utils.debug as debug_utils
+from logictree.pipeline import _lower_all_modules
+from logictree.SVToLogicTreeLowerer import SVToLogicTreeLowerer
+from logictree.utils.analysis import get_logic_hash
+from sv_parser.parse import parse_sv_file
+from sv_parser.SystemVerilogSubsetParser import SystemVerilogSubsetParser
+
+pytestmark = [pytest.mark.unit]
+
+GOLDEN = Path(__file__).resolve().parents[2] / "golden_circuits"
+
+
+def _lower(path, debug):
+    tree = parse_sv_file(str(path))
+    ctx = next(
+        c
+        for c in tree.getChildren()
+        if isinstance(c, SystemVerilogSubsetParser.Module_declarationContext)
+    )
+    mod = SVToLogicTreeLowerer(debug=debug).visitModule_declaration(ctx)
+    return {n: get_logic_hash(a.rhs) for n, a in mod.assignments.items()}
+
+
+@pytest.mark.parametrize("name", ["rv_alu_decode_simple.sv", "if_tree_simple.sv"])
+def test_fast_and_debug_lowering_agree(name):
+    assert _lower(GOLDEN / name, debug=False) == _lower(GOLDEN / name, debug=True)
+
+
+def test_integrity_checks_only_run_in_debug_mode(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        debug_utils, "assert_no_fields", lambda obj, name="root": calls.append(name)
+    )
+    _lower(GOLDEN / "expr_simp.sv", debug=False)
+    assert calls == []
+    _lower(GOLDEN / "expr_simp.sv", debug=True)
+    assert calls == ["assign_tree"]
+
+
+def test_debug_flag_from_environment(monkeypatch):
+    monkeypatch.delenv("LOGICTREE_DEBUG_LOWERING", raising=False)
+    assert SVToLogicTreeLowerer().debug is False
+    monkeypatch.setenv("LOGICTREE_DEBUG_LOWERING", "1")
+    assert SVToLogicTreeLowerer().debug is True
+    # the pipeline's lowerer picks the flag up too
+    assert _lower_all_modules(parse_sv_file(str(GOLDEN / "expr_simp.sv")))
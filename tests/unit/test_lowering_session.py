@@ -0,0 +1,88 @@
+import pytest
+
+import logictree.pipeline as pipeline
+from logictree.session import LoweringSession
+
+pytestmark = [pytest.mark.unit]
+
+A = "module a(input logic x, output logic y);\n  assign y = ~x;\nendmodule\n"
+B = "module b(input logic p, q, output logic r);\n  assign r = p & q;\nendmodule\n"
+C = "module c(input logic s, output logic t);\n  assign t = s;\nendmodule\n"
+
+
+@pytest.fixture
+def parsed(monkeypatch):
+    """Names of the modules that go through the ANTLR front end."""
+    seen = []
+    real_parse = pipeline.parse_sv_text
+
+    def spy(text, **kw):
+        seen.append(kw["source"].rsplit(":", 1)[1])
+        return real_parse(text, **kw)
+
+    monkeypatch.setattr(pipeline, "parse_sv_text", spy)
+    return seen
+
+
+def test_only_edited_modules_are_relowered(parsed):
+    session = LoweringSession()
+    first = session.update_text(A + B + C, "f.sv")
+    assert first.added == ["a", "b", "c"] and parsed == ["a", "b", "c"]
+    b_module = session.module("b")
+
+    parsed.clear()
+    edited = A + B + C.replace("assign t = s;", "assign t = ~s;")
+    update = session.update_text("// header\n" + edited, "f.sv")
+    assert parsed == ["c"]
+    assert (update.changed, update.unchanged, update.dirty) == (
+        ["c"],
+        ["a", "b"],
+        ["c"],
+    )
+    assert session.module("b") is b_module
+    assert (session.record("b").line, session.record("b").end_line) == (5, 7)
+
+
+def test_analyses_are_invalidated_per_module(parsed):
+    session = LoweringSession()
+    session.update_text(A + B, "f.sv")
+    calls = []
+
+    def rhs_text(mod, signal):
+        calls.append((mod.name, signal))
+        return str(mod.assignments[signal].rhs)
+
+    assert session.analysis("a", "y", "text", rhs_text) == "(~x)"
+    session.analysis("b", "r", "text", rhs_text)
+    session.analysis("a", "y", "text", rhs_text)
+    assert calls == [("a", "y"), ("b", "r")]
+
+    session.update_text(A.replace("~x", "x") + B, "f.sv")
+    assert session.analysis("a", "y", "text", rhs_text) == "x"
+    session.analysis("b", "r", "text", rhs_text)
+    assert calls == [("a", "y"), ("b", "r"), ("a", "y")]
+
+
+def test_removed_and_duplicate_modules(parsed, caplog):
+    session = LoweringSession(fast=True)
+    session.update_text(A + B, "f.sv")
+    assert parsed == []  # the fast path handled both
+
+    update = session.update_text(B, "f.sv")
+    assert update.removed == ["a"] and sorted(session.modules) == ["b"]
+
+    session.update_text(B + C, "g.sv")
+    assert "duplicate module 'b'" in caplog.text
+    assert session.record("b").source == "f.sv"
+    assert session.remove_source("f.sv").removed == ["b"]
+    assert sorted(session.modules) == ["c"]
+
+
+def test_update_file(tmp_path):
+    path = tmp_path / "top.sv"
+    path.write_text(A)
+    session = LoweringSession()
+    assert session.update_file(str(path)).added == ["a"]
+    path.write_text(A + B)
+    update = session.update_file(str(path))
+    assert (update.added, update.unchanged) == (["b"], ["a"])
@@ -0,0 +1,80 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+import logictree.pipeline as pipeline
+from logictree.pipeline import lower_sv_file_to_logic, lower_sv_files_to_logic
+from logictree.utils.module_cache import ModuleCache, get_default_cache
+from tests.utils.tree_helpers import module_map_hashes
+
+pytestmark = [pytest.mark.unit]
+
+GOLDEN = Path(__file__).resolve().parents[2] / "golden_circuits"
+
+
+@pytest.fixture
+def sv_file(tmp_path):
+    path = tmp_path / "rv.sv"
+    shutil.copy(GOLDEN / "rv_alu_decode_simple.sv", path)
+    return path
+
+
+def test_second_lowering_skips_the_front_end(tmp_path, sv_file, monkeypatch):
+    cache = ModuleCache(tmp_path / "cache")
+    first = lower_sv_file_to_logic(str(sv_file), cache=cache)
+    assert len(list(cache.dir.glob("*.ltc"))) == 1
+
+    def no_parse(*_):
+        raise AssertionError("front end should not run on a cache hit")
+
+    monkeypatch.setattr(pipeline, "parse_sv_text", no_parse)
+    again = lower_sv_files_to_logic([str(sv_file)], jobs=1, cache=cache)
+    assert module_map_hashes(again) == module_map_hashes(first)
+
+
+def test_changed_source_misses(tmp_path, sv_file):
+    cache = ModuleCache(tmp_path / "cache")
+    lower_sv_file_to_logic(str(sv_file), cache=cache)
+    sv_file.write_text(sv_file.read_text() + "\n// edited\n")
+    assert cache.get(sv_file.read_bytes()) is None
+    lower_sv_file_to_logic(str(sv_file), cache=cache)
+    assert len(list(cache.dir.glob("*.ltc"))) == 2
+
+
+def test_stale_versions_and_corrupt_entries_are_dropped(tmp_path, sv_file):
+    root = tmp_path / "cache"
+    stale = root / "v0.0.0-gdeadbeef-f0"
+    stale.mkdir(parents=True)
+    (stale / "x.ltc").write_bytes(b"old")
+
+    cache = ModuleCache(root)
+    lower_sv_file_to_logic(str(sv_file), cache=cache)
+    assert not stale.exists()
+
+    source = sv_file.read_bytes()
+    cache._path(source).write_bytes(b"not zlib")
+    assert cache.get(source) is None
+    assert not cache._path(source).exists()
+
+
+def test_only_tag_directories_are_deleted(tmp_path, sv_file):
+    root = tmp_path / "cache"
+    project = root / "precious_project"
+    project.mkdir(parents=True)
+    (project / "notes.txt").write_text("keep")
+
+    cache = ModuleCache(root)
+    lower_sv_file_to_logic(str(sv_file), cache=cache)
+    assert (project / "notes.txt").exists()
+    cache.clear()
+    assert not cache.dir.exists()
+    assert root.exists() and (project / "notes.txt").exists()
+
+
+def test_default_cache_location_and_opt_out(tmp_path, monkeypatch):
+    monkeypatch.setenv("LOGICTREE_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("LOGICTREE_NO_CACHE", raising=False)
+    assert get_default_cache().root == tmp_path / "logictree"
+    monkeypatch.setenv("LOGICTREE_NO_CACHE", "1")
+    assert get_default_cache() is None
@@ -0,0 +1,104 @@
+import io
+from pathlib import Path
+
+import pytest
+
+import logictree.pipeline as pipeline
+from logictree.pipeline import iter_sv_file_modules, lower_sv_file_to_logic
+from logictree.utils.module_cache import ModuleCache
+from sv_parser.split import split_modules
+from tests.utils.tree_helpers import assignment_hashes
+
+pytestmark = [pytest.mark.unit]
+
+GOLDEN = Path(__file__).resolve().parents[2] / "golden_circuits"
+
+SRC = """\
+// module fake(); endmodule  -- in a line comment
+module a(input logic x, output logic y);
+  assign y = ~x;
+endmodule
+/* module hidden(input logic x);
+   endmodule */
+module /* name follows */
+  b(input logic p, input logic q, output logic r);
+  logic my_module_endmodule;
+  assign r = p & q; endmodule module c(input logic s, output logic t);
+  assign t = s;
+endmodule
+"""
+
+
+def _lines(text):
+    return io.StringIO(text)
+
+
+def test_splits_on_real_module_boundaries_only():
+    pieces = list(split_modules(_lines(SRC)))
+    assert [(p.name, p.line) for p in pieces] == [("a", 2), ("b", 7), ("c", 10)]
+    assert pieces[0].text == (
+        "module a(input logic x, output logic y);\n  assign y = ~x;\nendmodule"
+    )
+    assert pieces[1].text.startswith("module /* name follows */\n  b(")
+    assert pieces[1].text.endswith("assign r = p & q; endmodule")
+    assert pieces[2].text.startswith("module c(") and pieces[2].column == 30
+
+
+def test_only_keeps_requested_modules():
+    assert [p.name for p in split_modules(_lines(SRC), only={"c"})] == ["c"]
+
+
+def test_unterminated_module_is_an_error():
+    with pytest.raises(ValueError, match="'a' at line 1 has no matching endmodule"):
+        list(split_modules(_lines("module a(input logic x);\n")))
+
+
+def test_streamed_modules_match_whole_file_lowering(tmp_path):
+    path = tmp_path / "multi.sv"
+    path.write_text(
+        SRC + (GOLDEN / "rv_alu_decode_simple.sv").read_text(encoding="ascii")
+    )
+    whole = lower_sv_file_to_logic(str(path))
+    timings = []
+    streamed = list(iter_sv_file_modules(str(path), timings=timings))
+    assert [name for name, _ in streamed] == list(whole)
+    for name, mod in streamed:
+        assert assignment_hashes(mod) == assignment_hashes(whole[name])
+    assert [t.source for t in timings] == [f"{path}:{n}" for n in whole]
+
+
+def test_top_parses_only_that_module(tmp_path, monkeypatch):
+    path = tmp_path / "multi.sv"
+    path.write_text(SRC)
+    parsed = []
+    real_parse = pipeline.parse_sv_text
+
+    def spy(text, **kw):
+        parsed.append(kw["source"])
+        return real_parse(text, **kw)
+
+    monkeypatch.setattr(pipeline, "parse_sv_text", spy)
+    [(name, mod)] = iter_sv_file_modules(str(path), top="b")
+    assert (name, sorted(mod.assignments)) == ("b", ["r"])
+    assert parsed == [f"{path}:b"]
+
+
+def test_per_module_cache_entries(tmp_path):
+    path = tmp_path / "multi.sv"
+    path.write_text(SRC)
+    cache = ModuleCache(tmp_path / "cache")
+    list(iter_sv_file_modules(str(path), cache=cache))
+    path.write_text(SRC.replace("assign t = s;", "assign t = ~s;"))
+    timings = []
+    list(iter_sv_file_modules(str(path), cache=cache, timings=timings))
+    assert [t.mode for t in timings] == ["cached", "cached", "SLL"]
+
+
+def test_parse_errors_report_file_line_numbers(tmp_path, capsys):
+    path = tmp_path / "bad.sv"
+    path.write_text(
+        SRC + "module d(input logic x, output logic y);\n"
+        "  assign y = x &;\nendmodule\n"
+    )
+    list(iter_sv_file_modules(str(path), top="d"))
+    assert "line 14:16 " in capsys.readouterr().err
@@ -0,0 +1,63 @@
+import logging
+from pathlib import Path
+
+import pytest
+
+from cli.main import build_parser
+from logictree.pipeline import (
+    lower_sv_file_to_logic,
+    lower_sv_files_to_logic,
+    read_filelist,
+)
+from tests.utils.tree_helpers import assignment_hashes
+
+pytestmark = [pytest.mark.unit]
+
+GOLDEN = Path(__file__).resolve().parents[2] / "golden_circuits"
+FILES = [
+    str(GOLDEN / "if_tree_simple.sv"),
+    str(GOLDEN / "rv_alu_decode_simple.sv"),
+    str(GOLDEN / "expr_simp.sv"),
+]
+
+
+def test_process_pool_matches_single_file_lowering():
+    merged = lower_sv_files_to_logic(FILES, jobs=2)
+    assert list(merged) == ["if_tree_simple", "rv_alu_decode", "expr_simp"]
+    for path in FILES:
+        for name, mod in lower_sv_file_to_logic(path).items():
+            assert assignment_hashes(merged[name]) == assignment_hashes(mod)
+
+
+def test_duplicate_modules_are_reported(caplog):
+    dup = [str(GOLDEN / "expr_simp.sv"), str(GOLDEN / "expr_const_simp.sv")]
+    with caplog.at_level(logging.WARNING, logger="logictree.pipeline"):
+        merged = lower_sv_files_to_logic(dup, jobs=1)
+    assert list(merged) == ["expr_simp"]
+    assert "expr_const_simp.sv" in caplog.text
+
+    with pytest.raises(ValueError, match="Duplicate module names"):
+        lower_sv_files_to_logic(dup, jobs=1, on_duplicate="error")
+
+
+def test_errors_name_the_failing_file(tmp_path):
+    bad = tmp_path / "empty.sv"
+    bad.write_text("// nothing here\n")
+    with pytest.raises(RuntimeError, match="empty.sv"):
+        lower_sv_files_to_logic([FILES[0], str(bad)], jobs=2)
+
+
+def test_filelist_and_cli_arguments(tmp_path):
+    (tmp_path / "sub").mkdir()
+    nested = tmp_path / "sub" / "more.f"
+    nested.write_text(f"{FILES[2]}\n")
+    top = tmp_path / "top.f"
+    top.write_text(
+        f"// design files\n+incdir+rtl\n{FILES[0]}\n\n-f sub/more.f\n# end\n"
+    )
+    assert read_filelist(str(top)) == [FILES[0], FILES[2]]
+
+    args = build_parser().parse_args([FILES[1], "-f", str(top), "-j", "4"])
+    assert args.filenames == [FILES[1]]
+    assert args.filelists == [str(top)]
+    assert args.jobs == 4
@@ -0,0 +1,87 @@
+import pytest
+
+from logictree.nodes.factory import NodeFactory, intern_tree
+from logictree.nodes.ops.comparison import EqOp
+from logictree.nodes.ops.gates import AndOp, NotOp, OrOp, XorOp
+from logictree.nodes.ops.ops import LogicConst, LogicVar
+from logictree.nodes.selects import BitSelect
+from logictree.transforms.signal_resolution import resolve_signal_vars
+
+pytestmark = [pytest.mark.unit]
+
+
+def test_leaves_are_interned():
+    f = NodeFactory()
+    assert f.var("a") is f.var("a")
+    assert f.var("a") is not f.var("b")
+    assert f.const(1) is f.const(1)
+    assert f.const(1, width=4) is not f.const(1)
+
+
+def test_commutative_ops_share_one_node():
+    f = NodeFactory()
+    a, b = f.var("a"), f.var("b")
+    assert f.and_(a, b) is f.and_(b, a)
+    assert f.xor(a, b) is f.xor(b, a)
+    assert f.and_(a, b) is not f.or_(a, b)
+
+
+def test_non_commutative_ops_keep_order():
+    f = NodeFactory()
+    a, b = f.var("a"), f.var("b")
+    assert f.eq(a, b) is f.eq(a, b)
+    assert f.eq(a, b) is not f.eq(b, a)
+
+
+def test_intern_collapses_repeated_subtrees_into_a_dag():
+    a, b, c = LogicVar("a"), LogicVar("b"), LogicVar("c")
+    tree = OrOp(AndOp(a, XorOp(b, c)), NotOp(AndOp(LogicVar("a"), XorOp(c, b))))
+
+    f = NodeFactory()
+    root = f.intern(tree)
+
+    left = root.a
+    right = root.b.operand
+    assert left is right
+    assert root.equals(tree)
+    # a, b, c, XOR, AND, NOT, OR
+    assert len(f) == 7
+
+
+def test_intern_adopts_nodes_with_canonical_children():
+    f = NodeFactory()
+    a = f.var("a")
+    n = NotOp(a)
+    assert f.intern(n) is n
+    assert f.intern(NotOp(a)) is n
+    assert f.intern(n) is n
+
+
+def test_intern_handles_selects():
+    s = LogicVar("s", width=4)
+    tree = AndOp(
+        EqOp(BitSelect(s, 0), LogicConst(1)), EqOp(BitSelect(s, 0), LogicConst(1))
+    )
+    root = intern_tree(tree)
+    assert root.a is root.b
+    assert root.a.lhs.base is root.b.lhs.base
+
+
+def test_intern_of_deep_chain_is_iterative():
+    node = LogicVar("x0")
+    for i in range(1, 5000):
+        node = AndOp(node, LogicVar(f"x{i % 7}"))
+    f = NodeFactory()
+    assert f.intern(node) is f.intern(node)
+
+
+def test_resolve_signal_vars_with_factory_shares_inlined_signal():
+    shared = AndOp(LogicVar("a"), LogicVar("b"))
+    signal_map = {"t": shared}
+    tree = OrOp(LogicVar("t"), NotOp(LogicVar("t")))
+
+    f = NodeFactory()
+    resolved = resolve_signal_vars(tree, signal_map, factory=f)
+
+    assert resolved.a is resolved.b.operand
+    assert resolved.a.equals(shared)
@@ -0,0 +1,67 @@
+import sys
+
+import pytest
+
+from logictree.nodes.control.case import CaseItem, CaseStatement
+from logictree.nodes.control.ifstatement import IfStatement
+from logictree.nodes.ops.comparison import EqOp
+from logictree.nodes.ops.gates import AndOp, NotOp, OrOp
+from logictree.nodes.ops.mux import LogicMux
+from logictree.nodes.ops.ops import LogicConst, LogicVar
+from logictree.nodes.selects import BitSelect, Concat, PartSelect
+from logictree.utils.serialize import logic_tree_to_json
+
+pytestmark = [pytest.mark.unit]
+
+DEEP = sys.getrecursionlimit() * 3
+
+
+def test_depth_is_cached_for_the_whole_subtree():
+    a, b = LogicVar("a"), LogicVar("b")
+    inner = AndOp(a, b)
+    root = OrOp(NotOp(inner), b)
+    assert root._depth_cache is None
+    assert root.depth == 3
+    assert inner._depth_cache == 1
+    assert root.delay == 3
+
+
+def test_free_vars_returns_the_same_cached_frozenset():
+    tree = AndOp(LogicVar("a"), EqOp(LogicVar("b"), LogicConst(1)))
+    fv = tree.free_vars()
+    assert isinstance(fv, frozenset)
+    assert fv is tree.free_vars()
+    assert {v.name for v in fv} == {"a", "b"}
+
+
+def test_metrics_on_structural_nodes():
+    s = LogicVar("s", width=4)
+    mux = LogicMux(BitSelect(s, 0), PartSelect(s, 3, 2), LogicConst(0))
+    assert mux.depth == 2
+    assert mux.delay == 2
+    assert mux.free_vars() is mux.free_vars()
+
+    cat = Concat([PartSelect(s, 3, 2), BitSelect(s, 1)])
+    assert (cat.depth, cat.delay) == (2, 1)
+    assert cat.free_vars() is cat.free_vars()
+
+    stmt = IfStatement(LogicVar("c"), NotOp(LogicVar("a")), LogicVar("b"))
+    assert (stmt.depth, stmt.delay) == (2, 2)
+
+    case = CaseStatement(
+        selector=LogicVar("sel"),
+        items=[CaseItem(labels=[LogicConst(0)], body=AndOp(LogicVar("a"), mux))],
+    )
+    assert case.depth == 4
+
+
+def test_deep_chain_metrics_and_serialization():
+    node = LogicVar("x0")
+    for i in range(1, DEEP):
+        node = AndOp(node, LogicVar(f"x{i % 3}"))
+    node = IfStatement(LogicVar("en"), node, None)
+
+    assert node.depth == DEEP
+    assert len(node.free_vars()) == 4
+    data = logic_tree_to_json(node)
+    assert data["depth"] == DEEP
@@ -0,0 +1,53 @@
+from pathlib import Path
+
+import pytest
+
+from logictree.pipeline import lower_sv_files_to_logic
+from logictree.utils.module_cache import ModuleCache
+from sv_parser.parse import parse_sv_file, parse_sv_text
+from sv_parser.SystemVerilogSubsetParser import SystemVerilogSubsetParser
+
+pytestmark = [pytest.mark.unit]
+
+GOLDEN = Path(__file__).resolve().parents[2] / "golden_circuits"
+
+
+def _tree_text(tree):
+    return tree.toStringTree(recog=SystemVerilogSubsetParser)
+
+
+@pytest.mark.parametrize(
+    "name", ["rv_alu_decode_simple.sv", "if_tree_simple.sv", "case_mux2_simp.sv"]
+)
+def test_sll_stage_matches_ll_parse(name):
+    timings = []
+    fast = parse_sv_file(str(GOLDEN / name), timings=timings)
+    full = parse_sv_file(str(GOLDEN / name), mode="ll", timings=timings)
+    assert _tree_text(fast) == _tree_text(full)
+    assert [t.mode for t in timings] == ["SLL", "LL"]
+    assert timings[0].tokens == timings[1].tokens > 0
+
+
+def test_syntax_error_falls_back_to_ll_with_same_diagnostics(capsys):
+    src = "module m(input logic a, output logic y);\n  assign y = a &;\nendmodule\n"
+    timings = []
+    parse_sv_text(src, mode="ll")
+    ll_errors = capsys.readouterr().err
+    parse_sv_text(src, timings=timings, source="bad.sv")
+    assert capsys.readouterr().err == ll_errors != ""
+    assert (timings[0].source, timings[0].mode) == ("bad.sv", "LL")
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError, match="parse mode"):
+        parse_sv_text("module m; endmodule", mode="sll-only")
+
+
+def test_pipeline_collects_per_file_timings(tmp_path):
+    files = [str(GOLDEN / "expr_simp.sv"), str(GOLDEN / "if_tree_simple.sv")]
+    cache = ModuleCache(tmp_path)
+    timings = []
+    lower_sv_files_to_logic(files, jobs=2, cache=cache, timings=timings)
+    lower_sv_files_to_logic(files[:1], jobs=1, cache=cache, timings=timings)
+    assert [t.source for t in timings] == files + files[:1]
+    assert [t.mode for t in timings] == ["SLL", "SLL", "cached"]
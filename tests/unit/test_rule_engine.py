@@ -0,0 +1,113 @@
+import random
+
+import pytest
+
+from logictree.nodes import (
+    AndOp,
+    LogicConst,
+    LogicMux,
+    LogicVar,
+    NandOp,
+    NorOp,
+    NotOp,
+    OrOp,
+    XnorOp,
+    XorOp,
+)
+from logictree.transforms.rule_engine import DEFAULT_RULES, RewriteEngine, Rule
+from logictree.transforms.simplify import simplify
+from logictree.utils.analysis import gate_count
+from logictree.utils.truth_table import truth_tables_equal
+from tests.utils.tree_helpers import random_tree, same_structural_hash
+
+pytestmark = [pytest.mark.unit]
+
+a, b, c, d = (LogicVar(n) for n in "abcd")
+ZERO, ONE = LogicConst(0), LogicConst(1)
+OPS = [AndOp, OrOp, XorOp, XnorOp, NandOp, NorOp, NotOp]
+
+
+@pytest.mark.parametrize(
+    "tree, expected, rule",
+    [
+        (OrOp(a, AndOp(a, b)), a, "absorption"),
+        (AndOp(OrOp(b, a), a), a, "absorption"),
+        (OrOp(b, OrOp(c, AndOp(d, b))), OrOp(b, c), "absorption"),
+        (AndOp(a, NotOp(a)), ZERO, "complement"),
+        (XnorOp(NotOp(a), a), ZERO, "complement"),
+        (AndOp(AndOp(a, b), NotOp(a)), ZERO, "flatten"),
+        (OrOp(OrOp(a, b), OrOp(c, a)), OrOp(OrOp(a, b), c), "flatten"),
+        (XorOp(XorOp(a, b), XorOp(c, a)), XorOp(b, c), "flatten"),
+        (XorOp(XorOp(NotOp(a), b), a), NotOp(b), "flatten"),
+        (AndOp(NotOp(a), NotOp(b)), NotOp(OrOp(a, b)), "de_morgan"),
+        (NorOp(NotOp(a), NotOp(b)), AndOp(a, b), "de_morgan"),
+        (NandOp(b, b), NotOp(b), "idempotence"),
+    ],
+)
+def test_rules(tree, expected, rule):
+    engine = RewriteEngine()
+    result = engine.run(tree)
+    assert same_structural_hash(result, expected)
+    assert engine.hits[rule] >= 1
+
+
+def test_rules_compose_to_a_fixpoint():
+    # ((a & 1) | (a & b)) ^ (c ^ c): constants, then absorption, then XOR
+    tree = XorOp(OrOp(AndOp(a, ONE), AndOp(a, b)), XorOp(c, c))
+    engine = RewriteEngine()
+    assert engine.run(tree) is a
+    assert set(engine.hits) == {"constants", "absorption", "idempotence"}
+
+
+def test_untouched_subtrees_are_kept_by_identity():
+    keep = AndOp(a, b)
+    other = LogicMux(c, a, b)  # not a gate: kept whole
+    tree = OrOp(keep, AndOp(other, ONE))
+    result = simplify(tree)
+    assert result.a is keep and result.b is other
+    assert simplify(keep) is keep
+
+    engine = RewriteEngine()
+    engine.run(result)
+    assert not engine.hits
+
+
+def test_random_trees_keep_their_function_and_never_grow():
+    rng = random.Random(11)
+    engine = RewriteEngine()
+    for _ in range(300):
+        tree = random_tree(rng, rng.randint(1, 5), OPS, [a, b, c, d, ZERO, ONE])
+        result = engine.run(tree)
+        assert truth_tables_equal(tree, result)
+        assert gate_count(result) <= gate_count(tree)
+        again = RewriteEngine()
+        assert again.run(result) is result and not again.hits
+
+
+def test_rule_sets_are_pluggable():
+    # XNOR(x, 0) is handled by constants; add a rule that removes XNOR gates
+    def xnor_to_xor(node):
+        return NotOp(XorOp(*node.children))
+
+    engine = RewriteEngine(rules=[Rule("xnor", (XnorOp,), xnor_to_xor)])
+    result = engine.run(XnorOp(a, b))
+    assert isinstance(result, NotOp) and isinstance(result.operand, XorOp)
+    assert engine.hits == {"xnor": 1}
+
+    local = RewriteEngine(rules=[r for r in DEFAULT_RULES if r.name == "constants"])
+    assert same_structural_hash(local.run(OrOp(a, AndOp(a, b))), OrOp(a, AndOp(a, b)))
+
+
+def test_a_rule_that_does_not_simplify_is_reported():
+    flip = Rule("flip", (AndOp,), lambda n: AndOp(n.b, n.a))
+    with pytest.raises(RuntimeError, match="no fixpoint"):
+        RewriteEngine(rules=[flip], max_rewrites=10).run(AndOp(a, b))
+
+
+def test_long_chains_stay_linear():
+    chain = a
+    for i in range(10_000):
+        chain = OrOp(chain, LogicVar(f"x{i % 20}"))
+    assert simplify(AndOp(chain, a)) is a  # absorbed: a & (a | ...)
+    flat = simplify(chain)
+    assert gate_count(flat) == 20  # a | x0 | ... | x19, duplicates dropped
@@ -0,0 +1,96 @@
+import pytest
+
+from cli.main import main
+from logictree.eval import evaluate
+from logictree.nodes import (
+    AndOp,
+    BitSelect,
+    LogicAssign,
+    LogicMux,
+    LogicVar,
+    NotOp,
+    OrOp,
+    XorOp,
+)
+from logictree.transforms.signal_resolution import (
+    CombinationalLoopError,
+    SignalResolver,
+    resolve_signal_vars,
+)
+from logictree.utils.traverse import iter_postorder
+
+pytestmark = [pytest.mark.unit]
+
+x, y, z = (LogicVar(n) for n in "xyz")
+
+LOOP_SV = """
+module m(input logic a, output logic y);
+  logic q;
+  always_comb begin
+    q = ~(a & q);
+  end
+  assign y = q | a;
+endmodule
+"""
+
+
+def _reconvergent(n):
+    # every s_i reads s_{i-1} twice: as a tree, s_n has ~2**n nodes
+    signal_map = {"s0": x, "x": x, "y": y}
+    for i in range(1, n + 1):
+        prev = LogicVar(f"s{i - 1}")
+        signal_map[f"s{i}"] = OrOp(AndOp(prev, y), XorOp(prev, x))
+    return signal_map
+
+
+def test_reconvergent_signals_resolve_to_a_dag():
+    signal_map = _reconvergent(60)
+    resolved = resolve_signal_vars(LogicVar("s60"), signal_map)
+    assert len(list(iter_postorder(resolved))) < 5 * 60
+    # s_i = (s & y) | (s ^ x): with x=1, y=0 each step inverts, 60 is even
+    assert evaluate(resolved, {"x": 1, "y": 0}) == 1
+    assert evaluate(resolved, {"x": 0, "y": 1}) == 0
+
+
+def test_resolver_shares_signals_between_calls():
+    resolver = SignalResolver(_reconvergent(20))
+    s10 = resolver.resolve(LogicVar("s10"))
+    assert resolver.resolve(LogicVar("s10")) is s10
+    s20 = resolver.resolve(AndOp(LogicVar("s20"), z))
+    assert any(node is s10 for node in iter_postorder(s20))
+
+
+def test_loops_report_the_signal_path():
+    signal_map = {"a": AndOp(LogicVar("b"), x), "b": OrOp(LogicVar("c"), y)}
+    signal_map["c"] = NotOp(LogicVar("a"))
+    resolver = SignalResolver(signal_map)
+    with pytest.raises(CombinationalLoopError) as err:
+        resolver.resolve(OrOp(z, LogicVar("b")))
+    assert err.value.path == ["b", "c", "a", "b"]
+    assert "b -> c -> a -> b" in str(err.value)
+    assert isinstance(err.value, ValueError)
+    assert resolver.find_loop(z) is None
+
+    self_loop = {"q": NotOp(AndOp(x, LogicVar("q")))}
+    with pytest.raises(CombinationalLoopError, match="q -> q"):
+        resolve_signal_vars(LogicVar("q"), self_loop)
+
+
+def test_statements_and_muxes_are_resolved_selects_are_kept():
+    signal_map = {"t": AndOp(x, y), "v": OrOp(x, y)}
+    sel = BitSelect(LogicVar("v", width=4), 2)
+    tree = LogicAssign(lhs=LogicVar("o"), rhs=LogicMux(LogicVar("t"), sel, z))
+    resolved = resolve_signal_vars(tree, signal_map)
+    assert resolved.lhs == LogicVar("o")
+    assert resolved.rhs.selector is signal_map["t"]
+    assert resolved.rhs.if_true is sel
+    untouched = AndOp(x, z)
+    assert resolve_signal_vars(untouched, signal_map) is untouched
+
+
+def test_cli_rejects_combinational_loops(tmp_path, capsys):
+    path = tmp_path / "m.sv"
+    path.write_text(LOOP_SV)
+    with pytest.raises(SystemExit):
+        main([str(path), "--no_cache"])
+    assert "combinational loop q -> q" in capsys.readouterr().err
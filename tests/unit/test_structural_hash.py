@@ -0,0 +1,137 @@
+import json
+import random
+
+import pytest
+
+from logictree.nodes import (
+    AndOp,
+    BitSelect,
+    CaseItem,
+    CaseStatement,
+    LogicAssign,
+    LogicConst,
+    LogicMux,
+    LogicVar,
+    NandOp,
+    NotOp,
+    OrOp,
+    PartSelect,
+    XnorOp,
+    XorOp,
+)
+from logictree.utils.compare import compare_logic_trees
+from logictree.utils.structural_hash import structural_hash
+from logictree.utils.truth_table import truth_tables_equal
+from logictree.utils.utils_cli import check_against_golden, save_golden
+from tests.utils.tree_helpers import random_tree, same_structural_hash
+
+pytestmark = [pytest.mark.unit]
+
+a, b, c, d = (LogicVar(n) for n in "abcd")
+ZERO, ONE = LogicConst(0), LogicConst(1)
+OPS = [AndOp, OrOp, XorOp, XnorOp, NandOp, NotOp, LogicMux]
+
+
+@pytest.mark.parametrize(
+    "t1, t2",
+    [
+        (AndOp(a, AndOp(c, b)), AndOp(AndOp(b, a), c)),
+        (OrOp(XorOp(a, b), c), OrOp(c, XorOp(b, a))),
+        (XnorOp(a, b), NotOp(XorOp(b, a))),
+        (NandOp(a, b), NotOp(AndOp(a, b))),
+        (NotOp(NotOp(a)), a),
+        (XorOp(NotOp(a), b), NotOp(XorOp(a, b))),
+        (XorOp(XorOp(a, NotOp(b)), XnorOp(c, d)), XorOp(XorOp(a, b), XorOp(c, d))),
+        (AndOp(a, ONE), a),
+        (AndOp(OrOp(a, b), ZERO), ZERO),
+        (OrOp(AndOp(a, ONE), AndOp(b, c)), OrOp(AndOp(c, b), a)),
+        (XorOp(a, ONE), NotOp(a)),
+        (LogicMux(ONE, a, b), a),
+        (LogicMux(NotOp(c), a, b), LogicMux(c, b, a)),
+        (LogicAssign(lhs=LogicVar("y"), rhs=AndOp(a, b)), AndOp(b, a)),
+        (BitSelect(LogicVar("v", width=4), 2), LogicVar("v[2]")),
+    ],
+)
+def test_normalizations(t1, t2):
+    assert same_structural_hash(t1, t2)
+
+
+@pytest.mark.parametrize(
+    "t1, t2",
+    [
+        (AndOp(a, b), OrOp(a, b)),
+        (NandOp(a, b), AndOp(a, b)),
+        (AndOp(a, NandOp(b, c)), AndOp(AndOp(a, b), c)),
+        (LogicMux(c, a, b), LogicMux(c, b, a)),
+        (XorOp(a, b), XorOp(a, c)),
+    ],
+)
+def test_different_functions_hash_differently(t1, t2):
+    assert not same_structural_hash(t1, t2)
+
+
+def test_equal_hashes_imply_equal_functions():
+    rng = random.Random(7)
+    trees = [
+        random_tree(rng, rng.randint(1, 4), OPS, [a, b, c, d, ZERO, ONE])
+        for _ in range(400)
+    ]
+    by_hash = {}
+    for t in trees:
+        by_hash.setdefault(structural_hash(t), []).append(t)
+    collisions = [group for group in by_hash.values() if len(group) > 1]
+    assert collisions  # the normalizations do merge some of them
+    for group in collisions:
+        assert all(truth_tables_equal(group[0], t) for t in group[1:])
+
+
+def test_form_is_cached_and_deep_chains_do_not_recurse():
+    chain = a
+    for i in range(50_000):
+        chain = XorOp(chain, LogicVar(f"x{i}"))
+    first = structural_hash(chain)
+    assert chain._shash_cache is not None
+    assert structural_hash(chain) == first
+    assert structural_hash(XorOp(LogicVar("x0"), chain)) != first
+
+
+def test_unsupported_nodes_fall_back_in_compare():
+    case = CaseStatement(selector=a, items=[CaseItem(labels=[ONE], body=b)])
+    with pytest.raises(TypeError):
+        structural_hash(case)
+    assert compare_logic_trees(AndOp(a, AndOp(b, c)), AndOp(c, AndOp(a, b)))
+    assert compare_logic_trees(
+        XorOp(a, b), XnorOp(a, NotOp(b)), method="structural_hash"
+    )
+    # absorption is semantic: the structural tier misses, the BDD tier decides
+    assert not same_structural_hash(OrOp(a, AndOp(a, b)), a)
+    assert compare_logic_trees(OrOp(a, AndOp(a, b)), a)
+
+
+def test_golden_check_uses_the_structural_hash_first(tmp_path):
+    path = str(tmp_path / "y.json")
+    save_golden("y", AndOp(a, OrOp(b, c)), path=path)
+    with open(path) as f:
+        data = json.load(f)
+    data["hash"] = "stale"  # the BDD tier is not consulted on a match
+    with open(path, "w") as f:
+        json.dump(data, f)
+    assert check_against_golden("y", AndOp(OrOp(c, b), a), path=path)
+    # equivalent but differently structured: decided by the BDD hash
+    assert not check_against_golden("y", OrOp(AndOp(a, b), AndOp(a, c)), path=path)
+    save_golden("y", AndOp(a, OrOp(b, c)), path=path)
+    assert check_against_golden("y", OrOp(AndOp(a, b), AndOp(a, c)), path=path)
+
+
+def test_constants_on_vectors_are_not_folded():
+    x = PartSelect(LogicVar("x", width=2), 1, 0)
+    masked = AndOp(x, ONE)
+    assert not same_structural_hash(masked, x)
+    assert not compare_logic_trees(masked, x, method="structural_hash")
+    assert not same_structural_hash(XorOp(x, ONE), NotOp(x))
+    assert not same_structural_hash(OrOp(AndOp(x, a), b), OrOp(x, OrOp(a, b)))
+    # still order-insensitive, and 1-bit gates still fold
+    assert same_structural_hash(AndOp(x, ONE), AndOp(ONE, x))
+    assert same_structural_hash(
+        AndOp(BitSelect(LogicVar("x", width=2), 0), ONE), LogicVar("x[0]")
+    )
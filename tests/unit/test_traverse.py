@@ -0,0 +1,115 @@
+import sys
+
+import pytest
+
+from logictree.eval import evaluate
+from logictree.nodes.control.case import CaseItem, CaseStatement
+from logictree.nodes.control.ifstatement import IfStatement
+from logictree.nodes.ops.gates import AndOp, NotOp, OrOp, XorOp
+from logictree.nodes.ops.ops import LogicConst, LogicVar
+from logictree.transforms.case_to_if import transform_cases
+from logictree.transforms.signal_resolution import resolve_signal_vars
+from logictree.transforms.simplify import simplify
+from logictree.utils.analysis import count_gate_type, get_logic_hash
+from logictree.utils.traverse import (
+    collect_logic_vars,
+    fold,
+    iter_postorder,
+    iter_preorder,
+    rewrite,
+)
+
+pytestmark = [pytest.mark.unit]
+
+DEEP = sys.getrecursionlimit() * 3
+
+
+def _deep_chain(n=DEEP):
+    node = LogicVar("x0")
+    for i in range(1, n):
+        node = XorOp(node, AndOp(LogicVar(f"x{i % 5}"), LogicConst(1)))
+    return node
+
+
+def test_postorder_visits_children_first_and_shared_nodes_once():
+    shared = AndOp(LogicVar("a"), LogicVar("b"))
+    root = OrOp(shared, NotOp(shared))
+    order = list(iter_postorder(root))
+    assert order.count(shared) == 1
+    assert order.index(shared) < order.index(root.b) < order.index(root)
+    assert order[-1] is root
+    assert list(iter_preorder(root))[0] is root
+
+
+def test_fold_memo_is_reused_between_calls():
+    shared = AndOp(LogicVar("a"), LogicVar("b"))
+    calls = []
+
+    def visit(node, kids):
+        calls.append(node)
+        return 1 + sum(kids)
+
+    memo = {}
+    assert fold(OrOp(shared, shared), visit, memo=memo) == 7
+    calls.clear()
+    fold(NotOp(shared), visit, memo=memo)
+    assert len(calls) == 1  # only the new NOT
+
+
+def test_rewrite_keeps_unchanged_subtrees():
+    keep = AndOp(LogicVar("a"), LogicVar("b"))
+    root = OrOp(keep, NotOp(LogicVar("c")))
+
+    def visit(node):
+        if isinstance(node, LogicVar) and node.name == "c":
+            return LogicVar("d")
+        return node
+
+    new = rewrite(root, visit)
+    assert new is not root
+    assert new.a is keep
+    assert new.b.operand.name == "d"
+
+
+def test_cycles_are_reported():
+    signal_map = {"a": NotOp(LogicVar("b")), "b": NotOp(LogicVar("a"))}
+    with pytest.raises(ValueError, match="Cycle"):
+        resolve_signal_vars(LogicVar("a"), signal_map)
+
+
+def test_passes_handle_chains_deeper_than_the_recursion_limit():
+    tree = _deep_chain()
+    env = {f"x{i}": 1 for i in range(5)}
+
+    simplified = simplify(tree)
+    assert count_gate_type(simplified, "AND") == 0
+    assert count_gate_type(tree, "AND") == DEEP - 1
+    assert evaluate(simplified, env) == evaluate(tree, env) == DEEP % 2
+    assert len(get_logic_hash(tree)) == 64
+    assert {v.name for v in collect_logic_vars(tree)} == {f"x{i}" for i in range(5)}
+    assert transform_cases(tree) is tree
+
+
+def test_resolve_long_signal_chain():
+    signal_map = {"s0": NotOp(LogicVar("in"))}
+    for i in range(1, DEEP):
+        signal_map[f"s{i}"] = NotOp(LogicVar(f"s{i - 1}"))
+    signal_map["in"] = LogicVar("in")  # ports map to themselves
+
+    resolved = resolve_signal_vars(LogicVar(f"s{DEEP - 1}"), signal_map)
+    assert evaluate(resolved, {"in": 0}) == DEEP % 2
+
+
+def test_transform_cases_inside_if():
+    sel = LogicVar("sel")
+    case = CaseStatement(
+        selector=sel,
+        items=[
+            CaseItem(labels=[LogicConst(0)], body=LogicVar("a")),
+            CaseItem(labels=[LogicConst(1)], body=LogicVar("b")),
+        ],
+    )
+    tree = IfStatement(LogicVar("en"), case, LogicConst(0))
+    lowered = transform_cases(tree)
+    assert isinstance(lowered, IfStatement)
+    assert isinstance(lowered.then_branch, IfStatement)
@@ -0,0 +1,71 @@
+import itertools
+import time
+
+import pytest
+
+from logictree.eval import evaluate
+from logictree.nodes.ops.comparison import EqOp
+from logictree.nodes.ops.gates import AndOp, NotOp, OrOp, XorOp
+from logictree.nodes.ops.ops import LogicConst, LogicVar
+from logictree.nodes.selects import PartSelect
+from logictree.utils.compare import compare_logic_trees
+from logictree.utils.truth_table import truth_table
+
+pytestmark = [pytest.mark.unit]
+
+
+def _xor_chain(names):
+    node = LogicVar(names[0])
+    for name in names[1:]:
+        node = XorOp(node, LogicVar(name))
+    return node
+
+
+def test_table_matches_evaluate_for_every_minterm():
+    a, b, c = LogicVar("a"), LogicVar("b"), LogicVar("c")
+    tree = OrOp(AndOp(a, NotOp(b)), XorOp(b, NotOp(c)))
+    table = truth_table(tree)
+    assert table.inputs == ("a", "b", "c")
+    for m, bits in enumerate(itertools.product([0, 1], repeat=3)):
+        env = dict(zip(table.inputs, reversed(bits)))
+        assert table.value(m) == evaluate(tree, env)
+
+
+def test_multi_bit_table_and_extra_inputs():
+    s = LogicVar("s", width=3)
+    tree = PartSelect(s, 2, 0)
+    table = truth_table(tree, inputs=["s[0]", "s[1]", "s[2]", "unused"])
+    assert table.width == 3
+    assert [table.value(m) for m in range(16)] == list(range(8)) * 2
+
+
+def test_twenty_input_parity_is_fast():
+    names = [f"x{i}" for i in range(20)]
+    start = time.perf_counter()
+    table = truth_table(_xor_chain(names))
+    assert time.perf_counter() - start < 5
+    assert table.count_ones() == 1 << 19
+    assert table.value(0b1011) == 1
+
+
+def test_compare_eval_equivalent_and_not():
+    names = [f"x{i}" for i in range(20)]
+    left = _xor_chain(names)
+    right = _xor_chain(list(reversed(names)))
+    assert compare_logic_trees(left, right, method="eval")
+
+    broken = XorOp(_xor_chain(names[:-1]), NotOp(LogicVar(names[-1])))
+    assert not compare_logic_trees(left, broken, method="eval")
+
+
+def test_compare_eval_demorgan_and_eq():
+    a, b = LogicVar("a"), LogicVar("b")
+    assert compare_logic_trees(
+        NotOp(AndOp(a, b)), OrOp(NotOp(a), NotOp(b)), method="eval"
+    )
+    assert compare_logic_trees(EqOp(a, LogicConst(1)), a, method="eval")
+
+
+def test_too_many_inputs_is_rejected():
+    with pytest.raises(ValueError):
+        truth_table(_xor_chain([f"x{i}" for i in range(8)]), max_inputs=4)
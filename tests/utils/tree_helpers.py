@@ -0,0 +1,33 @@
+# tests/utils/tree_helpers.py
+from logictree.nodes import LogicMux, NotOp
+from logictree.utils.analysis import get_logic_hash
+from logictree.utils.structural_hash import structural_hash
+
+
+def same_structural_hash(t1, t2):
+    return structural_hash(t1) == structural_hash(t2)
+
+
+def random_tree(rng, depth, ops, leaves):
+    """Random tree over `ops` (NotOp unary, LogicMux ternary, others binary)."""
+    if depth == 0:
+        return rng.choice(leaves)
+    op = rng.choice(ops)
+    if op is NotOp:
+        return NotOp(random_tree(rng, depth - 1, ops, leaves))
+    arity = 3 if op is LogicMux else 2
+    return op(*(random_tree(rng, depth - 1, ops, leaves) for _ in range(arity)))
+
+
+def assignment_hashes(mod):
+    """Output name -> BDD hash of each assignment of a Module."""
+    return {n: get_logic_hash(a.rhs) for n, a in mod.assignments.items()}
+
+
+def module_map_hashes(module_map):
+    """(module, output) -> BDD hash over a whole ModuleMap."""
+    return {
+        (m, n): h
+        for m, mod in module_map.items()
+        for n, h in assignment_hashes(mod).items()
+    }